@@ -0,0 +1,470 @@
+import struct
+from collections.abc import Iterator, Sequence
+from typing import Any, BinaryIO
+
+MAGIC = b"JSAB"
+VERSION = 1
+
+FLAG_OFFSETS = 0x01
+
+# Node kinds and field names are encoded as small integers. Codes are positional,
+# so new entries must only ever be appended; anything else needs a VERSION bump.
+# Code 0 is reserved for names that are not in the table and go through the
+# string table instead.
+NODE_KINDS = [
+    "Program",
+    "ExpressionStatement",
+    "Literal",
+    "Identifier",
+    "EmptyStatement",
+    "BlockStatement",
+    "WhileStatement",
+    "DoWhileStatement",
+    "ForStatement",
+    "IfStatement",
+    "SwitchStatement",
+    "SwitchCase",
+    "TryStatement",
+    "CatchClause",
+    "ReturnStatement",
+    "ThrowStatement",
+    "BreakStatement",
+    "ContinueStatement",
+    "FunctionDeclaration",
+    "LabeledStatement",
+    "VariableDeclaration",
+    "VariableDeclarator",
+    "ConditionalExpression",
+    "AssignmentExpression",
+    "LogicalExpression",
+    "BinaryExpression",
+    "UnaryOperator",
+    "UpdateExpression",
+    "MemberExpression",
+    "ObjectExpression",
+    "Property",
+    "ArrayExpression",
+]
+
+FIELD_NAMES = [
+    "body",
+    "expression",
+    "value",
+    "raw",
+    "name",
+    "id",
+    "params",
+    "declarations",
+    "kind",
+    "init",
+    "test",
+    "update",
+    "condition",
+    "consequent",
+    "alternate",
+    "discriminant",
+    "cases",
+    "block",
+    "handler",
+    "finalizer",
+    "argument",
+    "label",
+    "operator",
+    "left",
+    "right",
+    "prefix",
+    "object",
+    "property",
+    "properties",
+    "key",
+    "elements",
+    "param",
+]
+
+KIND_CODES = {name: code for code, name in enumerate(NODE_KINDS, 1)}
+FIELD_CODES = {name: code for code, name in enumerate(FIELD_NAMES, 1)}
+
+TAG_NONE = 0
+TAG_TRUE = 1
+TAG_FALSE = 2
+TAG_INT = 3
+TAG_FLOAT = 4
+TAG_STR = 5
+TAG_LIST = 6
+TAG_TUPLE = 7
+TAG_NODE = 8
+
+_DOUBLE = struct.Struct("<d")
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(buf: bytes | memoryview, pos: int) -> tuple[int, int]:
+    byte = buf[pos]
+    if byte < 0x80:
+        return byte, pos + 1
+    value = byte & 0x7F
+    shift = 7
+    pos += 1
+    while True:
+        byte = buf[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class _Encoder:
+    def __init__(self, offsets: bool):
+        self.offsets = offsets
+        self.strings: dict[str, int] = {}
+
+    def string(self, s: str) -> int:
+        idx = self.strings.get(s)
+        if idx is None:
+            idx = self.strings[s] = len(self.strings)
+        return idx
+
+    def value(self, out: bytearray, value: Any) -> None:
+        if value is None:
+            out.append(TAG_NONE)
+        elif value is True:
+            out.append(TAG_TRUE)
+        elif value is False:
+            out.append(TAG_FALSE)
+        elif isinstance(value, int):
+            out.append(TAG_INT)
+            _write_varint(out, (value << 1) if value >= 0 else ((-value << 1) - 1))
+        elif isinstance(value, float):
+            out.append(TAG_FLOAT)
+            out += _DOUBLE.pack(value)
+        elif isinstance(value, str):
+            out.append(TAG_STR)
+            _write_varint(out, self.string(value))
+        elif isinstance(value, dict):
+            self.node(out, value)
+        elif isinstance(value, (list, tuple)):
+            payload = bytearray()
+            _write_varint(payload, len(value))
+            for item in value:
+                self.value(payload, item)
+            out.append(TAG_TUPLE if isinstance(value, tuple) else TAG_LIST)
+            _write_varint(out, len(payload))
+            out += payload
+        elif isinstance(value, Sequence):
+            # `js_parser.LazyBody`: the body is parsed and stored like the tuple it stands for.
+            self.value(out, tuple(value))
+        else:
+            raise ValueError(f"cannot encode value of type `{type(value).__name__}`")
+
+    def node(self, out: bytearray, node: dict[str, Any]) -> None:
+        node_type = node.get("type")
+        if not isinstance(node_type, str):
+            raise ValueError("AST node without a `type`")
+
+        start = node.get("start")
+        end = node.get("end")
+        has_range = self.offsets and isinstance(start, int) and isinstance(end, int)
+
+        payload = bytearray()
+        code = KIND_CODES.get(node_type, 0)
+        _write_varint(payload, (code << 1) | has_range)
+        if code == 0:
+            _write_varint(payload, self.string(node_type))
+        if has_range:
+            _write_varint(payload, start)
+            _write_varint(payload, end - start)
+
+        fields = [
+            (key, value)
+            for key, value in node.items()
+            if key != "type" and key not in ("start", "end")
+        ]
+        _write_varint(payload, len(fields))
+        for key, value in fields:
+            code = FIELD_CODES.get(key, 0)
+            _write_varint(payload, code)
+            if code == 0:
+                _write_varint(payload, self.string(key))
+            self.value(payload, value)
+
+        out.append(TAG_NODE)
+        _write_varint(out, len(payload))
+        out += payload
+
+
+def dumps(ast: dict[str, Any], offsets: bool = True) -> bytes:
+    encoder = _Encoder(offsets)
+    body = bytearray()
+    encoder.value(body, ast)
+
+    out = bytearray(MAGIC)
+    out.append(VERSION)
+    out.append(FLAG_OFFSETS if offsets else 0)
+    _write_varint(out, len(encoder.strings))
+    for s in encoder.strings:
+        data = s.encode("utf-8")
+        _write_varint(out, len(data))
+        out += data
+    out += body
+    return bytes(out)
+
+
+def dump(ast: dict[str, Any], fp: BinaryIO, offsets: bool = True) -> None:
+    fp.write(dumps(ast, offsets))
+
+
+def _read_header(buf: bytes | memoryview) -> tuple[list[str], int, int]:
+    if bytes(buf[:4]) != MAGIC:
+        raise ValueError("not a binary AST")
+    if buf[4] != VERSION:
+        raise ValueError(f"unsupported binary AST version {buf[4]}")
+    flags = buf[5]
+    count, pos = _read_varint(buf, 6)
+    strings = []
+    for _ in range(count):
+        length, pos = _read_varint(buf, pos)
+        strings.append(str(buf[pos : pos + length], "utf-8"))
+        pos += length
+    return strings, flags, pos
+
+
+class _Decoder:
+    def __init__(self, buf: bytes | memoryview, strings: list[str]):
+        self.buf = buf
+        self.strings = strings
+
+    def value(self, pos: int) -> tuple[Any, int]:
+        buf = self.buf
+        tag = buf[pos]
+        pos += 1
+        if tag == TAG_NODE:
+            return self.node(pos)
+        if tag == TAG_STR:
+            idx, pos = _read_varint(buf, pos)
+            return self.strings[idx], pos
+        if tag == TAG_NONE:
+            return None, pos
+        if tag == TAG_LIST or tag == TAG_TUPLE:
+            _, pos = _read_varint(buf, pos)
+            count, pos = _read_varint(buf, pos)
+            items = []
+            for _ in range(count):
+                item, pos = self.value(pos)
+                items.append(item)
+            return (tuple(items) if tag == TAG_TUPLE else items), pos
+        if tag == TAG_INT:
+            raw, pos = _read_varint(buf, pos)
+            return (raw >> 1) if not raw & 1 else -((raw + 1) >> 1), pos
+        if tag == TAG_TRUE:
+            return True, pos
+        if tag == TAG_FALSE:
+            return False, pos
+        if tag == TAG_FLOAT:
+            return _DOUBLE.unpack_from(buf, pos)[0], pos + 8
+        raise ValueError(f"corrupt binary AST: unknown tag {tag} at {pos - 1}")
+
+    def node(self, pos: int) -> tuple[dict[str, Any], int]:
+        buf = self.buf
+        strings = self.strings
+        _, pos = _read_varint(buf, pos)
+        header, pos = _read_varint(buf, pos)
+        code = header >> 1
+        if code:
+            node: dict[str, Any] = {"type": NODE_KINDS[code - 1]}
+        else:
+            idx, pos = _read_varint(buf, pos)
+            node = {"type": strings[idx]}
+        if header & 1:
+            start, pos = _read_varint(buf, pos)
+            length, pos = _read_varint(buf, pos)
+        count, pos = _read_varint(buf, pos)
+        for _ in range(count):
+            code, pos = _read_varint(buf, pos)
+            if code:
+                key = FIELD_NAMES[code - 1]
+            else:
+                idx, pos = _read_varint(buf, pos)
+                key = strings[idx]
+            node[key], pos = self.value(pos)
+        if header & 1:
+            node["start"] = start
+            node["end"] = start + length
+        return node, pos
+
+
+def loads(data: bytes) -> dict[str, Any]:
+    strings, _, pos = _read_header(data)
+    ast, _ = _Decoder(data, strings).value(pos)
+    return ast
+
+
+def load(fp: BinaryIO) -> dict[str, Any]:
+    return loads(fp.read())
+
+
+def _skip(buf: bytes | memoryview, pos: int) -> int:
+    tag = buf[pos]
+    pos += 1
+    if tag == TAG_NODE or tag == TAG_LIST or tag == TAG_TUPLE:
+        size, pos = _read_varint(buf, pos)
+        return pos + size
+    if tag == TAG_STR or tag == TAG_INT:
+        _, pos = _read_varint(buf, pos)
+        return pos
+    if tag == TAG_FLOAT:
+        return pos + 8
+    return pos
+
+
+class LazyList:
+    """Sequence view over an encoded list; items are decoded on access."""
+
+    def __init__(self, decoder: _Decoder, pos: int, tuple_: bool):
+        self.__decoder = decoder
+        self.is_tuple = tuple_
+        _, pos = _read_varint(decoder.buf, pos)
+        self.__count, self.__first = _read_varint(decoder.buf, pos)
+        self.__offsets: list[int] | None = None
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def __item_offsets(self) -> list[int]:
+        if self.__offsets is None:
+            offsets = []
+            pos = self.__first
+            for _ in range(self.__count):
+                offsets.append(pos)
+                pos = _skip(self.__decoder.buf, pos)
+            self.__offsets = offsets
+        return self.__offsets
+
+    def __getitem__(self, idx: int) -> Any:
+        return _lazy_value(self.__decoder, self.__item_offsets()[idx])
+
+    def __iter__(self) -> Iterator[Any]:
+        pos = self.__first
+        for _ in range(self.__count):
+            yield _lazy_value(self.__decoder, pos)
+            pos = _skip(self.__decoder.buf, pos)
+
+    def materialize(self) -> list[Any] | tuple[Any, ...]:
+        items = [_materialize(item) for item in self]
+        return tuple(items) if self.is_tuple else items
+
+
+class LazyNode:
+    """Read-only view over an encoded node.
+
+    Only the node header is decoded up front. Fields are located on first access
+    and child nodes are skipped by their size prefix, so a consumer that only
+    looks at e.g. top-level declarations never decodes function bodies.
+    """
+
+    def __init__(self, decoder: _Decoder, pos: int):
+        buf = decoder.buf
+        self.__decoder = decoder
+        size, pos = _read_varint(buf, pos)
+        self.__end = pos + size
+        header, pos = _read_varint(buf, pos)
+        code = header >> 1
+        if code:
+            self.type = NODE_KINDS[code - 1]
+        else:
+            idx, pos = _read_varint(buf, pos)
+            self.type = decoder.strings[idx]
+        self.start: int | None = None
+        self.end: int | None = None
+        if header & 1:
+            self.start, pos = _read_varint(buf, pos)
+            length, pos = _read_varint(buf, pos)
+            self.end = self.start + length
+        self.__fields_pos = pos
+        self.__fields: dict[str, int] | None = None
+
+    @property
+    def size(self) -> int:
+        """Encoded size of this node, including all of its children."""
+        return self.__end - self.__fields_pos
+
+    def __field_offsets(self) -> dict[str, int]:
+        if self.__fields is None:
+            buf = self.__decoder.buf
+            fields = {}
+            count, pos = _read_varint(buf, self.__fields_pos)
+            for _ in range(count):
+                code, pos = _read_varint(buf, pos)
+                if code:
+                    key = FIELD_NAMES[code - 1]
+                else:
+                    idx, pos = _read_varint(buf, pos)
+                    key = self.__decoder.strings[idx]
+                fields[key] = pos
+                pos = _skip(buf, pos)
+            self.__fields = fields
+        return self.__fields
+
+    def keys(self) -> list[str]:
+        return ["type", *self.__field_offsets()]
+
+    def __contains__(self, key: str) -> bool:
+        return key == "type" or key in self.__field_offsets()
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "type":
+            return self.type
+        return _lazy_value(self.__decoder, self.__field_offsets()[key])
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in self else default
+
+    def materialize(self) -> dict[str, Any]:
+        node: dict[str, Any] = {"type": self.type}
+        for key in self.__field_offsets():
+            node[key] = _materialize(self[key])
+        if self.start is not None:
+            node["start"] = self.start
+            node["end"] = self.end
+        return node
+
+    def __repr__(self) -> str:
+        return f"<LazyNode {self.type} ({self.size} bytes)>"
+
+
+def _lazy_value(decoder: _Decoder, pos: int) -> Any:
+    tag = decoder.buf[pos]
+    if tag == TAG_NODE:
+        return LazyNode(decoder, pos + 1)
+    if tag == TAG_LIST or tag == TAG_TUPLE:
+        return LazyList(decoder, pos + 1, tag == TAG_TUPLE)
+    value, _ = decoder.value(pos)
+    return value
+
+
+def _materialize(value: Any) -> Any:
+    if isinstance(value, (LazyNode, LazyList)):
+        return value.materialize()
+    return value
+
+
+def loads_lazy(data: bytes) -> LazyNode:
+    """A `LazyNode` view of a binary AST. Only the string table is read up
+    front, so it is ready much sooner than `loads`, `pickle.loads` or
+    `json.loads` of the same AST; see `python benchmark.py --serialization`.
+    """
+    buf = memoryview(data)
+    strings, _, pos = _read_header(buf)
+    if buf[pos] != TAG_NODE:
+        raise ValueError("binary AST root is not a node")
+    return LazyNode(_Decoder(buf, strings), pos + 1)
+
+
+def load_lazy(fp: BinaryIO) -> LazyNode:
+    return loads_lazy(fp.read())
@@ -0,0 +1,171 @@
+from collections.abc import Callable, Iterable, Sequence
+from enum import Enum, auto
+from typing import Any
+
+
+class Action(Enum):
+    """Values a `visit_*` method can return to steer the traversal"""
+
+    SKIP = auto()
+    STOP = auto()
+
+
+SKIP = Action.SKIP
+STOP = Action.STOP
+
+
+def _dispatch_table(cls: type, prefix: str) -> dict[str, Callable[..., Any]]:
+    return {
+        name[len(prefix) :]: getattr(cls, name)
+        for name in dir(cls)
+        if name.startswith(prefix) and callable(getattr(cls, name))
+    }
+
+
+def _is_sequence(value: Any) -> bool:
+    # Besides lists and tuples this covers `js_parser.LazyBody`, so unparsed
+    # function bodies are parsed when the traversal reaches them.
+    return isinstance(value, (list, tuple)) or (
+        not isinstance(value, str) and isinstance(value, Sequence)
+    )
+
+
+def _children(node: dict[str, Any]) -> list[dict[str, Any]]:
+    children = []
+    for value in node.values():
+        if isinstance(value, dict):
+            children.append(value)
+        elif _is_sequence(value):
+            for item in value:
+                if isinstance(item, dict):
+                    children.append(item)
+    return children
+
+
+class Visitor:
+    """Pre-order AST visitor dispatching on `node["type"]`.
+
+    Subclasses define `visit_<Type>(node)` and/or `leave_<Type>(node)` methods.
+    The dispatch tables are built once per class. A `visit_*` method may return
+    SKIP to not descend into the node's children, or STOP to end the traversal
+    for this visitor.
+    """
+
+    _enter: dict[str, Callable[..., Any]] = {}
+    _leave: dict[str, Callable[..., Any]] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._enter = _dispatch_table(cls, "visit_")
+        cls._leave = _dispatch_table(cls, "leave_")
+
+    def visit(self, node: dict[str, Any]) -> None:
+        walk(node, [self])
+
+
+def walk(root: dict[str, Any], visitors: Iterable[Visitor]) -> None:
+    """Run several visitors over the tree in a single pass.
+
+    The traversal uses an explicit stack, so it is not bounded by the recursion
+    limit. A visitor returning SKIP only prunes the subtree for itself; the other
+    visitors still see it.
+    """
+    visitors = tuple(visitors)
+    stopped: set[int] = set()
+    # Entries are (node, visitors that still descend here, leaving).
+    stack: list[tuple[dict[str, Any], tuple[Visitor, ...], bool]] = [
+        (root, visitors, False)
+    ]
+
+    while stack:
+        node, active, leaving = stack.pop()
+        if stopped:
+            active = tuple(v for v in active if id(v) not in stopped)
+            if not active:
+                if len(stopped) == len(visitors):
+                    return
+                continue
+
+        node_type = node["type"]
+        if leaving:
+            for visitor in active:
+                leave = visitor._leave.get(node_type)
+                if leave is not None:
+                    leave(visitor, node)
+            continue
+
+        descend = []
+        for visitor in active:
+            enter = visitor._enter.get(node_type)
+            action = enter(visitor, node) if enter is not None else None
+            if action is STOP:
+                stopped.add(id(visitor))
+            elif action is not SKIP:
+                descend.append(visitor)
+
+        if any(node_type in visitor._leave for visitor in active):
+            stack.append((node, active, True))
+
+        if descend:
+            descend_tuple = tuple(descend)
+            for child in reversed(_children(node)):
+                stack.append((child, descend_tuple, False))
+
+
+_REMOVED = object()
+
+
+class Transformer:
+    """Bottom-up AST rewriter dispatching on `node["type"]`.
+
+    Subclasses define `visit_<Type>(node)` methods returning the replacement
+    node, the node itself to keep it, or None to remove it (from a list) or null
+    it (in a field). Children are transformed before their parent, and the tree
+    is rewritten in place using an explicit stack.
+    """
+
+    _visit: dict[str, Callable[..., Any]] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._visit = _dispatch_table(cls, "visit_")
+
+    def transform(self, root: dict[str, Any]) -> dict[str, Any] | None:
+        result: list[dict[str, Any] | None] = [root]
+        # Entries are (node, container, key, expanded).
+        stack: list[tuple[dict[str, Any], Any, Any, bool]] = [(root, result, 0, False)]
+
+        while stack:
+            node, container, key, expanded = stack.pop()
+            if not expanded:
+                stack.append((node, container, key, True))
+                for field, value in reversed(list(node.items())):
+                    if isinstance(value, dict):
+                        stack.append((value, node, field, False))
+                    elif _is_sequence(value):
+                        if not isinstance(value, list):
+                            value = node[field] = _TupleField(value)
+                        for idx in range(len(value) - 1, -1, -1):
+                            if isinstance(value[idx], dict):
+                                stack.append((value[idx], value, idx, False))
+                continue
+
+            for field, value in node.items():
+                if isinstance(value, list):
+                    if any(item is _REMOVED for item in value):
+                        value[:] = [item for item in value if item is not _REMOVED]
+                    if isinstance(value, _TupleField):
+                        node[field] = tuple(value)
+
+            visit = self._visit.get(node["type"])
+            replacement = visit(self, node) if visit is not None else node
+            if replacement is None and isinstance(container, list) and container is not result:
+                container[key] = _REMOVED
+            else:
+                container[key] = replacement
+
+        return result[0]
+
+
+class _TupleField(list):
+    """Mutable stand-in for a tuple field while its items are being transformed."""
@@ -0,0 +1,322 @@
+import argparse
+import json
+import math
+import os
+import pickle
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+import ast_binary
+from js_parser import TOKENS, JSParser
+from tokenizer import Tokenizer
+
+SIZES = [
+    1_000,
+    10_000,
+    100_000,
+    1_000_000,
+    10_000_000,
+    50_000_000,
+]
+
+UNIT = """function f{n}(x, y) {{
+  let total = 0;
+  for (let i = 0; i < x; i++) {{
+    if (i % 2 === 0 && y) {{
+      total += i * {n};
+    }} else {{
+      total = total - [i, y, {{ value: i }}][0];
+    }}
+  }}
+  while (total > 100) {{
+    total = total / 2;
+  }}
+  return total;
+}}
+let v{n} = "string {n}";
+"""
+
+
+def multiline_unit(n: int, _: int) -> str:
+    return UNIT.format(n=n)
+
+
+def minified_unit(n: int, _: int) -> str:
+    return " ".join(line.strip() for line in UNIT.format(n=n).splitlines()) + " "
+
+
+def nested_unit(n: int, depth: int) -> str:
+    head = "".join(f"if (x{n} > {d}) {{ " for d in range(depth))
+    expr = "(" * depth + f"x{n}" + " + 1)" * depth
+    return f"let x{n} = {n};\n{head}x{n} = {expr};{' }' * depth}\n"
+
+
+CORPORA: dict[str, Callable[[int, int], str]] = {
+    "multiline": multiline_unit,
+    "minified": minified_unit,
+    "nested": nested_unit,
+}
+
+
+def build_corpus(kind: str, size: int, depth: int = 20) -> str:
+    unit = CORPORA[kind]
+    parts = []
+    length = 0
+    n = 0
+    while length < size:
+        part = unit(n, depth)
+        parts.append(part)
+        length += len(part)
+        n += 1
+    return "".join(parts)
+
+
+def count_nodes(ast: dict[str, Any]) -> int:
+    count = 0
+    stack: list[Any] = [ast]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            count += 1
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return count
+
+
+def best_of(repeat: int, func: Callable[[], Any]) -> tuple[float, Any]:
+    best = math.inf
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def tokenize(source: str) -> int:
+    return sum(1 for _ in Tokenizer.from_string(source, TOKENS))
+
+
+def peak_memory(func: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_case(
+    kind: str, size: int, depth: int, repeat: int, memory: bool
+) -> dict[str, Any]:
+    source = build_corpus(kind, size, depth)
+    mb = len(source.encode("utf-8")) / 1e6
+
+    tokenize_s, tokens = best_of(repeat, lambda: tokenize(source))
+    parse_s, ast = best_of(repeat, lambda: JSParser().parse_string(source))
+    nodes = count_nodes(ast)
+    del ast
+
+    with tempfile.NamedTemporaryFile("w", suffix=".js", delete=False) as file:
+        file.write(source)
+    try:
+        parse_file_s, _ = best_of(repeat, lambda: JSParser().parse_file(file.name))
+    finally:
+        os.remove(file.name)
+
+    result = {
+        "corpus": kind,
+        "size": size,
+        "bytes": len(source),
+        "tokens": tokens,
+        "nodes": nodes,
+        "tokenize_s": tokenize_s,
+        "parse_string_s": parse_s,
+        "parse_file_s": parse_file_s,
+        "tokens_per_s": tokens / tokenize_s,
+        "nodes_per_s": nodes / parse_s,
+        "mb_per_s": mb / parse_s,
+        "peak_bytes": None,
+    }
+    if memory:
+        result["peak_bytes"] = peak_memory(lambda: JSParser().parse_string(source))
+    return result
+
+
+SERIALIZERS: dict[str, tuple[Callable[[Any], Any], Callable[[Any], Any]]] = {
+    "ast_binary": (ast_binary.dumps, ast_binary.loads),
+    "ast_binary lazy": (ast_binary.dumps, ast_binary.loads_lazy),
+    "pickle": (pickle.dumps, pickle.loads),
+    "json": (json.dumps, json.loads),
+}
+
+
+def run_serialization(kind: str, size: int, depth: int, repeat: int) -> dict[str, Any]:
+    """Encoded size and load time of the AST in every format of `SERIALIZERS`"""
+    ast = JSParser().parse_string(build_corpus(kind, size, depth))
+    result: dict[str, Any] = {"corpus": kind, "size": size}
+    for name, (dumps, loads) in SERIALIZERS.items():
+        data = dumps(ast)
+        load_s, _ = best_of(repeat, lambda: loads(data))
+        result[name] = {"bytes": len(data), "load_s": load_s}
+    return result
+
+
+def format_serialization(r: dict[str, Any]) -> str:
+    return f"{r['corpus']:<10} {r['size']:>11,} B  " + "  ".join(
+        f"{name} {r[name]['bytes']:,} B {r[name]['load_s'] * 1e3:.2f} ms" for name in SERIALIZERS
+    )
+
+
+def scaling_exponent(points: list[tuple[float, float]]) -> float | None:
+    """Least-squares slope of log(time) against log(size); 1.0 means linear"""
+    points = [(math.log(x), math.log(y)) for x, y in points if x > 0 and y > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var = sum((x - mean_x) ** 2 for x, _ in points)
+    if var == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var
+
+
+def run_suite(
+    corpora: list[str],
+    sizes: list[int],
+    depth: int = 20,
+    repeat: int = 1,
+    memory: bool = True,
+    time_budget: float = 60.0,
+    log: Callable[[str], None] = lambda _: None,
+) -> dict[str, Any]:
+    results = []
+    scaling = {}
+    for kind in corpora:
+        series = []
+        for size in sizes:
+            result = run_case(kind, size, depth, repeat, memory)
+            results.append(result)
+            series.append(result)
+            log(format_result(result))
+            # Larger inputs of a series that is already slow would only
+            # multiply the run time; stop growing it.
+            if result["parse_string_s"] + result["tokenize_s"] > time_budget:
+                log(f"{kind}: time budget exceeded, skipping larger sizes")
+                break
+        scaling[kind] = {
+            metric: scaling_exponent([(r["bytes"], r[metric]) for r in series])
+            for metric in ("tokenize_s", "parse_string_s", "parse_file_s")
+        }
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "timestamp": time.time(),
+        "results": results,
+        "scaling": scaling,
+    }
+
+
+def format_result(r: dict[str, Any]) -> str:
+    peak = f"{r['peak_bytes'] / 1e6:8.1f} MB" if r["peak_bytes"] is not None else "       -   "
+    return (
+        f"{r['corpus']:<10} {r['bytes']:>11,} B  {r['tokens_per_s']:>11,.0f} tok/s"
+        f"  {r['nodes_per_s']:>11,.0f} nodes/s  {r['mb_per_s']:7.3f} MB/s  peak {peak}"
+    )
+
+
+def compare(
+    current: dict[str, Any], baseline: dict[str, Any], threshold: float
+) -> list[str]:
+    """Returns a description of every throughput that dropped by more than `threshold`"""
+    base = {(r["corpus"], r["size"]): r for r in baseline["results"]}
+    regressions = []
+    for r in current["results"]:
+        old = base.get((r["corpus"], r["size"]))
+        if old is None:
+            continue
+        for metric in ("tokens_per_s", "nodes_per_s", "mb_per_s"):
+            if r[metric] < old[metric] * (1 - threshold):
+                regressions.append(
+                    f"{r['corpus']} {r['size']:,} B: {metric} {old[metric]:,.1f}"
+                    f" -> {r[metric]:,.1f} ({r[metric] / old[metric] - 1:+.1%})"
+                )
+    return regressions
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Tokenizer and parser throughput")
+    arg_parser.add_argument(
+        "--corpus", choices=list(CORPORA), action="append", help="default: all"
+    )
+    arg_parser.add_argument(
+        "--sizes",
+        type=lambda s: [int(float(x)) for x in s.split(",")],
+        default=SIZES,
+        help="comma separated corpus sizes in bytes",
+    )
+    arg_parser.add_argument("--max-size", type=float, default=math.inf)
+    arg_parser.add_argument("--depth", type=int, default=20, help="nesting of `nested`")
+    arg_parser.add_argument("--repeat", type=int, default=1, help="best of N runs")
+    arg_parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc")
+    arg_parser.add_argument(
+        "--time-budget",
+        type=float,
+        default=60.0,
+        help="stop growing a corpus once one size takes longer than this (seconds)",
+    )
+    arg_parser.add_argument(
+        "--serialization",
+        action="store_true",
+        help="compare AST sizes and load times of ast_binary, pickle and JSON instead",
+    )
+    arg_parser.add_argument("--output", help="write JSON results to this path")
+    arg_parser.add_argument("--compare", metavar="BASELINE", help="JSON results to compare with")
+    arg_parser.add_argument(
+        "--threshold", type=float, default=0.10, help="allowed slowdown ratio"
+    )
+    args = arg_parser.parse_args()
+    corpora = args.corpus or list(CORPORA)
+    sizes = [size for size in args.sizes if size <= args.max_size]
+
+    if args.serialization:
+        for kind in corpora:
+            for size in sizes:
+                print(format_serialization(run_serialization(kind, size, args.depth, args.repeat)))
+        sys.exit(0)
+
+    report = run_suite(
+        corpora,
+        sizes,
+        depth=args.depth,
+        repeat=args.repeat,
+        memory=not args.no_memory,
+        time_budget=args.time_budget,
+        log=print,
+    )
+    for kind, exponents in report["scaling"].items():
+        print(
+            f"{kind:<10} scaling: "
+            + "  ".join(
+                f"{metric[:-2]} n^{k:.2f}" if k is not None else f"{metric[:-2]} -"
+                for metric, k in exponents.items()
+            )
+        )
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(report, json.load(file), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION: {line}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
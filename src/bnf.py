@@ -0,0 +1,105 @@
+import os
+import re
+from dataclasses import dataclass, field
+
+from js_parser import KEYWORDS, TOKENS
+from tokenizer import Token, TokenKind
+
+GRAMMAR_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "test", "backus_naur.txt"
+)
+
+# Symbols the BNF uses without defining: they stand for whole token classes.
+TOKEN_CLASSES = {"Identifier", "Literal", "<BIT_OPERATOR>", "<ASSIGN_OPERATOR>"}
+BIT_OPERATORS = ["&", "|", "^", "<<", ">>", ">>>"]
+ASSIGN_OPERATORS = ["+=", "-=", "*=", "/=", "%=", "|=", "&=", "^=", "<<=", ">>=", ">>>="]
+
+_SYMBOL = re.compile(
+    "|".join(
+        [r"<\w+>", r"\w+"]
+        + [re.escape(text) for text in sorted(TOKENS.values(), key=len, reverse=True)]
+    )
+)
+
+
+@dataclass
+class Grammar:
+    start: str
+    rules: dict[str, list[list[str]]]
+    warnings: list[str] = field(default_factory=list)
+
+    def is_nonterminal(self, symbol: str) -> bool:
+        return symbol in self.rules
+
+    def terminals(self) -> set[str]:
+        return {
+            symbol
+            for alternatives in self.rules.values()
+            for alternative in alternatives
+            for symbol in alternative
+            if symbol not in self.rules
+        }
+
+
+def parse_grammar(text: str) -> Grammar:
+    """Reads the grammar notation of `test/backus_naur.txt`.
+
+    A rule is a name at the start of a line followed by indented alternatives,
+    each introduced by `:` or `|`, and ends at a lone `;` or a blank line. Right
+    hand sides are split into the parser's tokens, and `<operator> =` is read as
+    the single `<ASSIGN_OPERATOR>` token class (`+=`, `-=`, ...).
+    """
+    rules: dict[str, list[list[str]]] = {}
+    start = ""
+    current: str | None = None
+
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped or (current is not None and stripped == ";"):
+            current = None
+        elif not line[0].isspace():
+            current = stripped
+            rules.setdefault(current, [])
+            start = start or current
+        elif current is not None and stripped[0] in ":|":
+            symbols = _SYMBOL.findall(stripped[1:])
+            alternative = []
+            for symbol in symbols:
+                if symbol == "=" and alternative and alternative[-1] == "<operator>":
+                    alternative[-1] = "<ASSIGN_OPERATOR>"
+                else:
+                    alternative.append(symbol)
+            rules[current].append(alternative)
+
+    grammar = Grammar(start, rules)
+    undefined = {
+        symbol
+        for symbol in grammar.terminals()
+        if re.fullmatch(r"[A-Z]\w*|<\w+>", symbol) and symbol not in TOKEN_CLASSES
+    }
+    for symbol in sorted(undefined):
+        grammar.warnings.append(f"undefined symbol `{symbol}`, dropping its alternatives")
+    for name, alternatives in rules.items():
+        rules[name] = [alt for alt in alternatives if not undefined.intersection(alt)]
+    return grammar
+
+
+def terminal(token: Token) -> str:
+    """The grammar terminal a token of the tokenizer stands for"""
+    match token.kind:
+        case TokenKind.WORD:
+            if token.text in ("true", "false", "null"):
+                return "Literal"
+            return token.text if token.text in KEYWORDS else "Identifier"
+        case TokenKind.NUMBER_LIT | TokenKind.STR_LIT:
+            return "Literal"
+    if token.text in BIT_OPERATORS:
+        return "<BIT_OPERATOR>"
+    if token.text in ASSIGN_OPERATORS:
+        return "<ASSIGN_OPERATOR>"
+    return token.text
+
+
+def load_grammar(path: str = GRAMMAR_PATH) -> Grammar:
+    with open(path, "r") as file:
+        return parse_grammar(file.read())
@@ -0,0 +1,10 @@
+import pytest
+
+
+@pytest.fixture(autouse=True, scope="session")
+def automaton_cache(tmp_path_factory):
+    # Compiled automata of test runs go to a temporary directory rather than
+    # ~/.cache/pharserr; subprocesses of the tests inherit it.
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setenv("PHARSERR_CACHE", str(tmp_path_factory.mktemp("automata")))
+        yield
@@ -0,0 +1,427 @@
+import argparse
+import bisect
+import itertools
+import random
+import sys
+from collections.abc import Callable
+from typing import TextIO
+
+from bnf import ASSIGN_OPERATORS, BIT_OPERATORS, Grammar, load_grammar
+from js_parser import KEYWORDS
+
+# Rules of backus_naur.txt that accept more than JSParser does. The BNF cannot
+# express that `return` needs an enclosing function or that `const` needs an
+# initializer, and in places it is looser than the parser (`a.(b + c)`,
+# parameters that are arbitrary expressions, `1++`). These replace the BNF
+# alternatives so that every generated program is accepted.
+OVERRIDES: dict[str, list[list[str]]] = {
+    "ExpressionStatement": [["<STATEMENT_EXPRESSION>", ";"]],
+    "LabeledStatement": [["<LABEL>", ":", "Statement"]],
+    "ReturnStatement": [["return", "Expression", ";"]],
+    "ThrowStatement": [["throw", "Expression", ";"]],
+    "BreakStatement": [["break", ";"]],
+    "ContinueStatement": [["continue", ";"]],
+    "DoWhileStatement": [["do", "Statement", "while", "(", "Expression", ")", ";"]],
+    "ForStatement": [
+        ["for", "(", "<FOR_INIT>", ";", "Expression", ";", "Expression", ")", "Statement"]
+    ],
+    "VariableDeclaration": [
+        ["var", "VariableDeclaratorList", ";"],
+        ["let", "VariableDeclaratorList", ";"],
+        ["const", "ConstDeclaratorList", ";"],
+    ],
+    "ConstDeclaratorList": [
+        ["ConstDeclarator"],
+        ["ConstDeclaratorList", ",", "ConstDeclarator"],
+    ],
+    "ConstDeclarator": [["Identifier", "=", "Expression"]],
+    "Parameter": [["Identifier"], ["Identifier", "=", "Expression"]],
+    "UpdateExpression": [["MemberExpression"], ["Identifier", "++"], ["Identifier", "--"]],
+    "MemberExpression": [
+        ["PrimaryExpression"],
+        ["PrimaryExpression", "[", "PrimaryExpression", "]"],
+        ["PrimaryExpression", ".", "Identifier"],
+    ],
+}
+
+# Nonterminals that count as one level of nesting.
+NESTING = {"Statement", "Expression"}
+
+# Statements inside which `break`, `continue` or `return` may be generated.
+SCOPES = {
+    "WhileStatement": "loop",
+    "DoWhileStatement": "loop",
+    "ForStatement": "loop",
+    "SwitchStatement": "switch",
+    "FunctionDeclaration": "function",
+}
+
+# Chance that any other nonterminal takes its shortest alternative. Without it
+# every left-recursive operator level would add ~2 operators per expression.
+SHORTEST_BIAS = 0.75
+
+DEFAULT_MIX = {
+    "ExpressionStatement": 4.0,
+    "VariableDeclaration": 3.0,
+    "IfStatement": 2.0,
+    "ReturnStatement": 2.0,
+    "BlockStatement": 1.0,
+    "WhileStatement": 1.0,
+    "DoWhileStatement": 0.5,
+    "ForStatement": 1.0,
+    "FunctionDeclaration": 1.0,
+    "TryStatement": 0.5,
+    "SwitchStatement": 0.5,
+    "BreakStatement": 1.0,
+    "ContinueStatement": 0.5,
+    "ThrowStatement": 0.5,
+    "LabeledStatement": 0.25,
+    "EmptyStatement": 0.25,
+}
+
+IDENTIFIERS = [
+    name
+    for base in ["a", "b", "x", "y", "foo", "bar", "value", "count", "item", "tmp"]
+    for name in [base, f"{base}1", f"{base}_2"]
+    if name not in KEYWORDS
+]
+WORDS = ["lorem", "ipsum", "dolor", "sit", "amet"]
+
+# Snippets JSParser always rejects, used to exercise the error path.
+ERRORS = [
+    ["let", ";"],
+    [")", ";"],
+    ["if", "(", ")", ";"],
+    ["x", "=", "=", "1", ";"],
+    ["function", "(", ")", "{", "}"],
+    ["return", "1", ";"],
+    ["break", ";"],
+    ["const", "c", ";"],
+    ["a", ".", "1", ";"],
+]
+
+
+class CorpusGenerator:
+    """Random, syntactically valid programs derived from backus_naur.txt.
+
+    Output is fully determined by the seed and the options. `max_depth` bounds
+    the nesting of statements and expressions; `mix` weighs the kinds of
+    statements; with `error_rate` > 0 that fraction of top-level statements is
+    replaced by a snippet the parser rejects.
+    """
+
+    def __init__(
+        self,
+        grammar: Grammar | None = None,
+        seed: int = 0,
+        max_depth: int = 6,
+        mix: dict[str, float] | None = None,
+        error_rate: float = 0.0,
+        minified: bool = False,
+    ):
+        if max_depth < 1:
+            raise ValueError(f"max_depth must be at least 1, got {max_depth}")
+        grammar = grammar if grammar is not None else load_grammar()
+        self.rules = {**grammar.rules, **OVERRIDES}
+        self.rng = random.Random(seed)
+        self.max_depth = max_depth
+        self.mix = {**DEFAULT_MIX, **(mix or {})}
+        self.error_rate = error_rate
+        self.minified = minified
+        self.errors = 0
+
+        self.__labels = 0
+        self.__functions = 0
+        self.__loops = 0
+        self.__switches = 0
+        self.__lexical: dict[str, Callable[[], str]] = {
+            "Identifier": lambda: self.rng.choice(IDENTIFIERS),
+            "Literal": self.__literal,
+            "<BIT_OPERATOR>": lambda: self.rng.choice(BIT_OPERATORS),
+            "<ASSIGN_OPERATOR>": lambda: self.rng.choice(ASSIGN_OPERATORS),
+            "<LABEL>": self.__label,
+        }
+        self.__sizes = self.__min_sizes()
+        self.__shortest = {
+            symbol: [
+                alt for alt in alternatives if self.__size(alt) == self.__sizes[symbol]
+            ]
+            for symbol, alternatives in self.rules.items()
+        }
+        # Alternatives, shortest alternatives and least chance of taking one
+        # of those for the symbols that are neither statements nor scopes.
+        self.__chain_cache: dict[tuple[str, int], tuple[list[list[str]], list[float]]] = {}
+        self.__plain = {
+            symbol: (
+                alternatives,
+                self.__shortest[symbol],
+                0.0 if symbol in NESTING else SHORTEST_BIAS,
+            )
+            for symbol, alternatives in self.rules.items()
+            if symbol != "Statement" and symbol not in SCOPES
+        }
+
+    def __size(self, alternative: list[str]) -> float:
+        return sum(self.__sizes.get(symbol, 1) for symbol in alternative)
+
+    def __min_sizes(self) -> dict[str, float]:
+        """Fewest tokens each nonterminal can derive, by fixpoint iteration"""
+        sizes = {symbol: float("inf") for symbol in self.rules}
+        sizes["<STATEMENT_EXPRESSION>"] = sizes["<FOR_INIT>"] = float("inf")
+        self.__sizes = sizes
+        changed = True
+        while changed:
+            changed = False
+            for symbol, alternatives in self.rules.items():
+                size = min(self.__size(alt) for alt in alternatives)
+                if size < sizes[symbol]:
+                    sizes[symbol] = size
+                    changed = True
+            sizes["<STATEMENT_EXPRESSION>"] = sizes["<FOR_INIT>"] = sizes["Expression"]
+        return sizes
+
+    def __literal(self) -> str:
+        match self.rng.randrange(5):
+            case 0:
+                return str(self.rng.randrange(1000))
+            case 1:
+                return f"{self.rng.randrange(100)}.{self.rng.randrange(100)}"
+            case 2:
+                quote = self.rng.choice("'\"`")
+                return quote + " ".join(self.rng.sample(WORDS, 2)) + quote
+            case 3:
+                return self.rng.choice(["true", "false"])
+            case _:
+                return "null"
+
+    def __label(self) -> str:
+        self.__labels += 1
+        return f"label{self.__labels}"
+
+    def __alternatives(self, symbol: str) -> list[list[str]]:
+        alternatives = self.rules[symbol]
+        if symbol != "Statement":
+            return alternatives
+        return [
+            alt
+            for alt in alternatives
+            if not (
+                (alt[0] == "ReturnStatement" and not self.__functions)
+                or (alt[0] == "BreakStatement" and not (self.__loops or self.__switches))
+                or (alt[0] == "ContinueStatement" and not self.__loops)
+            )
+        ]
+
+    def __choose(self, symbol: str, depth: int) -> list[str]:
+        alternatives = self.__alternatives(symbol)
+        # Past the depth limit, and increasingly often on the way there, take
+        # the alternative that terminates soonest.
+        bias = depth / self.max_depth
+        if symbol not in NESTING and symbol != "Statement":
+            bias = max(bias, SHORTEST_BIAS)
+        if depth >= self.max_depth or self.rng.random() < bias:
+            shortest = [alt for alt in alternatives if alt in self.__shortest[symbol]]
+            if shortest:
+                return self.rng.choice(shortest)
+        if symbol == "Statement":
+            weights = [self.mix.get(alt[0], 1.0) for alt in alternatives]
+            return self.rng.choices(alternatives, weights)[0]
+        return self.rng.choice(alternatives)
+
+    def __chains(self, symbol: str, depth: int) -> tuple[list[list[str]], list[float]]:
+        """What `symbol` expands to through chains of single nonterminals, with
+        the cumulative chances `__choose` gives them, so that `__expand` takes
+        a whole chain such as AssignmentExpression down to PrimaryExpression
+        in one step"""
+        key = (symbol, depth)
+        if key not in self.__chain_cache:
+            chances: dict[tuple[str, ...], float] = {}
+            self.__follow(symbol, depth, 1.0, {symbol}, chances)
+            alternatives = [list(alternative) for alternative in chances]
+            self.__chain_cache[key] = alternatives, list(itertools.accumulate(chances.values()))
+        return self.__chain_cache[key]
+
+    def __follow(
+        self,
+        symbol: str,
+        depth: int,
+        chance: float,
+        seen: set[str],
+        chances: dict[tuple[str, ...], float],
+    ) -> None:
+        alternatives, shortest, least_bias = self.__plain[symbol]
+        if not shortest:
+            bias = 0.0
+        elif depth >= self.max_depth:
+            bias = 1.0
+        else:
+            bias = max(least_bias, depth / self.max_depth)
+        for alternative in alternatives:
+            p = chance * (1 - bias) / len(alternatives)
+            if alternative in shortest:
+                p += chance * bias / len(shortest)
+            child = alternative[0] if len(alternative) == 1 else None
+            if child in self.__plain and child not in NESTING and child not in seen:
+                self.__follow(child, depth, p, seen | {child}, chances)
+            else:
+                chances[tuple(alternative)] = chances.get(tuple(alternative), 0.0) + p
+
+    def __expand(self, symbol: str, depth: int, out: list[str]) -> None:
+        # Expanded with a stack rather than recursion, and whole chains of
+        # single nonterminals at a time, which otherwise take about one
+        # expansion per character of output. Entries with a depth of -1 mark
+        # the end of a loop, switch or function.
+        rules = self.rules
+        lexical = self.__lexical
+        plain = self.__plain
+        uniform = self.rng.random
+        max_depth = self.max_depth
+        stack = [(symbol, depth)]
+        while stack:
+            symbol, depth = stack.pop()
+            if depth < 0:
+                self.__scope(symbol, -1)
+                continue
+            if symbol not in rules:
+                make = lexical.get(symbol)
+                if make is not None:
+                    out.append(make())
+                elif symbol == "<STATEMENT_EXPRESSION>" or symbol == "<FOR_INIT>":
+                    out.extend(self.__expression(symbol, depth))
+                else:
+                    out.append(symbol)
+                continue
+
+            if symbol in NESTING:
+                depth += 1
+            if symbol in plain:
+                alternatives, cumulative = self.__chains(symbol, min(depth, max_depth))
+                alternative = alternatives[bisect.bisect(cumulative, uniform() * cumulative[-1])]
+            else:
+                alternative = self.__choose(symbol, depth)
+                if symbol in SCOPES:
+                    self.__scope(symbol, 1)
+                    stack.append((symbol, -1))
+            stack.extend(zip(reversed(alternative), itertools.repeat(depth)))
+
+    def __expression(self, symbol: str, depth: int) -> list[str]:
+        expression: list[str] = []
+        self.__expand("Expression", depth, expression)
+        # `{` would start a block and a leading keyword literal is taken for a
+        # declaration in a `for` header.
+        if expression[0] == "{" or (symbol == "<FOR_INIT>" and expression[0] in KEYWORDS):
+            expression = ["(", *expression, ")"]
+        return expression
+
+    def __scope(self, symbol: str, step: int) -> None:
+        match SCOPES[symbol]:
+            case "loop":
+                self.__loops += step
+            case "switch":
+                self.__switches += step
+            case "function":
+                self.__functions += step
+
+    def statement_tokens(self) -> list[str]:
+        if self.error_rate and self.rng.random() < self.error_rate:
+            self.errors += 1
+            return list(self.rng.choice(ERRORS))
+        tokens: list[str] = []
+        self.__expand("Statement", 0, tokens)
+        return tokens
+
+    def render(self, tokens: list[str]) -> str:
+        if self.minified:
+            return " ".join(tokens) + " "
+        parts = []
+        indent = parens = 0
+        for token in tokens:
+            if token == "}":
+                indent -= 1
+                if parts and parts[-1].endswith("  "):
+                    parts[-1] = parts[-1][:-2]
+            parts.append(token)
+            match token:
+                case "(" | "[":
+                    parens += 1
+                case ")" | "]":
+                    parens -= 1
+                case "{":
+                    indent += 1
+            if token in ("{", "}", ";") and not parens:
+                parts.append("\n" + "  " * indent)
+            else:
+                parts.append(" ")
+        return "".join(parts)
+
+    def statement(self) -> str:
+        return self.render(self.statement_tokens())
+
+    def write(self, fp: TextIO, size: int, chunk_size: int = 1 << 20) -> int:
+        """Writes top-level statements until at least `size` characters were written"""
+        written = 0
+        chunk: list[str] = []
+        chunk_len = 0
+        while written + chunk_len < size:
+            text = self.statement()
+            chunk.append(text)
+            chunk_len += len(text)
+            if chunk_len >= chunk_size:
+                fp.write("".join(chunk))
+                written += chunk_len
+                chunk, chunk_len = [], 0
+        fp.write("".join(chunk))
+        return written + chunk_len
+
+    def generate(self, size: int) -> str:
+        parts = []
+        length = 0
+        while length < size:
+            text = self.statement()
+            parts.append(text)
+            length += len(text)
+        return "".join(parts)
+
+
+def parse_size(text: str) -> int:
+    units = {"K": 1_000, "M": 1_000_000, "G": 1_000_000_000}
+    if text and text[-1].upper() in units:
+        return int(float(text[:-1]) * units[text[-1].upper()])
+    return int(text)
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(
+        description="Generate random JavaScript accepted by js_parser.py"
+    )
+    arg_parser.add_argument("--size", type=parse_size, default=100_000, help="e.g. 10K, 200M")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--depth", type=int, default=6, help="maximum nesting depth")
+    arg_parser.add_argument(
+        "--mix",
+        action="append",
+        default=[],
+        metavar="STATEMENT=WEIGHT",
+        help="statement weight, e.g. IfStatement=5 (repeatable)",
+    )
+    arg_parser.add_argument("--error-rate", type=float, default=0.0)
+    arg_parser.add_argument("--minified", action="store_true", help="single line output")
+    arg_parser.add_argument("--grammar", help="BNF file, default test/backus_naur.txt")
+    arg_parser.add_argument("-o", "--output", help="default: stdout")
+    args = arg_parser.parse_args()
+
+    generator = CorpusGenerator(
+        load_grammar(args.grammar) if args.grammar else None,
+        seed=args.seed,
+        max_depth=args.depth,
+        mix={k: float(v) for k, v in (m.split("=", 1) for m in args.mix)},
+        error_rate=args.error_rate,
+        minified=args.minified,
+    )
+    if args.output:
+        with open(args.output, "w") as file:
+            generator.write(file, args.size)
+    else:
+        generator.write(sys.stdout, args.size)
+    if generator.errors:
+        print(f"injected {generator.errors} error(s)", file=sys.stderr)
@@ -1,10 +1,307 @@
+import hashlib
+import inspect
+import os
+import struct
+import sys
+import tempfile
+from collections.abc import Callable, Hashable, Sequence
+from typing import Any
+
+DEAD = "nil"
+
+MAGIC = b"JSFA"
+VERSION = 1
+
+# Generated matchers by source, so that equal automata are only exec'd once.
+# The oldest is dropped past COMPILED_MAX.
+_COMPILED: dict[str, "CompiledAutomaton"] = {}
+COMPILED_MAX = 128
+
+# Hashes of the source files `cached_automaton` keys its files with.
+_SOURCE_DIGESTS: dict[str, bytes | None] = {}
+
+# Automata from `cached_automaton` by definition.
+_CACHED: dict[Hashable, "CompiledAutomaton"] = {}
+
+
+class CompiledAutomaton:
+    """A DFA with integer states, 0 being the initial one, and the `evaluate`
+    and `accepts` functions `matcher_source` generates for it"""
+
+    def __init__(
+        self,
+        names: list[str],
+        final: set[int],
+        rows: list[dict[str, int]],
+        source: str | None = None,
+    ):
+        self.names = names
+        self.final = final
+        self.rows = rows
+        self.source = source if source is not None else matcher_source(names, final, rows)
+        namespace: dict[str, object] = {}
+        exec(compile(self.source, "<automaton>", "exec"), namespace)
+        self.evaluate: Callable[[str], tuple[bool, str]] = namespace["evaluate"]  # type: ignore
+        self.accepts: Callable[[str], bool] = namespace["accepts"]  # type: ignore
+        self.__arrays: tuple[Any, ...] | None = None
+
+    def evaluate_many(self, strings: Sequence[str]) -> tuple[Any, Any]:
+        """`evaluate` for every string at once, as a boolean array of whether
+        each is accepted and an object array of the states they end in.
+
+        Strings of the same length are matched together, one NumPy gather
+        through the transition table per character position. Needs NumPy.
+        """
+        import numpy as np
+
+        if self.__arrays is None:
+            self.__arrays = self.__build_arrays()
+        classes, table, width, accepting, names = self.__arrays
+        dead = len(self.rows) * width
+
+        count = len(strings)
+        lengths = np.fromiter(map(len, strings), dtype=np.intp, count=count)
+        starts = np.cumsum(lengths) - lengths
+        points = np.frombuffer("".join(strings).encode("utf-32-le"), dtype=np.uint32)
+        # Characters past the alphabet fall in class 0, which only leads to
+        # the dead state.
+        events = classes.take(np.minimum(points, len(classes) - 1))
+
+        # States are kept as the offset of their row in the flattened table,
+        # so a step is a single `take`.
+        states = np.zeros(count, dtype=table.dtype)
+        for length in np.unique(lengths).tolist():
+            if length == 0:
+                continue
+            index = np.flatnonzero(lengths == length)
+            columns = events.take(starts[index, None] + np.arange(length)).T.copy()
+            state = np.zeros(len(index), dtype=table.dtype)
+            for position in range(length):
+                state = table.take(state + columns[position])
+                if position % 8 == 7 and (state == dead).all():
+                    break
+            states[index] = state
+        states //= width
+        return accepting.take(states), names.take(states)
+
+    def __build_arrays(self) -> tuple[Any, ...]:
+        import numpy as np
+
+        dead = len(self.rows)
+        classes, columns = self.char_classes()
+        width = len(columns) + 1
+        size = (dead + 1) * width
+        dtype = np.uint8 if size <= 1 << 8 else np.uint16 if size <= 1 << 16 else np.intp
+
+        # Classes of the code points up to the last one with transitions, and
+        # one more for everything after it.
+        lookup = np.zeros(max(map(ord, classes), default=0) + 2, dtype=dtype)
+        for event, event_class in classes.items():
+            lookup[ord(event)] = event_class
+        table = np.full((dead + 1, width), dead * width, dtype=dtype)
+        for event_class, column in enumerate(columns, 1):
+            table[:dead, event_class] = np.array(column) * width
+        accepting = np.zeros(dead + 1, dtype=bool)
+        accepting[list(self.final)] = True
+        names = np.array(self.names + [DEAD], dtype=object)
+        return lookup, table.ravel(), width, accepting, names
+
+    def char_classes(self) -> tuple[dict[str, int], list[tuple[int, ...]]]:
+        """The class of every character with a transition, and for every class
+        from 1 on the next state from each state, `len(self.rows)` for none.
+
+        Characters with the same next states share a class. Class 0 is left for
+        all other characters, which lead nowhere.
+        """
+        dead = len(self.rows)
+        classes = {}
+        columns: dict[tuple[int, ...], int] = {}
+        for event in sorted({event for row in self.rows for event in row}):
+            column = tuple(row.get(event, dead) for row in self.rows)
+            classes[event] = columns.setdefault(column, len(columns) + 1)
+        return classes, list(columns)
+
+    def to_automaton(self) -> "FiniteAutomaton":
+        automaton = FiniteAutomaton(self.names[0], {self.names[state] for state in self.final})
+        for name, row in zip(self.names, self.rows):
+            automaton.add_transitions(
+                name, {event: self.names[target] for event, target in row.items()}
+            )
+        return automaton
+
+    def dumps(self) -> bytes:
+        """The state names, final states, classes of characters and transition
+        table by state and class, in a compact binary form"""
+        classes, columns = self.char_classes()
+        states = len(self.rows)
+        names = [name.encode("utf-8") for name in self.names]
+        events = list(classes)
+
+        out = bytearray(MAGIC)
+        out.append(VERSION)
+        out += struct.pack("<III", states, len(columns), len(events))
+        out += struct.pack(f"<{states}I", *map(len, names))
+        out += b"".join(names)
+        out += bytes(state in self.final for state in range(states))
+        out += struct.pack(f"<{len(events)}I", *map(ord, events))
+        out += struct.pack(f"<{len(events)}I", *classes.values())
+        table = [column[state] for state in range(states) for column in columns]
+        out += struct.pack(f"<{len(table)}I", *table)
+        return bytes(out)
+
+    @classmethod
+    def loads(cls, data: bytes) -> "CompiledAutomaton":
+        if len(data) < 5 or data[:4] != MAGIC:
+            raise ValueError("not a compiled automaton")
+        if data[4] != VERSION:
+            raise ValueError(f"unsupported compiled automaton version {data[4]}")
+        try:
+            states, width, count = struct.unpack_from("<III", data, 5)
+            pos = 17
+            lengths = struct.unpack_from(f"<{states}I", data, pos)
+            pos += 4 * states
+            names = []
+            for length in lengths:
+                names.append(str(data[pos : pos + length], "utf-8"))
+                pos += length
+            final = {state for state in range(states) if data[pos + state]}
+            pos += states
+            points = struct.unpack_from(f"<{count}I", data, pos)
+            classes = struct.unpack_from(f"<{count}I", data, pos + 4 * count)
+            pos += 8 * count
+            table = struct.unpack_from(f"<{states * width}I", data, pos)
+        except (struct.error, IndexError) as e:
+            raise ValueError(f"truncated compiled automaton: {e}") from None
+        if pos + 4 * states * width != len(data):
+            raise ValueError("trailing data after compiled automaton")
+        if not states:
+            raise ValueError("compiled automaton without states")
+        if any(point > sys.maxunicode for point in points):
+            raise ValueError("character out of range in compiled automaton")
+        if any(not 1 <= event_class <= width for event_class in classes):
+            raise ValueError("character class out of range in compiled automaton")
+        if any(target > states for target in table):
+            raise ValueError("target state out of range in compiled automaton")
+
+        events = [chr(point) for point in points]
+        rows = []
+        for state in range(states):
+            row = {}
+            for event, event_class in zip(events, classes):
+                target = table[state * width + event_class - 1]
+                if target != states:
+                    row[event] = target
+            rows.append(row)
+        return cls(names, final, rows)
+
+
+def cache_dir() -> str | None:
+    """Where `cached_automaton` keeps automata: $PHARSERR_CACHE, or
+    ~/.cache/pharserr when it is not set, or nowhere when it is empty"""
+    path = os.environ.get("PHARSERR_CACHE")
+    if path is None:
+        return os.path.join(os.path.expanduser("~"), ".cache", "pharserr")
+    return path or None
+
+
+def cached_automaton(
+    definition: Hashable, build: Callable[[], "FiniteAutomaton"]
+) -> CompiledAutomaton:
+    """The compiled form of the automaton `build` returns, which must depend on
+    nothing but `definition`.
+
+    It is built only once: kept in this process by `definition`, and in
+    `cache_dir()` under a hash of its repr and of the code building it, so
+    other processes only read the tables back.
+    """
+    compiled = _CACHED.get(definition)
+    if compiled is not None:
+        return compiled
+
+    directory = cache_dir()
+    path = None
+    key = _cache_key(definition, build) if directory is not None else None
+    if directory is not None and key is not None:
+        path = os.path.join(directory, f"automaton-{key}.bin")
+        try:
+            with open(path, "rb") as file:
+                compiled = CompiledAutomaton.loads(file.read())
+        except (OSError, ValueError):
+            pass
+    if compiled is None:
+        compiled = build().compile()
+        if path is not None:
+            _write_cache(path, compiled.dumps())
+
+    compiled = _remember(compiled)
+    _CACHED[definition] = compiled
+    return compiled
+
+
+def _cache_key(definition: Hashable, build: Callable[[], "FiniteAutomaton"]) -> str | None:
+    # Besides the definition, the key covers the code of the builder and of
+    # this module, so that changing either does not serve stale tables. None
+    # when that code cannot be read.
+    key = hashlib.blake2b(repr((VERSION, definition)).encode("utf-8"), digest_size=16)
+    try:
+        builder = inspect.getsourcefile(build)
+    except TypeError:
+        builder = None
+    for path in dict.fromkeys([__file__, builder]):
+        digest = _source_digest(path) if path is not None else None
+        if digest is None:
+            return None
+        key.update(digest)
+    return key.hexdigest()
+
+
+def _source_digest(path: str) -> bytes | None:
+    if path not in _SOURCE_DIGESTS:
+        try:
+            with open(path, "rb") as file:
+                _SOURCE_DIGESTS[path] = hashlib.blake2b(file.read(), digest_size=16).digest()
+        except OSError:
+            _SOURCE_DIGESTS[path] = None
+    return _SOURCE_DIGESTS[path]
+
+
+def _remember(compiled: CompiledAutomaton) -> CompiledAutomaton:
+    # The automaton compiled from the same source before, or `compiled`.
+    known = _COMPILED.get(compiled.source)
+    if known is not None:
+        return known
+    if len(_COMPILED) >= COMPILED_MAX:
+        del _COMPILED[next(iter(_COMPILED))]
+    _COMPILED[compiled.source] = compiled
+    return compiled
+
+
+def _write_cache(path: str, data: bytes) -> None:
+    # Written under a temporary name first so that concurrent readers never
+    # see half a file. A cache that cannot be written only costs a rebuild.
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(temp, path)
+        except OSError:
+            os.unlink(temp)
+            raise
+    except OSError:
+        pass
+
+
 class FiniteAutomaton:
     def __init__(
         self,
         init_state: str,
         final_states: set[str],
-        transitions: dict[str, dict[str, str]] = {},
+        transitions: dict[str, dict[str, str]] | None = None,
     ):
+        if transitions is None:
+            transitions = {}
         self.states = set(transitions.keys())
         self.states.add(init_state)
         for state in final_states:
@@ -17,19 +314,24 @@ class FiniteAutomaton:
 
         self.init_state = init_state
         self.final_states = final_states
+        self.compiled: CompiledAutomaton | None = None
 
     def set_init_state(self, init_state: str):
         self.init_state = init_state
+        self.compiled = None
 
     def add_final_states(self, state: str):
         self.final_states.add(state)
+        self.compiled = None
 
     def add_transitions(self, state: str, transisiton: dict[str, str]):
+        self.compiled = None
         self.states.add(state)
         self.transitions.setdefault(state, {})
         self.transitions[state].update(transisiton)
 
     def add_transition(self, state: str, events: str, next_state: str):
+        self.compiled = None
         self.states.add(state)
         self.transitions.setdefault(state, {})
         for event in events:
@@ -46,16 +348,392 @@ class FiniteAutomaton:
                 break
         return (cur_state in self.final_states, cur_state)
 
+    def compile(self) -> CompiledAutomaton:
+        """The compiled form of this automaton, accepting exactly the same
+        strings, built once until the automaton is changed"""
+        if self.compiled is None:
+            names, final, rows = self.numbered()
+            source = matcher_source(names, final, rows)
+            self.compiled = _COMPILED.get(source)
+            if self.compiled is None:
+                self.compiled = _remember(CompiledAutomaton(names, final, rows, source))
+        return self.compiled
+
+    def evaluate_many(self, strings: Sequence[str]) -> tuple[Any, Any]:
+        return self.compile().evaluate_many(strings)
+
+    def numbered(self) -> tuple[list[str], set[int], list[dict[str, int]]]:
+        """State names, final states and transitions of this automaton with
+        states numbered from 0 for the initial one"""
+        targets = {t for row in self.transitions.values() for t in row.values()}
+        names = [self.init_state] + sorted(
+            (self.states | set(self.transitions) | targets) - {self.init_state}
+        )
+        numbers = {name: i for i, name in enumerate(names)}
+        # Events longer than a character never match in `evaluate` either.
+        rows = [
+            {
+                event: numbers[target]
+                for event, target in self.transitions.get(name, {}).items()
+                if len(event) == 1
+            }
+            for name in names
+        ]
+        final = {numbers[state] for state in self.final_states if state in numbers}
+        return names, final, rows
+
+
+def matcher_source(names: list[str], final: set[int], rows: list[dict[str, int]]) -> str:
+    """Python source matching strings against a DFA with integer states, 0
+    being the initial one.
+
+    The states reachable without going round a cycle are inlined as straight
+    line code, in which the position in the string is a constant until a state
+    looping on itself skips a whole run of characters with `str.lstrip`. Other
+    cycles continue in a loop over the remaining characters with one branch
+    per state.
+    """
+    lines = [f"NAMES = {tuple(names)!r}", f"FINAL = {frozenset(final)!r}"]
+    for i, row in enumerate(rows):
+        loop = "".join(sorted(event for event, target in row.items() if target == i))
+        if loop:
+            lines.append(f"LOOP_{i} = {loop!r}")
+            lines.append(f"LOOP_SET_{i} = frozenset(LOOP_{i})")
+        moves = {event: target for event, target in sorted(row.items()) if target != i}
+        if moves:
+            lines.append(f"ROW_{i} = {moves!r}")
+        for target in sorted(set(moves.values())):
+            events = "".join(event for event, t in moves.items() if t == target)
+            lines.append(f"MOVE_{i}_{target} = frozenset({events!r})")
+
+    for function, dead, result in [
+        ("evaluate", f"(False, {DEAD!r})", "({accepted}, NAMES[{state}])"),
+        ("accepts", "False", "{accepted}"),
+    ]:
+        emitter = _Emitter(final, rows, dead, result)
+        lines += ["", "", f"def _{function}_from(string, i, state):"]
+        lines += emitter.loop()
+        lines += ["", "", f"def {function}(string):", "    n = len(string)"]
+        emitter.state(0, "0", 1, set(), f"_{function}_from")
+        lines += emitter.lines
+    return "\n".join(lines) + "\n"
+
+
+class _Emitter:
+    # States inlined into the straight line part before falling back to the loop.
+    MAX_INLINE = 32
+
+    def __init__(self, final: set[int], rows: list[dict[str, int]], dead: str, result: str):
+        self.final = final
+        self.rows = rows
+        self.dead = dead
+        self.result = result
+        self.lines: list[str] = []
+        self.inlined = 0
+        self.variables = 0
+
+    def done(self, state: int | str) -> str:
+        if isinstance(state, int):
+            return self.result.format(accepted=state in self.final, state=state)
+        return self.result.format(accepted=f"{state} in FINAL", state=state)
+
+    def loop(self) -> list[str]:
+        body = ["    for char in string[i:]:"]
+        # States that loop on themselves come first: long inputs stay in them.
+        order = sorted(range(len(self.rows)), key=lambda i: (i not in self.rows[i].values(), i))
+        for n, i in enumerate(order):
+            looping = i in self.rows[i].values()
+            moving = any(target != i for target in self.rows[i].values())
+            keyword = "if" if n == 0 else "elif"
+            body.append(f"        {keyword} state == {i}:")
+            if looping:
+                body += [f"            if char in LOOP_SET_{i}:", "                continue"]
+            body.append(
+                f"            state = ROW_{i}.get(char, -1)" if moving else "            state = -1"
+            )
+        body += [
+            "        if state < 0:",
+            f"            return {self.dead}",
+            f"    return {self.done('state')}",
+        ]
+        return body
+
+    def state(self, state: int, pos: str, depth: int, path: set[int], fallback: str) -> None:
+        indent = "    " * depth
+        self.inlined += 1
+        row = self.rows[state]
+        if state in row.values():
+            self.variables += 1
+            skipped = f"i{self.variables}"
+            rest = "string" if pos == "0" else f"string[{pos}:]"
+            self.lines.append(f"{indent}{skipped} = n - len({rest}.lstrip(LOOP_{state}))")
+            pos = skipped
+        self.lines += [f"{indent}if n == {pos}:", f"{indent}    return {self.done(state)}"]
+
+        targets = sorted({target for target in row.values() if target != state})
+        if targets:
+            self.lines.append(f"{indent}char = string[{pos}]")
+        following = _advance(pos)
+        for n, target in enumerate(targets):
+            keyword = "if" if n == 0 else "elif"
+            self.lines.append(f"{indent}{keyword} char in MOVE_{state}_{target}:")
+            if target in path or target == state or self.inlined >= self.MAX_INLINE:
+                self.lines.append(f"{indent}    return {fallback}(string, {following}, {target})")
+            else:
+                self.state(target, following, depth + 1, path | {state}, fallback)
+        self.lines.append(f"{indent}return {self.dead}")
+
+
+def _advance(pos: str) -> str:
+    return str(int(pos) + 1) if pos.isdigit() else f"{pos} + 1"
+
+
+class NFA:
+    """A nondeterministic automaton with epsilon moves, states numbered from 0.
+
+    Built with Thompson's construction: every automaton has one start state
+    and one accepting state, and `union`, `concat` and `star` return new
+    automata without changing their operands.
+    """
+
+    def __init__(self):
+        self.moves: list[dict[str, set[int]]] = []
+        self.epsilon: list[set[int]] = []
+        self.start = self.add_state()
+        self.accept = self.start
+
+    def add_state(self) -> int:
+        self.moves.append({})
+        self.epsilon.append(set())
+        return len(self.moves) - 1
+
+    def add_move(self, state: int, events: str, next_state: int):
+        for event in events:
+            self.moves[state].setdefault(event, set()).add(next_state)
+
+    @classmethod
+    def symbol(cls, events: str) -> "NFA":
+        """Accepts any one character of `events`"""
+        nfa = cls()
+        nfa.accept = nfa.add_state()
+        nfa.add_move(nfa.start, events, nfa.accept)
+        return nfa
+
+    @classmethod
+    def literal(cls, string: str) -> "NFA":
+        nfa = cls()
+        for event in string:
+            state = nfa.add_state()
+            nfa.add_move(nfa.accept, event, state)
+            nfa.accept = state
+        return nfa
+
+    def __copy_into(self, other: "NFA") -> int:
+        offset = len(other.moves)
+        for moves, epsilon in zip(self.moves, self.epsilon):
+            other.moves.append({e: {t + offset for t in ts} for e, ts in moves.items()})
+            other.epsilon.append({t + offset for t in epsilon})
+        return offset
+
+    def union(self, other: "NFA") -> "NFA":
+        nfa = NFA()
+        nfa.accept = nfa.add_state()
+        for part in (self, other):
+            offset = part.__copy_into(nfa)
+            nfa.epsilon[nfa.start].add(part.start + offset)
+            nfa.epsilon[part.accept + offset].add(nfa.accept)
+        return nfa
+
+    def concat(self, other: "NFA") -> "NFA":
+        nfa = NFA()
+        first = self.__copy_into(nfa)
+        second = other.__copy_into(nfa)
+        nfa.epsilon[nfa.start].add(self.start + first)
+        nfa.epsilon[self.accept + first].add(other.start + second)
+        nfa.accept = other.accept + second
+        return nfa
+
+    def star(self) -> "NFA":
+        nfa = NFA()
+        nfa.accept = nfa.add_state()
+        offset = self.__copy_into(nfa)
+        nfa.epsilon[nfa.start] |= {self.start + offset, nfa.accept}
+        nfa.epsilon[self.accept + offset] |= {self.start + offset, nfa.accept}
+        return nfa
+
+    def closure(self, states: set[int]) -> frozenset[int]:
+        """`states` and every state reachable from them by epsilon moves"""
+        result = set(states)
+        stack = list(states)
+        while stack:
+            for state in self.epsilon[stack.pop()]:
+                if state not in result:
+                    result.add(state)
+                    stack.append(state)
+        return frozenset(result)
+
+    def accepts(self, string: str) -> bool:
+        current = self.closure({self.start})
+        for event in string:
+            following: set[int] = set()
+            for state in current:
+                following |= self.moves[state].get(event, set())
+            current = self.closure(following)
+        return self.accept in current
+
+    def to_dfa(self) -> "DFA":
+        """Subset construction; only the reachable sets of states become DFA states"""
+        start = self.closure({self.start})
+        numbers = {start: 0}
+        sets = [start]
+        dfa = DFA()
+        while len(dfa.rows) < len(sets):
+            current = sets[len(dfa.rows)]
+            targets: dict[str, set[int]] = {}
+            for state in current:
+                for event, next_states in self.moves[state].items():
+                    targets.setdefault(event, set()).update(next_states)
+            row = {}
+            for event in sorted(targets):
+                target = self.closure(targets[event])
+                if target not in numbers:
+                    numbers[target] = len(sets)
+                    sets.append(target)
+                row[event] = numbers[target]
+            dfa.rows.append(row)
+            if self.accept in current:
+                dfa.final.add(len(dfa.rows) - 1)
+        return dfa
+
+
+class DFA:
+    """A deterministic automaton with integer states, 0 being the initial one.
+
+    `rows[state]` maps each event to the next state; events missing from a
+    row reject the string.
+    """
+
+    def __init__(self, rows: list[dict[str, int]] | None = None, final: set[int] | None = None):
+        self.rows = rows if rows is not None else []
+        self.final = final if final is not None else set()
+
+    @classmethod
+    def from_automaton(cls, automaton: FiniteAutomaton) -> "DFA":
+        names = [automaton.init_state] + sorted(automaton.states - {automaton.init_state})
+        numbers = {name: i for i, name in enumerate(names)}
+        dfa = cls()
+        for name in names:
+            row = {}
+            for event, target in automaton.transitions.get(name, {}).items():
+                if target not in numbers:
+                    numbers[target] = len(names)
+                    names.append(target)
+                row[event] = numbers[target]
+            dfa.rows.append(row)
+        dfa.rows += [{} for _ in range(len(names) - len(dfa.rows))]
+        dfa.final = {numbers[state] for state in automaton.final_states if state in numbers}
+        return dfa
+
+    def accepts(self, string: str) -> bool:
+        state = 0
+        for event in string:
+            next_state = self.rows[state].get(event)
+            if next_state is None:
+                return False
+            state = next_state
+        return state in self.final
+
+    def minimize(self) -> "DFA":
+        """The equivalent DFA with the fewest states (Hopcroft's algorithm),
+        without unreachable states or states that can never accept"""
+        dead = len(self.rows)
+        rows = self.rows + [{}]
+        alphabet = sorted({event for row in rows for event in row})
+        inverse: dict[str, list[set[int]]] = {event: [set() for _ in rows] for event in alphabet}
+        for state, row in enumerate(rows):
+            for event in alphabet:
+                inverse[event][row.get(event, dead)].add(state)
+
+        final = frozenset(self.final)
+        partition = [block for block in (final, frozenset(range(len(rows))) - final) if block]
+        waiting = [min(partition, key=len)] if len(partition) == 2 else []
+        while waiting:
+            splitter = waiting.pop()
+            for event in alphabet:
+                predecessors = set().union(*(inverse[event][s] for s in splitter))
+                if not predecessors:
+                    continue
+                refined = []
+                for block in partition:
+                    inside = block & predecessors
+                    outside = block - predecessors
+                    if not inside or not outside:
+                        refined.append(block)
+                        continue
+                    refined += [inside, outside]
+                    if block in waiting:
+                        waiting.remove(block)
+                        waiting += [inside, outside]
+                    else:
+                        waiting.append(min(inside, outside, key=len))
+                partition = refined
+
+        block_of = {state: block for block in partition for state in block}
+        if dead in block_of[0]:
+            return DFA([{}], set())
+        # Number the blocks in the order they are reached from the initial
+        # state, dropping the one holding the dead state.
+        numbers = {block_of[0]: 0}
+        order = [block_of[0]]
+        minimized = DFA()
+        while len(minimized.rows) < len(order):
+            block = order[len(minimized.rows)]
+            state = min(block)
+            row = {}
+            for event in alphabet:
+                target = block_of[rows[state].get(event, dead)]
+                if dead in target:
+                    continue
+                if target not in numbers:
+                    numbers[target] = len(order)
+                    order.append(target)
+                row[event] = numbers[target]
+            minimized.rows.append(row)
+            if state in self.final:
+                minimized.final.add(len(minimized.rows) - 1)
+        return minimized
+
+    def to_automaton(self, prefix: str = "q") -> FiniteAutomaton:
+        automaton = FiniteAutomaton(f"{prefix}0", {f"{prefix}{state}" for state in self.final})
+        for state, row in enumerate(self.rows):
+            automaton.add_transitions(
+                f"{prefix}{state}", {event: f"{prefix}{target}" for event, target in row.items()}
+            )
+        return automaton
+
 
 class IdentifierAutomaton:
+    ALPHABET = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    NUMBERS = "0123456789"
+
     def __init__(self):
-        alphabet = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
-        numbers = "0123456789"
-        self.automaton = FiniteAutomaton("q0", {"q1", "q2"})
-        self.automaton.add_transition("q0", alphabet + "_", "q1")
-        self.automaton.add_transition("q1", alphabet + "_" + numbers, "q2")
-        self.automaton.add_transition("q2", alphabet + "_" + numbers, "q2")
+        definition = ("identifier", self.ALPHABET, self.NUMBERS)
+        self.compiled = cached_automaton(definition, self.build)
+        self.accepts = self.compiled.accepts
+
+    @classmethod
+    def build(cls) -> FiniteAutomaton:
+        head = NFA.symbol(cls.ALPHABET + "_")
+        tail = NFA.symbol(cls.ALPHABET + "_" + cls.NUMBERS).star()
+        return head.concat(tail).to_dfa().minimize().to_automaton()
+
+    @property
+    def automaton(self) -> FiniteAutomaton:
+        return self.compiled.to_automaton()
 
     def validate(self, string: str) -> bool:
-        acc, _ = self.automaton.evaluate(string)
-        return acc
+        return self.accepts(string)
+
+    def validate_many(self, strings: Sequence[str]) -> Any:
+        """A boolean array of whether each string is a valid identifier; needs NumPy"""
+        return self.compiled.evaluate_many(strings)[0]
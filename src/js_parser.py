@@ -1,10 +1,13 @@
+import contextlib
 import os
 import sys
+from collections.abc import Callable, Iterable, Iterator, Sequence
 from pprint import pprint as print
 from typing import Any
 from finite_automaton import IdentifierAutomaton
+from parse_budget import ParseBudget
 
-from tokenizer import Location, Token, TokenKind, Tokenizer
+from tokenizer import LineIndex, Location, Token, TokenKind, Tokenizer
 
 TOKENS = {
     TokenKind.OPEN_PAREN: "(",
@@ -83,9 +86,145 @@ KEYWORDS = [
     "do",
 ]
 
+# Grammar productions, i.e. the private `__<name>` methods of JSParser that can
+# be wrapped through `JSParser._instrument`.
+PRODUCTIONS = [
+    "program",
+    "statement_list",
+    "statement",
+    "empty_statement",
+    "block_statement",
+    "while_statement",
+    "for_statement",
+    "if_statement",
+    "switch_statement",
+    "switchcase_list",
+    "switchcase",
+    "try_statement",
+    "return_statement",
+    "throw_statement",
+    "break_statement",
+    "continue_statement",
+    "function_declaration",
+    "parameter_list",
+    "parameter",
+    "catch_clause",
+    "dowhile_statement",
+    "labeled_statement",
+    "expression_statement",
+    "variable_declaration",
+    "variable_declarator",
+    "expression",
+    "conditional_expr",
+    "assignment_expr",
+    "logic_expr",
+    "or_expr",
+    "and_expr",
+    "binary_expr",
+    "comp_expr",
+    "bit_expr",
+    "add_expr",
+    "mul_expr",
+    "pow_expr",
+    "unary_expr",
+    "update_expr",
+    "member_expr",
+    "prim_expr",
+    "object_expr",
+    "properties",
+    "property",
+    "array_expr",
+    "array_elements",
+    "identifier",
+    "literal",
+    "numeric_literal",
+    "str_literal",
+]
+
+
+class LazyBody(Sequence[dict[str, Any]]):
+    """The `(BlockStatement,)` body of a FunctionDeclaration read in lazy mode.
+
+    Only the braces were matched when the function was declared; the block is
+    parsed on first access, in the loop/switch/label context of the
+    declaration and under the ParseBudget of its parse, if any. Syntax errors
+    and exceeded budgets inside the body are raised at that point.
+    """
+
+    def __init__(
+        self,
+        tokenizer: Tokenizer,
+        start: Token,
+        end: int,
+        context: tuple[Any, ...],
+        ranges: bool,
+        line_index: LineIndex | None,
+        budget: ParseBudget | None = None,
+    ):
+        self.source = tokenizer.source
+        self.source_offset = tokenizer.source_offset
+        self.file_path = tokenizer.file_path
+        self.start = start.offset
+        self.end = end
+        self.row = start.location.row
+        self.context = context
+        self.ranges = ranges
+        self.line_index = line_index
+        self.budget = budget
+        self.__body: tuple[dict[str, Any]] | None = None
+
+    @property
+    def text(self) -> str:
+        return self.source[self.start - self.source_offset : self.end - self.source_offset]
+
+    @property
+    def parsed(self) -> bool:
+        return self.__body is not None
+
+    def parse(self) -> tuple[dict[str, Any]]:
+        if self.__body is None:
+            parser = JSParser(ranges=self.ranges, lazy_functions=True)
+            if self.budget is None:
+                self.__body = (parser._parse_lazy_body(self),)
+            else:
+                with parser._instrumented(self.budget.hooks(parser)):
+                    self.__body = (parser._parse_lazy_body(self),)
+        return self.__body
+
+    def __getitem__(self, index):
+        return self.parse()[index]
+
+    def __len__(self) -> int:
+        return 1
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, LazyBody):
+            other = other.parse()
+        return self.parse() == other
+
+    def __repr__(self) -> str:
+        if self.__body is not None:
+            return repr(self.__body)
+        return f"LazyBody({self.file_path}:{self.row}, {self.end - self.start} chars)"
+
+
+def materialize(node: Any) -> Any:
+    """Parses every lazy function body under `node`, in place, and returns it"""
+    stack = [node]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            for key, child in value.items():
+                if isinstance(child, LazyBody):
+                    value[key] = child = child.parse()
+                stack.append(child)
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return node
+
 
 class JSParser:
-    def __init__(self):
+    def __init__(self, ranges: bool = False, lazy_functions: bool = False):
         self.__prev_token_row = 0
         self.__loop_count = 0
         self.__switch_count = 0
@@ -93,16 +232,187 @@ class JSParser:
         self.__labels: set[str] = set()
         self.__loop_labels: set[str] = set()
         self.identifier_automaton = IdentifierAutomaton()
-
-    def parse_string(self, string: str) -> dict[str, Any]:
-        self.tokenizer = Tokenizer.from_string(string, TOKENS)
+        self.ranges = ranges
+        self.lazy_functions = lazy_functions
+        self.__budget: ParseBudget | None = None
+        self.line_index: LineIndex | None = None
+        if ranges:
+            self.__enable_ranges()
+
+    def parse_string(
+        self, string: str, budget: ParseBudget | None = None
+    ) -> dict[str, Any]:
+        if budget is None:
+            return self.__parse(Tokenizer.from_string(string, TOKENS))
+        budget.check_string(string)
+        with self._instrumented(budget.hooks(self)):
+            return self.__parse(Tokenizer.from_string(string, TOKENS), budget)
+
+    def parse_file(
+        self, file_path: str, budget: ParseBudget | None = None
+    ) -> dict[str, Any]:
+        if budget is None:
+            return self.__parse(Tokenizer.from_file(file_path, TOKENS))
+        budget.check_size(os.path.getsize(file_path))
+        with self._instrumented(budget.hooks(self)):
+            return self.__parse(Tokenizer.from_file(file_path, TOKENS), budget)
+
+    def parse_fragment(
+        self, fragment: str, offset: int = 0, row: int = 1, file_path: str = "string"
+    ) -> dict[str, Any]:
+        """Parses `fragment` as a program, locating its tokens as if it started
+        on line `row`, `offset` characters into `file_path`."""
+        if self.ranges and offset:
+            raise ValueError("ranges need the whole source, parse it with parse_string")
+        return self.__parse(Tokenizer.from_fragment(fragment, file_path, TOKENS, offset, row))
+
+    def __parse(self, tokenizer: Tokenizer, budget: ParseBudget | None = None) -> dict[str, Any]:
+        # A previous parse may have stopped half way through a construct.
+        self.__prev_token_row = 0
+        self.__loop_count = 0
+        self.__switch_count = 0
+        self.__function_count = 0
+        self.__labels = set()
+        self.__loop_labels = set()
+        self.__budget = budget
+        self.tokenizer = tokenizer
+        if self.ranges:
+            self.line_index = LineIndex(tokenizer.source, tokenizer.file_path)
         self.lookahead = self.tokenizer.peek()
         return self.__program()
 
-    def parse_file(self, file_path: str) -> dict[str, Any]:
-        self.tokenizer = Tokenizer.from_file(file_path, TOKENS)
+    def _parse_lazy_body(self, body: LazyBody) -> dict[str, Any]:
+        return self.__lazy_body(body)
+
+    def __lazy_body(self, body: LazyBody) -> dict[str, Any]:
+        self.__budget = body.budget
+        self.tokenizer = Tokenizer.from_source(
+            body.source,
+            body.file_path,
+            TOKENS,
+            body.start,
+            body.end,
+            body.row,
+            body.source_offset,
+        )
+        (
+            self.__loop_count,
+            self.__switch_count,
+            self.__function_count,
+            labels,
+            loop_labels,
+        ) = body.context
+        self.__labels = set(labels)
+        self.__loop_labels = set(loop_labels)
+        self.line_index = body.line_index
         self.lookahead = self.tokenizer.peek()
-        return self.__program()
+        block = self.__block_statement()
+        if not self.tokenizer.stop:
+            self.tokenizer.print_err("Unexpected token after function body", self.lookahead)
+        return block
+
+    def _instrument(
+        self,
+        wrap: Callable[[str, Callable[..., Any]], Callable[..., Any]],
+        names: Iterable[str],
+    ) -> None:
+        """Replace the given private methods of this instance by `wrap(name, method)`.
+
+        Hooks are installed per instance, so parsers that are not instrumented
+        keep calling the plain methods with no extra checks.
+        """
+        for name in names:
+            attr = f"_JSParser__{name}"
+            setattr(self, attr, wrap(name, getattr(self, attr)))
+
+    @contextlib.contextmanager
+    def _instrumented(
+        self,
+        hooks: list[tuple[Callable[[str, Callable[..., Any]], Callable[..., Any]], Iterable[str]]],
+    ) -> Iterator[None]:
+        """Install `(wrap, names)` hooks like `_instrument` for the duration of a block"""
+        saved = {
+            name: value
+            for name, value in vars(self).items()
+            if name.startswith("_JSParser__") and callable(value)
+        }
+        try:
+            for wrap, names in hooks:
+                self._instrument(wrap, names)
+            yield
+        finally:
+            for name, value in list(vars(self).items()):
+                if name.startswith("_JSParser__") and callable(value):
+                    delattr(self, name)
+            for name, value in saved.items():
+                setattr(self, name, value)
+
+    def __enable_ranges(self) -> None:
+        self.__last_end = 0
+
+        def wrap_consume(_: str, consume: Callable[..., Token]) -> Callable[..., Token]:
+            def consume_with_end(*args: Any) -> Token:
+                token = consume(*args)
+                self.__last_end = token.offset + len(token.text)
+                return token
+
+            return consume_with_end
+
+        def wrap_production(_: str, production: Callable[..., Any]) -> Callable[..., Any]:
+            def production_with_range(*args: Any) -> Any:
+                start = self.lookahead.offset if self.lookahead is not None else 0
+                node = production(*args)
+                if isinstance(node, dict) and "start" not in node:
+                    node["start"] = start
+                    node["end"] = max(start, self.__last_end)
+                    self.__fill_ranges(node)
+                return node
+
+            return production_with_range
+
+        self._instrument(wrap_consume, ["consume_token", "consume_keyword"])
+        # A labeled statement starts at its label, which has already been
+        # consumed when the production is entered; its range is set by the
+        # enclosing expression statement instead.
+        self._instrument(
+            wrap_production, [p for p in PRODUCTIONS if p != "labeled_statement"]
+        )
+
+    def __fill_ranges(self, node: dict[str, Any]) -> None:
+        # Nodes built inside a production's loop (e.g. `a + b` in `a + b + c`)
+        # are not returned by any production; derive their range from children.
+        for child in self.__children(node):
+            if "start" not in child:
+                self.__fill_ranges(child)
+                children = list(self.__children(child))
+                child["start"] = min(c["start"] for c in children)
+                child["end"] = max(c["end"] for c in children)
+                if child["type"] == "MemberExpression":
+                    child["end"] = self.__computed_member_end(child)
+
+    def __computed_member_end(self, node: dict[str, Any]) -> int:
+        assert self.line_index is not None
+        content = self.line_index.content
+        prop = node["property"]
+        before = prop["start"] - 1
+        while before >= 0 and (content[before].isspace() or content[before] == "("):
+            before -= 1
+        if before < 0 or content[before] != "[":
+            return node["end"]
+        after = prop["end"]
+        while after < len(content) and (content[after].isspace() or content[after] == ")"):
+            after += 1
+        return after + 1
+
+    @staticmethod
+    def __children(node: dict[str, Any]) -> Iterable[dict[str, Any]]:
+        for value in node.values():
+            if isinstance(value, dict):
+                yield value
+            elif isinstance(value, (list, tuple)):
+                for item in value:
+                    if isinstance(item, dict):
+                        yield item
 
     def __program(self) -> dict[str, Any]:
         node: dict[Any, Any] = {"type": "Program"}
@@ -460,7 +770,10 @@ class JSParser:
         )
 
         self.__consume_token(TokenKind.CLOSE_PAREN)
-        body = (self.__block_statement(),)
+        if self.lazy_functions and self.lookahead.kind == TokenKind.OPEN_CURLY:
+            body: Sequence[dict[str, Any]] = self.__skip_function_body()
+        else:
+            body = (self.__block_statement(),)
         self.__function_count -= 1
 
         return {
@@ -470,6 +783,33 @@ class JSParser:
             "body": body,
         }
 
+    def __skip_function_body(self) -> LazyBody:
+        assert self.lookahead is not None
+        start = self.lookahead
+        context = (
+            self.__loop_count,
+            self.__switch_count,
+            self.__function_count,
+            frozenset(self.__labels),
+            frozenset(self.__loop_labels),
+        )
+        end = self.tokenizer.skip_block()
+        body = LazyBody(
+            self.tokenizer, start, end, context, self.ranges, self.line_index, self.__budget
+        )
+
+        # Same bookkeeping as consuming the closing `}`.
+        if self.ranges:
+            self.__last_end = end
+        self.__prev_token_row = self.tokenizer.row
+        next_token = self.tokenizer.peek()
+        self.lookahead = (
+            next_token
+            if next_token is not None
+            else Token("}", TokenKind.CLOSE_CURLY, self.tokenizer.location(), end - 1)
+        )
+        return body
+
     def __parameter_list(self) -> list[dict[str, Any]]:
         assert self.lookahead is not None
         parameters = []
@@ -1038,10 +1378,48 @@ class JSParser:
 
 
 if __name__ == "__main__":
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="JavaScript (Node.js) parser")
+    arg_parser.add_argument("source_code", help="path of the JavaScript file to parse")
+    arg_parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="print per-production timings to stderr",
+    )
+    arg_parser.add_argument(
+        "--collapsed",
+        metavar="PATH",
+        help="with --profile, write collapsed stacks for flame graphs to PATH",
+    )
+    arg_parser.add_argument(
+        "--memstats",
+        action="store_true",
+        help="print peak memory and allocations per node type to stderr",
+    )
+    args = arg_parser.parse_args()
+
     parser = JSParser()
 
-    # print(parser.parse_file(os.path.dirname(os.path.abspath(__file__)) + "/test/inputAcc.js"))
-    print(parser.parse_file(os.path.abspath(sys.argv[1])))
+    if args.profile:
+        from parser_profile import ParseProfiler
+
+        profiler = ParseProfiler(parser)
+        print(profiler.parse_file(os.path.abspath(args.source_code)))
+        sys.stderr.write(profiler.report() + "\n")
+        if args.collapsed:
+            with open(args.collapsed, "w") as file:
+                file.write(profiler.collapsed() + "\n")
+    elif args.memstats:
+        from memstats import MemoryProfiler
+
+        mem_profiler = MemoryProfiler(parser, by_module=True)
+        print(mem_profiler.parse_file(os.path.abspath(args.source_code)))
+        assert mem_profiler.last is not None
+        sys.stderr.write(mem_profiler.last.report() + "\n")
+    else:
+        # print(parser.parse_file(os.path.dirname(os.path.abspath(__file__)) + "/test/inputAcc.js"))
+        print(parser.parse_file(os.path.abspath(args.source_code)))
 
 # for token in (tokenizer := Tokenizer.from_file("test/inputAcc.js", TOKENS)):
 #     if token.kind == TokenKind.WORD and token.text == "if":
@@ -0,0 +1,814 @@
+import argparse
+import os
+import sys
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from types import ModuleType
+from typing import Any, NoReturn
+
+from bnf import GRAMMAR_PATH, Grammar, load_grammar, terminal
+from js_parser import TOKENS
+from tokenizer import LineIndex, Token, TokenKind, Tokenizer
+
+END = "$"
+TABLES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ll1_tables.py")
+
+Rules = dict[str, list[list[str]]]
+
+# Rules of backus_naur.txt whose shape disagrees with the AST JSParser builds.
+# The BNF reads `a.b + c` as `a . (b + c)` and allows a single `[...]`, while
+# JSParser chains member accesses and binds them tighter than any operator.
+# The BNF `for` header also takes three expressions only, while JSParser takes
+# a declaration as initializer and lets any of the three parts be empty.
+OVERRIDES: Rules = {
+    "MemberExpression": [
+        ["PrimaryExpression"],
+        ["MemberExpression", "[", "PrimaryExpression", "]"],
+        ["MemberExpression", ".", "Identifier"],
+    ],
+    "ForStatement": [
+        ["for", "(", "ForInit", "OptionalExpression", ";", "OptionalExpression", ")", "Statement"]
+    ],
+    "ForInit": [["ForDeclaration"], ["Expression", ";"], [";"]],
+    "ForDeclaration": [
+        ["var", "VariableDeclaratorList", ";"],
+        ["let", "VariableDeclaratorList", ";"],
+        ["const", "VariableDeclaratorList", ";"],
+    ],
+    "OptionalExpression": [["Expression"], []],
+}
+
+# Conflicts two tokens of lookahead leave open are resolved towards the longer
+# alternative (a dangling `else` binds to the inner `if`, `a` followed by
+# `+ b` on the next line continues the expression), then towards these, then
+# towards the earlier production. JSParser reads `{` at the start of a
+# statement as a block and `x:` as a label.
+PREFERRED = {"BlockStatement", "LabeledStatement"}
+
+# A cell of the parse table: the production to expand, or for LL(1) conflicts
+# the production for each second token of lookahead, with None as default.
+Decision = int | dict[str | None, int]
+
+
+@dataclass
+class LL1Grammar:
+    """A grammar rewritten for predictive parsing, with its FIRST/FOLLOW sets.
+
+    Left recursion is replaced by tail nonterminals `X'` (`X' -> a X' | ε`),
+    which the parser expands in place without growing its stack, and common
+    prefixes are factored into helper nonterminals `X_1`, `X_2`, ...; both
+    kinds are listed in `helpers` and spliced back into their parent in parse
+    trees.
+    """
+
+    start: str
+    rules: Rules
+    repeat: set[str] = field(default_factory=set)
+    helpers: set[str] = field(default_factory=set)
+    first: dict[str, set[str]] = field(default_factory=dict)
+    first2: dict[str, set[tuple[str, ...]]] = field(default_factory=dict)
+    follow: dict[str, set[str]] = field(default_factory=dict)
+    nullable: set[str] = field(default_factory=set)
+    productions: list[tuple[str, tuple[str, ...]]] = field(default_factory=list)
+    table: dict[str, dict[str, list[int]]] = field(default_factory=dict)
+    decisions: dict[str, dict[str, Decision]] = field(default_factory=dict)
+
+    def conflicts(self) -> list[tuple[str, str, list[int]]]:
+        """Every (nonterminal, lookahead) cell predicting more than one production"""
+        return [
+            (nonterminal, lookahead, cell)
+            for nonterminal, row in self.table.items()
+            for lookahead, cell in row.items()
+            if len(cell) > 1
+        ]
+
+    def first_of(self, symbols: tuple[str, ...] | list[str]) -> tuple[set[str], bool]:
+        """FIRST set of a symbol sequence and whether it derives ε"""
+        result: set[str] = set()
+        for symbol in symbols:
+            if symbol not in self.rules:
+                result.add(symbol)
+                return result, False
+            result |= self.first[symbol]
+            if symbol not in self.nullable:
+                return result, False
+        return result, True
+
+    def first2_of(self, symbols: tuple[str, ...] | list[str]) -> set[tuple[str, ...]]:
+        """The strings of up to two terminals a symbol sequence can start with;
+        shorter ones are complete derivations"""
+        result: set[tuple[str, ...]] = {()}
+        for symbol in symbols:
+            starts = self.first2[symbol] if symbol in self.rules else {(symbol,)}
+            result = {
+                (prefix + start)[:2] if len(prefix) < 2 else prefix
+                for prefix in result
+                for start in starts
+            }
+            if all(len(prefix) == 2 for prefix in result):
+                break
+        return result
+
+    def lookahead2(self, production: int) -> set[tuple[str, ...]]:
+        """The two tokens of lookahead predicting `production`, approximating
+        what follows its nonterminal by the FOLLOW set"""
+        name, rhs = self.productions[production]
+        follow = {(symbol,) for symbol in self.follow[name]}
+        return {
+            (prefix + end)[:2] if len(prefix) < 2 else prefix
+            for prefix in self.first2_of(rhs)
+            for end in (follow if len(prefix) < 2 else {()})
+        }
+
+    def resolve(self, lookahead: str, cell: list[int]) -> Decision:
+        def rank(production: int) -> tuple[bool, bool, int]:
+            rhs = self.productions[production][1]
+            return (not rhs, not rhs or rhs[0] not in PREFERRED, production)
+
+        choices: dict[str, int] = {}
+        candidates: dict[str, list[int]] = {}
+        for production in cell:
+            for start in self.lookahead2(production):
+                if start[0] == lookahead and len(start) == 2:
+                    candidates.setdefault(start[1], []).append(production)
+        for second, productions in sorted(candidates.items()):
+            choices[second] = min(productions, key=rank)
+
+        # The most common choice becomes the default, also for any second
+        # token the approximated lookahead missed.
+        chosen = list(choices.values()) or [min(cell, key=rank)]
+        default = min(set(chosen), key=lambda p: (-chosen.count(p), rank(p)))
+        decision: dict[str | None, int] = {None: default}
+        decision.update((s, p) for s, p in choices.items() if p != default)
+        return decision
+
+    def report(self) -> str:
+        lines = []
+        for nonterminal, lookahead, cell in self.conflicts():
+            alternatives = " | ".join(" ".join(self.productions[p][1]) or "ε" for p in cell)
+            decision = self.decisions[nonterminal][lookahead]
+            assert isinstance(decision, dict)
+            resolution = ", ".join(
+                f"`{second}` -> {production}"
+                for second, production in decision.items()
+                if second is not None
+            )
+            default = f"{decision[None]}"
+            resolution = f"{resolution}, else {default}" if resolution else default
+            lines.append(f"{nonterminal} on `{lookahead}`: {alternatives}  [{resolution}]")
+        return "\n".join(lines)
+
+
+def left_reachable(rules: Rules, symbol: str) -> set[str]:
+    """Nonterminals that can appear first in a derivation of `symbol`"""
+    seen: set[str] = set()
+    stack = [symbol]
+    while stack:
+        for alternative in rules[stack.pop()]:
+            if alternative and alternative[0] in rules and alternative[0] not in seen:
+                seen.add(alternative[0])
+                stack.append(alternative[0])
+    return seen
+
+
+def eliminate_left_recursion(rules: Rules) -> tuple[Rules, set[str]]:
+    rules = {name: [list(alt) for alt in alternatives] for name, alternatives in rules.items()}
+    tails = set()
+    names = list(rules)
+    for i, name in enumerate(names):
+        # Only substitute the earlier rules that lead back to this one.
+        for earlier in names[:i]:
+            if name not in left_reachable(rules, earlier) and earlier != name:
+                continue
+            substituted = []
+            for alternative in rules[name]:
+                if alternative and alternative[0] == earlier:
+                    substituted.extend(alt + alternative[1:] for alt in rules[earlier])
+                else:
+                    substituted.append(alternative)
+            rules[name] = substituted
+
+        recursive = [alt[1:] for alt in rules[name] if alt and alt[0] == name]
+        if recursive:
+            tail = f"{name}'"
+            rules[name] = [alt + [tail] for alt in rules[name] if not alt or alt[0] != name]
+            rules[tail] = [alt + [tail] for alt in recursive] + [[]]
+            tails.add(tail)
+    return rules, tails
+
+
+def left_factor(rules: Rules, keep: set[str]) -> tuple[Rules, set[str]]:
+    """Factors common prefixes out of every rule except those in `keep`"""
+    rules = {name: _unique(alternatives) for name, alternatives in rules.items()}
+    helpers = set()
+    queue = [name for name in rules if name not in keep]
+    while queue:
+        name = queue.pop(0)
+        alternatives = rules[name]
+        firsts = [alt[0] for alt in alternatives if alt]
+        shared = next((s for s in firsts if firsts.count(s) > 1), None)
+        if shared is None:
+            continue
+        group = [alt for alt in alternatives if alt and alt[0] == shared]
+        prefix = group[0]
+        for alt in group[1:]:
+            length = 0
+            while length < min(len(prefix), len(alt)) and prefix[length] == alt[length]:
+                length += 1
+            prefix = prefix[:length]
+
+        n = 1
+        while f"{name}_{n}" in rules:
+            n += 1
+        helper = f"{name}_{n}"
+        helpers.add(helper)
+        rules[helper] = _unique([alt[len(prefix) :] for alt in group])
+        rest = [alt for alt in alternatives if alt not in group]
+        index = alternatives.index(group[0])
+        index -= sum(1 for alt in alternatives[:index] if alt in group)
+        rules[name] = rest[:index] + [prefix + [helper]] + rest[index:]
+        queue += [name, helper]
+    return rules, helpers
+
+
+def _unique(alternatives: list[list[str]]) -> list[list[str]]:
+    result: list[list[str]] = []
+    for alternative in alternatives:
+        if alternative not in result:
+            result.append(list(alternative))
+    return result
+
+
+def build(grammar: Grammar, overrides: Rules = OVERRIDES) -> LL1Grammar:
+    rules, repeat = eliminate_left_recursion({**grammar.rules, **overrides})
+    # Tails stay `X' -> a X' | ε`, so that each repetition is one expansion.
+    rules, factored = left_factor(rules, repeat)
+    ll1 = LL1Grammar(grammar.start, rules, repeat, repeat | factored)
+    _first_sets(ll1)
+    _first2_sets(ll1)
+    _follow_sets(ll1)
+    _fill_table(ll1)
+    return ll1
+
+
+def _first_sets(ll1: LL1Grammar) -> None:
+    ll1.first = {name: set() for name in ll1.rules}
+    changed = True
+    while changed:
+        changed = False
+        for name, alternatives in ll1.rules.items():
+            for alternative in alternatives:
+                first, nullable = ll1.first_of(alternative)
+                if not first <= ll1.first[name] or (nullable and name not in ll1.nullable):
+                    ll1.first[name] |= first
+                    if nullable:
+                        ll1.nullable.add(name)
+                    changed = True
+
+
+def _first2_sets(ll1: LL1Grammar) -> None:
+    ll1.first2 = {name: set() for name in ll1.rules}
+    changed = True
+    while changed:
+        changed = False
+        for name, alternatives in ll1.rules.items():
+            for alternative in alternatives:
+                starts = ll1.first2_of(alternative)
+                if not starts <= ll1.first2[name]:
+                    ll1.first2[name] |= starts
+                    changed = True
+
+
+def _follow_sets(ll1: LL1Grammar) -> None:
+    ll1.follow = {name: set() for name in ll1.rules}
+    ll1.follow[ll1.start].add(END)
+    changed = True
+    while changed:
+        changed = False
+        for name, alternatives in ll1.rules.items():
+            for alternative in alternatives:
+                for i, symbol in enumerate(alternative):
+                    if symbol not in ll1.rules:
+                        continue
+                    first, nullable = ll1.first_of(alternative[i + 1 :])
+                    follow = first | (ll1.follow[name] if nullable else set())
+                    if not follow <= ll1.follow[symbol]:
+                        ll1.follow[symbol] |= follow
+                        changed = True
+
+
+def _fill_table(ll1: LL1Grammar) -> None:
+    for name, alternatives in ll1.rules.items():
+        row: dict[str, list[int]] = {}
+        for alternative in alternatives:
+            index = len(ll1.productions)
+            ll1.productions.append((name, tuple(alternative)))
+            first, nullable = ll1.first_of(alternative)
+            for lookahead in sorted(first | (ll1.follow[name] if nullable else set())):
+                row.setdefault(lookahead, []).append(index)
+        ll1.table[name] = dict(sorted(row.items()))
+
+    for name, row in ll1.table.items():
+        ll1.decisions[name] = {
+            lookahead: cell[0] if len(cell) == 1 else ll1.resolve(lookahead, cell)
+            for lookahead, cell in row.items()
+        }
+
+
+def emit(ll1: LL1Grammar, source: str) -> str:
+    """Python source of a module holding the parse tables of `ll1`"""
+    lines = [
+        f"# Generated by ll1.py from {source}; do not edit.",
+        "# Regenerate with `python ll1.py`.",
+        "# fmt: off",
+        "# flake8: noqa",
+        "",
+        f"START = {ll1.start!r}",
+        "",
+        f"HELPERS = {sorted(ll1.helpers)!r}",
+        "",
+        "PRODUCTIONS = [",
+    ]
+    for i, (name, rhs) in enumerate(ll1.productions):
+        lines.append(f"    ({name!r}, {rhs!r}),  # {i}")
+    lines += ["]", "", "TABLE = {"]
+    for name, row in ll1.decisions.items():
+        lines.append(f"    {name!r}: {{")
+        for lookahead, decision in row.items():
+            lines.append(f"        {lookahead!r}: {decision!r},")
+        lines.append("    },")
+    lines += ["}", "", "CONFLICTS = ["]
+    for name, lookahead, cell in ll1.conflicts():
+        lines.append(f"    ({name!r}, {lookahead!r}, {tuple(cell)!r}),")
+    lines += ["]", ""]
+    return "\n".join(lines)
+
+
+@dataclass
+class ParseNode:
+    symbol: str
+    children: list["ParseNode | Token"]
+
+
+class LL1Parser:
+    """Parses with the generated tables and builds the same AST as JSParser.
+
+    Every table cell decides on the next token alone, or for the cells where
+    the BNF is not LL(1) (see `CONFLICTS`) on the two next tokens, so parsing
+    never backtracks and stops at the first token no production predicts.
+
+    Only the BNF, with `OVERRIDES`, is checked: the rules JSParser enforces on
+    top of it, such as line breaks between statements or `return` inside
+    functions, are not, so this parser accepts programs JSParser rejects. The
+    BNF is also stricter than JSParser in places, and these are rejected here:
+    empty `[]`, `{}` and `switch` bodies, a trailing comma in an object, and a
+    `for` declaration ended by a line break instead of `;`.
+    """
+
+    def __init__(self, tables: ModuleType | None = None):
+        if tables is None:
+            import ll1_tables as tables
+        self.start: str = tables.START
+        self.table: dict[str, dict[str, Decision]] = tables.TABLE
+        self.helpers = set(tables.HELPERS)
+        # Right hand sides reversed, in the order they are pushed on the stack.
+        self.expansions = [tuple(reversed(rhs)) for _, rhs in tables.PRODUCTIONS]
+
+    def parse_string(self, string: str) -> dict[str, Any]:
+        return self.__build(Tokenizer.from_string(string, TOKENS))
+
+    def parse_file(self, file_path: str) -> dict[str, Any]:
+        return self.__build(Tokenizer.from_file(file_path, TOKENS))
+
+    def parse_tree(self, string: str) -> ParseNode:
+        """The concrete parse tree of `string`, with helper nonterminals spliced
+        into their parents"""
+        return self.__parse(Tokenizer.from_string(string, TOKENS))[0]
+
+    def accepts(self, string: str) -> bool:
+        tokenizer = Tokenizer.from_string(string, TOKENS)
+        return isinstance(self.__derive(list(tokenizer)), ParseNode)
+
+    def __build(self, tokenizer: Tokenizer) -> dict[str, Any]:
+        tree, lines = self.__parse(tokenizer)
+        return _ASTBuilder(tokenizer, lines).build(tree)
+
+    def __parse(self, tokenizer: Tokenizer) -> tuple[ParseNode, LineIndex]:
+        tokens = list(tokenizer)
+        lines = LineIndex(tokenizer.source, tokenizer.file_path)
+        tree = self.__derive(tokens)
+        if isinstance(tree, int):
+            if tree < len(tokens):
+                token = tokens[tree]
+                line = lines.line(token.location.row)
+                tokenizer.print_err(f"Unexpected token `{token.text}`", token, line)
+            tokenizer.print_err("Unexpected EOF")
+        return tree, lines
+
+    def __derive(self, tokens: list[Token]) -> ParseNode | int:
+        """The parse tree of `tokens`, or the position of the token where it
+        fails to parse"""
+        terminals = [terminal(token) for token in tokens] + [END, END]
+        root = ParseNode("", [])
+        stack: list[tuple[str, ParseNode]] = [(self.start, root)]
+        pos = 0
+        while stack:
+            symbol, parent = stack.pop()
+            row = self.table.get(symbol)
+            if row is None:
+                if terminals[pos] != symbol:
+                    return pos
+                parent.children.append(tokens[pos])
+                pos += 1
+                continue
+
+            decision = row.get(terminals[pos])
+            if decision is None:
+                return pos
+            if not isinstance(decision, int):
+                decision = decision.get(terminals[pos + 1], decision[None])
+            if symbol not in self.helpers:
+                node = ParseNode(symbol, [])
+                parent.children.append(node)
+                parent = node
+            stack.extend((symbol, parent) for symbol in self.expansions[decision])
+        if pos < len(tokens):
+            return pos
+        tree = root.children[0]
+        assert isinstance(tree, ParseNode)
+        return tree
+
+
+# Operators of the left-associative levels, folded the way JSParser does.
+LOGICAL_LEVELS = {"OrExpression", "AndExpression"}
+BINARY_LEVELS = {
+    "ComparativeExpression",
+    "BitwiseExpression",
+    "AdditiveExpression",
+    "MultiplicativeExpression",
+    "PowerExpression",
+}
+
+# Expression levels whose action returns their only child unchanged.
+OPERAND_LEVELS = LOGICAL_LEVELS | BINARY_LEVELS | {
+    "ConditionalExpression",
+    "AssignmentExpression",
+    "UnaryExpression",
+    "UpdateExpression",
+    "MemberExpression",
+}
+
+Child = ParseNode | Token
+
+
+class _ASTBuilder:
+    """Turns a parse tree into JSParser's AST, with one action per nonterminal.
+
+    Nonterminals without an action have a single child and stand for it.
+    """
+
+    def __init__(self, tokenizer: Tokenizer, lines: LineIndex):
+        self.tokenizer = tokenizer
+        self.lines = lines
+        self.actions: dict[str, Callable[[list[Child]], Any]] = {
+            "Program": self.program,
+            "StatementList": self.items,
+            "EmptyStatement": self.empty_statement,
+            "BlockStatement": self.block_statement,
+            "WhileStatement": self.while_statement,
+            "DoWhileStatement": self.do_while_statement,
+            "ForStatement": self.for_statement,
+            "ForInit": self.for_init,
+            "ForDeclaration": self.variable_declaration,
+            "OptionalExpression": self.optional,
+            "IfStatement": self.if_statement,
+            "SwitchStatement": self.switch_statement,
+            "SwitchCaseList": self.items,
+            "SwitchCase": self.switch_case,
+            "TryStatement": self.try_statement,
+            "ReturnStatement": self.argument_statement,
+            "ThrowStatement": self.argument_statement,
+            "BreakStatement": self.jump_statement,
+            "ContinueStatement": self.jump_statement,
+            "ExpressionStatement": self.expression_statement,
+            "LabeledStatement": self.labeled_statement,
+            "VariableDeclaration": self.variable_declaration,
+            "VariableDeclaratorList": self.items,
+            "VariableDeclarator": self.variable_declarator,
+            "FunctionDeclaration": self.function_declaration,
+            "ParameterList": self.items,
+            "ConditionalExpression": self.conditional_expression,
+            "AssignmentExpression": self.assignment_expression,
+            "UnaryExpression": self.unary_expression,
+            "UpdateExpression": self.update_expression,
+            "MemberExpression": self.member_expression,
+            "ParenthesizedExpression": lambda children: self.build(children[1]),
+            "ArrayExpression": self.array_expression,
+            "ObjectExpression": self.object_expression,
+            "Properties": self.items,
+            "Property": self.property,
+        }
+        for level in LOGICAL_LEVELS:
+            self.actions[level] = self.logical_expression
+        for level in BINARY_LEVELS:
+            self.actions[level] = self.binary_expression
+
+    def build(self, child: Child) -> Any:
+        # Chains of single operands, like an Identifier standing for a whole
+        # AssignmentExpression, are followed in a loop so that nesting depth
+        # and not the number of precedence levels bounds the recursion.
+        while isinstance(child, ParseNode):
+            if len(child.children) == 1 and child.symbol in OPERAND_LEVELS:
+                child = child.children[0]
+                continue
+            action = self.actions.get(child.symbol)
+            if action is not None:
+                return action(child.children)
+            assert len(child.children) == 1, child.symbol
+            child = child.children[0]
+        return self.terminal(child)
+
+    def error(self, message: str, token: Token) -> NoReturn:
+        self.tokenizer.print_err(message, token, self.lines.line(token.location.row))
+        raise AssertionError("unreachable")
+
+    def terminal(self, token: Token) -> dict[str, Any]:
+        match token.kind:
+            case TokenKind.NUMBER_LIT:
+                try:
+                    value: Any = int(token.text)
+                except ValueError:
+                    value = float(token.text)
+            case TokenKind.STR_LIT:
+                value = token.text[1:-1]
+            case _ if token.text in ("true", "false", "null"):
+                value = {"true": True, "false": False, "null": None}[token.text]
+            case _:
+                return {"type": "Identifier", "name": token.text}
+        return {"type": "Literal", "value": value, "raw": token.text}
+
+    def items(self, children: list[Child]) -> list[Any]:
+        """Lists, with or without separators between their items"""
+        return [self.build(c) for c in children if not _is(c, ",")]
+
+    def program(self, children: list[Child]) -> dict[str, Any]:
+        return {"type": "Program", "body": self.build(children[0])}
+
+    def empty_statement(self, _: list[Child]) -> dict[str, Any]:
+        return {"type": "EmptyStatement"}
+
+    def block_statement(self, children: list[Child]) -> dict[str, Any]:
+        body = self.build(children[1]) if len(children) == 3 else []
+        return {"type": "BlockStatement", "body": body}
+
+    def while_statement(self, children: list[Child]) -> dict[str, Any]:
+        return {
+            "type": "WhileStatement",
+            "condition": self.build(children[2]),
+            "body": self.build(children[4]),
+        }
+
+    def do_while_statement(self, children: list[Child]) -> dict[str, Any]:
+        return {
+            "type": "DoWhileStatement",
+            "body": self.build(children[1]),
+            "condition": self.build(children[4]),
+        }
+
+    def for_statement(self, children: list[Child]) -> dict[str, Any]:
+        return {
+            "type": "ForStatement",
+            "init": self.build(children[2]),
+            "test": self.build(children[3]),
+            "update": self.build(children[5]),
+            "body": self.build(children[7]),
+        }
+
+    def for_init(self, children: list[Child]) -> dict[str, Any] | None:
+        return None if _is(children[0], ";") else self.build(children[0])
+
+    def optional(self, children: list[Child]) -> Any:
+        return self.build(children[0]) if children else None
+
+    def if_statement(self, children: list[Child]) -> dict[str, Any]:
+        return {
+            "type": "IfStatement",
+            "condition": self.build(children[2]),
+            "consequent": self.build(children[4]),
+            "alternate": self.build(children[6]) if len(children) > 5 else None,
+        }
+
+    def switch_statement(self, children: list[Child]) -> dict[str, Any]:
+        return {
+            "type": "SwitchStatement",
+            "discriminant": self.build(children[2]),
+            "cases": self.build(children[5]),
+        }
+
+    def switch_case(self, children: list[Child]) -> dict[str, Any]:
+        test = self.build(children[1]) if _is(children[0], "case") else None
+        return {
+            "type": "SwitchCase",
+            "test": test,
+            "consequent": self.build(children[-1]),
+        }
+
+    def try_statement(self, children: list[Child]) -> dict[str, Any]:
+        handler = {
+            "type": "CatchClause",
+            "param": self.build(children[4]),
+            "body": self.build(children[6]),
+        }
+        return {
+            "type": "TryStatement",
+            "block": self.build(children[1]),
+            "handler": handler,
+            "finalizer": self.build(children[8]) if len(children) > 7 else None,
+        }
+
+    def argument_statement(self, children: list[Child]) -> dict[str, Any]:
+        kind = "ReturnStatement" if _is(children[0], "return") else "ThrowStatement"
+        return {"type": kind, "argument": self.build(children[1])}
+
+    def jump_statement(self, children: list[Child]) -> dict[str, Any]:
+        kind = "BreakStatement" if _is(children[0], "break") else "ContinueStatement"
+        label = None
+        if len(children) > 1 and not _is(children[1], ";"):
+            label = self.build(children[1])
+        return {"type": kind, "label": label}
+
+    def expression_statement(self, children: list[Child]) -> dict[str, Any]:
+        if isinstance(children[0], ParseNode) and children[0].symbol == "LabeledStatement":
+            return self.build(children[0])
+        return {"type": "ExpressionStatement", "expression": self.build(children[0])}
+
+    def labeled_statement(self, children: list[Child]) -> dict[str, Any]:
+        return {
+            "type": "LabeledStatement",
+            "label": self.build(children[0]),
+            "body": self.build(children[2]),
+        }
+
+    def variable_declaration(self, children: list[Child]) -> dict[str, Any]:
+        assert isinstance(children[0], Token)
+        return {
+            "type": "VariableDeclaration",
+            "kind": children[0].text,
+            "declarations": self.build(children[1]),
+        }
+
+    def variable_declarator(self, children: list[Child]) -> dict[str, Any]:
+        init = self.build(children[2]) if len(children) > 1 else None
+        return {
+            "type": "VariableDeclarator",
+            "id": self.build(children[0]),
+            "init": init,
+        }
+
+    def function_declaration(self, children: list[Child]) -> dict[str, Any]:
+        params = self.build(children[3]) if len(children) == 6 else []
+        return {
+            "type": "FunctionDeclaration",
+            "id": self.build(children[1]),
+            "params": params,
+            "body": (self.build(children[-1]),),
+        }
+
+    def conditional_expression(self, children: list[Child]) -> dict[str, Any]:
+        node = self.build(children[0])
+        for i in range(1, len(children), 4):
+            node = {
+                "type": "ConditionalExpression",
+                "test": node,
+                "consequent": self.build(children[i + 1]),
+                "alternate": self.build(children[i + 3]),
+            }
+        return node
+
+    def assignment_expression(self, children: list[Child]) -> dict[str, Any]:
+        if len(children) == 1:
+            return self.build(children[0])
+        assert isinstance(children[1], Token)
+        return {
+            "type": "AssignmentExpression",
+            "operator": children[1].text,
+            "left": self.build(children[0]),
+            "right": self.build(children[2]),
+        }
+
+    def logical_expression(self, children: list[Child]) -> dict[str, Any]:
+        return self.fold("LogicalExpression", children)
+
+    def binary_expression(self, children: list[Child]) -> dict[str, Any]:
+        return self.fold("BinaryExpression", children)
+
+    def fold(self, kind: str, children: list[Child]) -> dict[str, Any]:
+        node = self.build(children[0])
+        for i in range(1, len(children), 2):
+            operator = children[i]
+            assert isinstance(operator, Token)
+            node = {
+                "type": kind,
+                "operator": operator.text,
+                "left": node,
+                "right": self.build(children[i + 1]),
+            }
+        return node
+
+    def unary_expression(self, children: list[Child]) -> dict[str, Any]:
+        if len(children) == 1:
+            return self.build(children[0])
+        assert isinstance(children[0], Token)
+        return {
+            "type": "UnaryOperator",
+            "operator": children[0].text,
+            "argument": self.build(children[1]),
+        }
+
+    def update_expression(self, children: list[Child]) -> dict[str, Any]:
+        if len(children) == 1:
+            return self.build(children[0])
+        prefix = isinstance(children[0], Token)
+        operator = children[0] if prefix else children[1]
+        argument = self.build(children[1] if prefix else children[0])
+        if argument["type"] not in ["Identifier", "MemberExpression"]:
+            assert isinstance(operator, Token)
+            self.error("invalid argument for increment/decrement", operator)
+        node = {"type": "UpdateExpression", "prefix": prefix, "operator": operator.text}
+        node["argument"] = argument
+        return node
+
+    def member_expression(self, children: list[Child]) -> dict[str, Any]:
+        node = self.build(children[0])
+        i = 1
+        while i < len(children):
+            node = {
+                "type": "MemberExpression",
+                "object": node,
+                "property": self.build(children[i + 1]),
+            }
+            i += 3 if _is(children[i], "[") else 2
+        return node
+
+    def array_expression(self, children: list[Child]) -> dict[str, Any]:
+        elements: list[Any] = []
+        if len(children) == 3:
+            assert isinstance(children[1], ParseNode)
+            items = children[1].children
+            elements.append(None if _is(items[0], ",") else self.build(items[0]))
+            for i, item in enumerate(items):
+                if _is(item, ",") and i + 1 < len(items):
+                    following = items[i + 1]
+                    elements.append(None if _is(following, ",") else self.build(following))
+        return {"type": "ArrayExpression", "elements": elements}
+
+    def object_expression(self, children: list[Child]) -> dict[str, Any]:
+        return {"type": "ObjectExpression", "properties": self.build(children[1])}
+
+    def property(self, children: list[Child]) -> dict[str, Any]:
+        return {
+            "type": "Property",
+            "key": self.build(children[0]),
+            "value": self.build(children[2]),
+        }
+
+
+def _is(child: Child, text: str) -> bool:
+    return isinstance(child, Token) and child.text == text
+
+
+def generate(grammar_path: str = GRAMMAR_PATH, output: str = TABLES_PATH) -> LL1Grammar:
+    ll1 = build(load_grammar(grammar_path))
+    source = os.path.relpath(grammar_path, os.path.dirname(os.path.abspath(output)))
+    with open(output, "w") as file:
+        file.write(emit(ll1, source.replace(os.sep, "/")))
+    return ll1
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(
+        description="Generate LL(1) parse tables from the BNF grammar"
+    )
+    arg_parser.add_argument("--grammar", default=GRAMMAR_PATH)
+    arg_parser.add_argument("-o", "--output", default=TABLES_PATH)
+    arg_parser.add_argument(
+        "--sets", action="store_true", help="also print the FIRST and FOLLOW sets"
+    )
+    args = arg_parser.parse_args()
+
+    grammar = load_grammar(args.grammar)
+    for warning in grammar.warnings:
+        print(f"warning: {warning}", file=sys.stderr)
+    ll1 = generate(args.grammar, args.output)
+    if args.sets:
+        for name in ll1.rules:
+            print(f"FIRST({name}) = {sorted(ll1.first[name])}")
+            print(f"FOLLOW({name}) = {sorted(ll1.follow[name])}")
+    conflicts = ll1.conflicts()
+    print(
+        f"{len(ll1.productions)} productions, {len(conflicts)} LL(1) conflicts"
+        f" written to {args.output}",
+        file=sys.stderr,
+    )
+    if conflicts:
+        print(ll1.report(), file=sys.stderr)
@@ -0,0 +1,1621 @@
+# Generated by ll1.py from test/backus_naur.txt; do not edit.
+# Regenerate with `python ll1.py`.
+# fmt: off
+# flake8: noqa
+
+START = 'Program'
+
+HELPERS = ["AdditiveExpression'", "AndExpression'", "ArrayElements'", 'AssignmentExpression_1', "BitwiseExpression'", 'BlockStatement_1', 'BreakStatement_1', 'BreakStatement_1_1', "ComparativeExpression'", "ConditionalExpression'", 'ContinueStatement_1', 'ContinueStatement_1_1', 'DoWhileStatement_1', 'ExpressionStatement_1', 'FunctionDeclaration_1', 'IfStatement_1', "MemberExpression'", "MultiplicativeExpression'", "OrExpression'", "ParameterList'", "PowerExpression'", "Properties'", 'ReturnStatement_1', "StatementList'", "SwitchCaseList'", 'ThrowStatement_1', 'TryStatement_1', 'UpdateExpression_1', 'VariableDeclaration_1', 'VariableDeclaration_2', 'VariableDeclaration_3', "VariableDeclaratorList'", 'VariableDeclarator_1']
+
+PRODUCTIONS = [
+    ('Program', ('StatementList',)),  # 0
+    ('StatementList', ('Statement', "StatementList'")),  # 1
+    ('Statement', ('ExpressionStatement',)),  # 2
+    ('Statement', ('BlockStatement',)),  # 3
+    ('Statement', ('EmptyStatement',)),  # 4
+    ('Statement', ('WhileStatement',)),  # 5
+    ('Statement', ('DoWhileStatement',)),  # 6
+    ('Statement', ('ForStatement',)),  # 7
+    ('Statement', ('IfStatement',)),  # 8
+    ('Statement', ('TryStatement',)),  # 9
+    ('Statement', ('ReturnStatement',)),  # 10
+    ('Statement', ('SwitchStatement',)),  # 11
+    ('Statement', ('LabeledStatement',)),  # 12
+    ('Statement', ('ThrowStatement',)),  # 13
+    ('Statement', ('BreakStatement',)),  # 14
+    ('Statement', ('ContinueStatement',)),  # 15
+    ('Statement', ('VariableDeclaration',)),  # 16
+    ('Statement', ('FunctionDeclaration',)),  # 17
+    ('EmptyStatement', (';',)),  # 18
+    ('BlockStatement', ('{', 'BlockStatement_1')),  # 19
+    ('WhileStatement', ('while', '(', 'Expression', ')', 'Statement')),  # 20
+    ('DoWhileStatement', ('do', 'Statement', 'while', '(', 'Expression', ')', 'DoWhileStatement_1')),  # 21
+    ('ForStatement', ('for', '(', 'ForInit', 'OptionalExpression', ';', 'OptionalExpression', ')', 'Statement')),  # 22
+    ('IfStatement', ('if', '(', 'Expression', ')', 'Statement', 'IfStatement_1')),  # 23
+    ('SwitchStatement', ('switch', '(', 'Expression', ')', '{', 'SwitchCaseList', '}')),  # 24
+    ('SwitchCaseList', ('SwitchCase', "SwitchCaseList'")),  # 25
+    ('SwitchCase', ('case', 'Expression', ':', 'StatementList')),  # 26
+    ('SwitchCase', ('default', ':', 'StatementList')),  # 27
+    ('TryStatement', ('try', 'BlockStatement', 'catch', '(', 'Identifier', ')', 'BlockStatement', 'TryStatement_1')),  # 28
+    ('ReturnStatement', ('return', 'Expression', 'ReturnStatement_1')),  # 29
+    ('ThrowStatement', ('throw', 'Expression', 'ThrowStatement_1')),  # 30
+    ('BreakStatement', ('break', 'BreakStatement_1')),  # 31
+    ('ContinueStatement', ('continue', 'ContinueStatement_1')),  # 32
+    ('ExpressionStatement', ('LabeledStatement',)),  # 33
+    ('ExpressionStatement', ('Expression', 'ExpressionStatement_1')),  # 34
+    ('LabeledStatement', ('Identifier', ':', 'Statement')),  # 35
+    ('VariableDeclaration', ('var', 'VariableDeclaratorList', 'VariableDeclaration_1')),  # 36
+    ('VariableDeclaration', ('let', 'VariableDeclaratorList', 'VariableDeclaration_2')),  # 37
+    ('VariableDeclaration', ('const', 'VariableDeclaratorList', 'VariableDeclaration_3')),  # 38
+    ('VariableDeclaratorList', ('VariableDeclarator', "VariableDeclaratorList'")),  # 39
+    ('VariableDeclarator', ('Identifier', 'VariableDeclarator_1')),  # 40
+    ('FunctionDeclaration', ('function', 'Identifier', '(', 'FunctionDeclaration_1')),  # 41
+    ('ParameterList', ('Parameter', "ParameterList'")),  # 42
+    ('Parameter', ('Identifier',)),  # 43
+    ('Parameter', ('AssignmentExpression',)),  # 44
+    ('Expression', ('ConditionalExpression',)),  # 45
+    ('ConditionalExpression', ('AssignmentExpression', "ConditionalExpression'")),  # 46
+    ('AssignmentExpression', ('LogicalExpression',)),  # 47
+    ('AssignmentExpression', ('Identifier', 'AssignmentExpression_1')),  # 48
+    ('LogicalExpression', ('OrExpression',)),  # 49
+    ('OrExpression', ('AndExpression', "OrExpression'")),  # 50
+    ('AndExpression', ('BinaryExpression', "AndExpression'")),  # 51
+    ('BinaryExpression', ('ComparativeExpression',)),  # 52
+    ('ComparativeExpression', ('BitwiseExpression', "ComparativeExpression'")),  # 53
+    ('BitwiseExpression', ('AdditiveExpression', "BitwiseExpression'")),  # 54
+    ('AdditiveExpression', ('MultiplicativeExpression', "AdditiveExpression'")),  # 55
+    ('MultiplicativeExpression', ('PowerExpression', "MultiplicativeExpression'")),  # 56
+    ('PowerExpression', ('UnaryExpression', "PowerExpression'")),  # 57
+    ('UnaryExpression', ('UpdateExpression',)),  # 58
+    ('UnaryExpression', ('+', 'UpdateExpression')),  # 59
+    ('UnaryExpression', ('-', 'UpdateExpression')),  # 60
+    ('UpdateExpression', ('MemberExpression', 'UpdateExpression_1')),  # 61
+    ('UpdateExpression', ('++', 'MemberExpression')),  # 62
+    ('UpdateExpression', ('--', 'MemberExpression')),  # 63
+    ('MemberExpression', ('PrimaryExpression', "MemberExpression'")),  # 64
+    ('PrimaryExpression', ('Literal',)),  # 65
+    ('PrimaryExpression', ('Identifier',)),  # 66
+    ('PrimaryExpression', ('ParenthesizedExpression',)),  # 67
+    ('PrimaryExpression', ('ArrayExpression',)),  # 68
+    ('PrimaryExpression', ('ObjectExpression',)),  # 69
+    ('ParenthesizedExpression', ('(', 'Expression', ')')),  # 70
+    ('ArrayExpression', ('[', 'ArrayElements', ']')),  # 71
+    ('ArrayElements', (',', "ArrayElements'")),  # 72
+    ('ArrayElements', ('Expression', "ArrayElements'")),  # 73
+    ('ObjectExpression', ('{', 'Properties', '}')),  # 74
+    ('Properties', ('Property', "Properties'")),  # 75
+    ('Property', ('Identifier', ':', 'Expression')),  # 76
+    ('ForInit', ('ForDeclaration',)),  # 77
+    ('ForInit', ('Expression', ';')),  # 78
+    ('ForInit', (';',)),  # 79
+    ('ForDeclaration', ('var', 'VariableDeclaratorList', ';')),  # 80
+    ('ForDeclaration', ('let', 'VariableDeclaratorList', ';')),  # 81
+    ('ForDeclaration', ('const', 'VariableDeclaratorList', ';')),  # 82
+    ('OptionalExpression', ('Expression',)),  # 83
+    ('OptionalExpression', ()),  # 84
+    ("StatementList'", ('Statement', "StatementList'")),  # 85
+    ("StatementList'", ()),  # 86
+    ("SwitchCaseList'", ('SwitchCase', "SwitchCaseList'")),  # 87
+    ("SwitchCaseList'", ()),  # 88
+    ("VariableDeclaratorList'", (',', 'VariableDeclarator', "VariableDeclaratorList'")),  # 89
+    ("VariableDeclaratorList'", ()),  # 90
+    ("ParameterList'", (',', 'Parameter', "ParameterList'")),  # 91
+    ("ParameterList'", ()),  # 92
+    ("ConditionalExpression'", ('?', 'Expression', ':', 'Expression', "ConditionalExpression'")),  # 93
+    ("ConditionalExpression'", ()),  # 94
+    ("OrExpression'", ('||', 'AndExpression', "OrExpression'")),  # 95
+    ("OrExpression'", ()),  # 96
+    ("AndExpression'", ('&&', 'BinaryExpression', "AndExpression'")),  # 97
+    ("AndExpression'", ()),  # 98
+    ("ComparativeExpression'", ('>', 'BitwiseExpression', "ComparativeExpression'")),  # 99
+    ("ComparativeExpression'", ('>=', 'BitwiseExpression', "ComparativeExpression'")),  # 100
+    ("ComparativeExpression'", ('<', 'BitwiseExpression', "ComparativeExpression'")),  # 101
+    ("ComparativeExpression'", ('<=', 'BitwiseExpression', "ComparativeExpression'")),  # 102
+    ("ComparativeExpression'", ('==', 'BitwiseExpression', "ComparativeExpression'")),  # 103
+    ("ComparativeExpression'", ('!=', 'BitwiseExpression', "ComparativeExpression'")),  # 104
+    ("ComparativeExpression'", ('===', 'BitwiseExpression', "ComparativeExpression'")),  # 105
+    ("ComparativeExpression'", ('!==', 'BitwiseExpression', "ComparativeExpression'")),  # 106
+    ("ComparativeExpression'", ()),  # 107
+    ("BitwiseExpression'", ('<BIT_OPERATOR>', 'AdditiveExpression', "BitwiseExpression'")),  # 108
+    ("BitwiseExpression'", ()),  # 109
+    ("AdditiveExpression'", ('+', 'MultiplicativeExpression', "AdditiveExpression'")),  # 110
+    ("AdditiveExpression'", ('-', 'MultiplicativeExpression', "AdditiveExpression'")),  # 111
+    ("AdditiveExpression'", ()),  # 112
+    ("MultiplicativeExpression'", ('*', 'PowerExpression', "MultiplicativeExpression'")),  # 113
+    ("MultiplicativeExpression'", ('/', 'PowerExpression', "MultiplicativeExpression'")),  # 114
+    ("MultiplicativeExpression'", ('%', 'PowerExpression', "MultiplicativeExpression'")),  # 115
+    ("MultiplicativeExpression'", ()),  # 116
+    ("PowerExpression'", ('**', 'UnaryExpression', "PowerExpression'")),  # 117
+    ("PowerExpression'", ()),  # 118
+    ("MemberExpression'", ('[', 'PrimaryExpression', ']', "MemberExpression'")),  # 119
+    ("MemberExpression'", ('.', 'Identifier', "MemberExpression'")),  # 120
+    ("MemberExpression'", ()),  # 121
+    ("ArrayElements'", (',', "ArrayElements'")),  # 122
+    ("ArrayElements'", (',', 'Expression', "ArrayElements'")),  # 123
+    ("ArrayElements'", ()),  # 124
+    ("Properties'", (',', 'Property', "Properties'")),  # 125
+    ("Properties'", ()),  # 126
+    ('BlockStatement_1', ('}',)),  # 127
+    ('BlockStatement_1', ('StatementList', '}')),  # 128
+    ('DoWhileStatement_1', ()),  # 129
+    ('DoWhileStatement_1', (';',)),  # 130
+    ('IfStatement_1', ()),  # 131
+    ('IfStatement_1', ('else', 'Statement')),  # 132
+    ('TryStatement_1', ()),  # 133
+    ('TryStatement_1', ('finally', 'BlockStatement')),  # 134
+    ('ReturnStatement_1', ()),  # 135
+    ('ReturnStatement_1', (';',)),  # 136
+    ('ThrowStatement_1', ()),  # 137
+    ('ThrowStatement_1', (';',)),  # 138
+    ('BreakStatement_1', ()),  # 139
+    ('BreakStatement_1', (';',)),  # 140
+    ('BreakStatement_1', ('Identifier', 'BreakStatement_1_1')),  # 141
+    ('ContinueStatement_1', ()),  # 142
+    ('ContinueStatement_1', (';',)),  # 143
+    ('ContinueStatement_1', ('Identifier', 'ContinueStatement_1_1')),  # 144
+    ('ExpressionStatement_1', ()),  # 145
+    ('ExpressionStatement_1', (';',)),  # 146
+    ('VariableDeclaration_1', ()),  # 147
+    ('VariableDeclaration_1', (';',)),  # 148
+    ('VariableDeclarator_1', ()),  # 149
+    ('VariableDeclarator_1', ('=', 'Expression')),  # 150
+    ('FunctionDeclaration_1', (')', 'BlockStatement')),  # 151
+    ('FunctionDeclaration_1', ('ParameterList', ')', 'BlockStatement')),  # 152
+    ('AssignmentExpression_1', ('=', 'Expression')),  # 153
+    ('AssignmentExpression_1', ('<ASSIGN_OPERATOR>', 'Expression')),  # 154
+    ('UpdateExpression_1', ()),  # 155
+    ('UpdateExpression_1', ('++',)),  # 156
+    ('UpdateExpression_1', ('--',)),  # 157
+    ('BreakStatement_1_1', ()),  # 158
+    ('BreakStatement_1_1', (';',)),  # 159
+    ('ContinueStatement_1_1', ()),  # 160
+    ('ContinueStatement_1_1', (';',)),  # 161
+    ('VariableDeclaration_2', ()),  # 162
+    ('VariableDeclaration_2', (';',)),  # 163
+    ('VariableDeclaration_3', ()),  # 164
+    ('VariableDeclaration_3', (';',)),  # 165
+]
+
+TABLE = {
+    'Program': {
+        '(': 0,
+        '+': 0,
+        '++': 0,
+        '-': 0,
+        '--': 0,
+        ';': 0,
+        'Identifier': 0,
+        'Literal': 0,
+        '[': 0,
+        'break': 0,
+        'const': 0,
+        'continue': 0,
+        'do': 0,
+        'for': 0,
+        'function': 0,
+        'if': 0,
+        'let': 0,
+        'return': 0,
+        'switch': 0,
+        'throw': 0,
+        'try': 0,
+        'var': 0,
+        'while': 0,
+        '{': 0,
+    },
+    'StatementList': {
+        '(': 1,
+        '+': 1,
+        '++': 1,
+        '-': 1,
+        '--': 1,
+        ';': 1,
+        'Identifier': 1,
+        'Literal': 1,
+        '[': 1,
+        'break': 1,
+        'const': 1,
+        'continue': 1,
+        'do': 1,
+        'for': 1,
+        'function': 1,
+        'if': 1,
+        'let': 1,
+        'return': 1,
+        'switch': 1,
+        'throw': 1,
+        'try': 1,
+        'var': 1,
+        'while': 1,
+        '{': 1,
+    },
+    'Statement': {
+        '(': 2,
+        '+': 2,
+        '++': 2,
+        '-': 2,
+        '--': 2,
+        ';': 4,
+        'Identifier': {None: 2, ':': 12},
+        'Literal': 2,
+        '[': 2,
+        'break': 14,
+        'const': 16,
+        'continue': 15,
+        'do': 6,
+        'for': 7,
+        'function': 17,
+        'if': 8,
+        'let': 16,
+        'return': 10,
+        'switch': 11,
+        'throw': 13,
+        'try': 9,
+        'var': 16,
+        'while': 5,
+        '{': {None: 3},
+    },
+    'EmptyStatement': {
+        ';': 18,
+    },
+    'BlockStatement': {
+        '{': 19,
+    },
+    'WhileStatement': {
+        'while': 20,
+    },
+    'DoWhileStatement': {
+        'do': 21,
+    },
+    'ForStatement': {
+        'for': 22,
+    },
+    'IfStatement': {
+        'if': 23,
+    },
+    'SwitchStatement': {
+        'switch': 24,
+    },
+    'SwitchCaseList': {
+        'case': 25,
+        'default': 25,
+    },
+    'SwitchCase': {
+        'case': 26,
+        'default': 27,
+    },
+    'TryStatement': {
+        'try': 28,
+    },
+    'ReturnStatement': {
+        'return': 29,
+    },
+    'ThrowStatement': {
+        'throw': 30,
+    },
+    'BreakStatement': {
+        'break': 31,
+    },
+    'ContinueStatement': {
+        'continue': 32,
+    },
+    'ExpressionStatement': {
+        '(': 34,
+        '+': 34,
+        '++': 34,
+        '-': 34,
+        '--': 34,
+        'Identifier': {None: 34, ':': 33},
+        'Literal': 34,
+        '[': 34,
+        '{': 34,
+    },
+    'LabeledStatement': {
+        'Identifier': 35,
+    },
+    'VariableDeclaration': {
+        'const': 38,
+        'let': 37,
+        'var': 36,
+    },
+    'VariableDeclaratorList': {
+        'Identifier': 39,
+    },
+    'VariableDeclarator': {
+        'Identifier': 40,
+    },
+    'FunctionDeclaration': {
+        'function': 41,
+    },
+    'ParameterList': {
+        '(': 42,
+        '+': 42,
+        '++': 42,
+        '-': 42,
+        '--': 42,
+        'Identifier': 42,
+        'Literal': 42,
+        '[': 42,
+        '{': 42,
+    },
+    'Parameter': {
+        '(': 44,
+        '+': 44,
+        '++': 44,
+        '-': 44,
+        '--': 44,
+        'Identifier': {None: 44, ')': 43, ',': 43},
+        'Literal': 44,
+        '[': 44,
+        '{': 44,
+    },
+    'Expression': {
+        '(': 45,
+        '+': 45,
+        '++': 45,
+        '-': 45,
+        '--': 45,
+        'Identifier': 45,
+        'Literal': 45,
+        '[': 45,
+        '{': 45,
+    },
+    'ConditionalExpression': {
+        '(': 46,
+        '+': 46,
+        '++': 46,
+        '-': 46,
+        '--': 46,
+        'Identifier': 46,
+        'Literal': 46,
+        '[': 46,
+        '{': 46,
+    },
+    'AssignmentExpression': {
+        '(': 47,
+        '+': 47,
+        '++': 47,
+        '-': 47,
+        '--': 47,
+        'Identifier': {None: 47, '<ASSIGN_OPERATOR>': 48, '=': 48},
+        'Literal': 47,
+        '[': 47,
+        '{': 47,
+    },
+    'LogicalExpression': {
+        '(': 49,
+        '+': 49,
+        '++': 49,
+        '-': 49,
+        '--': 49,
+        'Identifier': 49,
+        'Literal': 49,
+        '[': 49,
+        '{': 49,
+    },
+    'OrExpression': {
+        '(': 50,
+        '+': 50,
+        '++': 50,
+        '-': 50,
+        '--': 50,
+        'Identifier': 50,
+        'Literal': 50,
+        '[': 50,
+        '{': 50,
+    },
+    'AndExpression': {
+        '(': 51,
+        '+': 51,
+        '++': 51,
+        '-': 51,
+        '--': 51,
+        'Identifier': 51,
+        'Literal': 51,
+        '[': 51,
+        '{': 51,
+    },
+    'BinaryExpression': {
+        '(': 52,
+        '+': 52,
+        '++': 52,
+        '-': 52,
+        '--': 52,
+        'Identifier': 52,
+        'Literal': 52,
+        '[': 52,
+        '{': 52,
+    },
+    'ComparativeExpression': {
+        '(': 53,
+        '+': 53,
+        '++': 53,
+        '-': 53,
+        '--': 53,
+        'Identifier': 53,
+        'Literal': 53,
+        '[': 53,
+        '{': 53,
+    },
+    'BitwiseExpression': {
+        '(': 54,
+        '+': 54,
+        '++': 54,
+        '-': 54,
+        '--': 54,
+        'Identifier': 54,
+        'Literal': 54,
+        '[': 54,
+        '{': 54,
+    },
+    'AdditiveExpression': {
+        '(': 55,
+        '+': 55,
+        '++': 55,
+        '-': 55,
+        '--': 55,
+        'Identifier': 55,
+        'Literal': 55,
+        '[': 55,
+        '{': 55,
+    },
+    'MultiplicativeExpression': {
+        '(': 56,
+        '+': 56,
+        '++': 56,
+        '-': 56,
+        '--': 56,
+        'Identifier': 56,
+        'Literal': 56,
+        '[': 56,
+        '{': 56,
+    },
+    'PowerExpression': {
+        '(': 57,
+        '+': 57,
+        '++': 57,
+        '-': 57,
+        '--': 57,
+        'Identifier': 57,
+        'Literal': 57,
+        '[': 57,
+        '{': 57,
+    },
+    'UnaryExpression': {
+        '(': 58,
+        '+': 59,
+        '++': 58,
+        '-': 60,
+        '--': 58,
+        'Identifier': 58,
+        'Literal': 58,
+        '[': 58,
+        '{': 58,
+    },
+    'UpdateExpression': {
+        '(': 61,
+        '++': 62,
+        '--': 63,
+        'Identifier': 61,
+        'Literal': 61,
+        '[': 61,
+        '{': 61,
+    },
+    'MemberExpression': {
+        '(': 64,
+        'Identifier': 64,
+        'Literal': 64,
+        '[': 64,
+        '{': 64,
+    },
+    'PrimaryExpression': {
+        '(': 67,
+        'Identifier': 66,
+        'Literal': 65,
+        '[': 68,
+        '{': 69,
+    },
+    'ParenthesizedExpression': {
+        '(': 70,
+    },
+    'ArrayExpression': {
+        '[': 71,
+    },
+    'ArrayElements': {
+        '(': 73,
+        '+': 73,
+        '++': 73,
+        ',': 72,
+        '-': 73,
+        '--': 73,
+        'Identifier': 73,
+        'Literal': 73,
+        '[': 73,
+        '{': 73,
+    },
+    'ObjectExpression': {
+        '{': 74,
+    },
+    'Properties': {
+        'Identifier': 75,
+    },
+    'Property': {
+        'Identifier': 76,
+    },
+    'ForInit': {
+        '(': 78,
+        '+': 78,
+        '++': 78,
+        '-': 78,
+        '--': 78,
+        ';': 79,
+        'Identifier': 78,
+        'Literal': 78,
+        '[': 78,
+        'const': 77,
+        'let': 77,
+        'var': 77,
+        '{': 78,
+    },
+    'ForDeclaration': {
+        'const': 82,
+        'let': 81,
+        'var': 80,
+    },
+    'OptionalExpression': {
+        '(': 83,
+        ')': 84,
+        '+': 83,
+        '++': 83,
+        '-': 83,
+        '--': 83,
+        ';': 84,
+        'Identifier': 83,
+        'Literal': 83,
+        '[': 83,
+        '{': 83,
+    },
+    "StatementList'": {
+        '$': 86,
+        '(': 85,
+        '+': 85,
+        '++': 85,
+        '-': 85,
+        '--': 85,
+        ';': 85,
+        'Identifier': 85,
+        'Literal': 85,
+        '[': 85,
+        'break': 85,
+        'case': 86,
+        'const': 85,
+        'continue': 85,
+        'default': 86,
+        'do': 85,
+        'for': 85,
+        'function': 85,
+        'if': 85,
+        'let': 85,
+        'return': 85,
+        'switch': 85,
+        'throw': 85,
+        'try': 85,
+        'var': 85,
+        'while': 85,
+        '{': 85,
+        '}': 86,
+    },
+    "SwitchCaseList'": {
+        'case': 87,
+        'default': 87,
+        '}': 88,
+    },
+    "VariableDeclaratorList'": {
+        '$': 90,
+        '(': 90,
+        '+': 90,
+        '++': 90,
+        ',': 89,
+        '-': 90,
+        '--': 90,
+        ';': 90,
+        'Identifier': 90,
+        'Literal': 90,
+        '[': 90,
+        'break': 90,
+        'case': 90,
+        'const': 90,
+        'continue': 90,
+        'default': 90,
+        'do': 90,
+        'else': 90,
+        'for': 90,
+        'function': 90,
+        'if': 90,
+        'let': 90,
+        'return': 90,
+        'switch': 90,
+        'throw': 90,
+        'try': 90,
+        'var': 90,
+        'while': 90,
+        '{': 90,
+        '}': 90,
+    },
+    "ParameterList'": {
+        ')': 92,
+        ',': 91,
+    },
+    "ConditionalExpression'": {
+        '$': 94,
+        '(': 94,
+        ')': 94,
+        '+': 94,
+        '++': 94,
+        ',': 94,
+        '-': 94,
+        '--': 94,
+        ':': 94,
+        ';': 94,
+        '?': {None: 93},
+        'Identifier': 94,
+        'Literal': 94,
+        '[': 94,
+        ']': 94,
+        'break': 94,
+        'case': 94,
+        'const': 94,
+        'continue': 94,
+        'default': 94,
+        'do': 94,
+        'else': 94,
+        'for': 94,
+        'function': 94,
+        'if': 94,
+        'let': 94,
+        'return': 94,
+        'switch': 94,
+        'throw': 94,
+        'try': 94,
+        'var': 94,
+        'while': 94,
+        '{': 94,
+        '}': 94,
+    },
+    "OrExpression'": {
+        '$': 96,
+        '(': 96,
+        ')': 96,
+        '+': 96,
+        '++': 96,
+        ',': 96,
+        '-': 96,
+        '--': 96,
+        ':': 96,
+        ';': 96,
+        '?': 96,
+        'Identifier': 96,
+        'Literal': 96,
+        '[': 96,
+        ']': 96,
+        'break': 96,
+        'case': 96,
+        'const': 96,
+        'continue': 96,
+        'default': 96,
+        'do': 96,
+        'else': 96,
+        'for': 96,
+        'function': 96,
+        'if': 96,
+        'let': 96,
+        'return': 96,
+        'switch': 96,
+        'throw': 96,
+        'try': 96,
+        'var': 96,
+        'while': 96,
+        '{': 96,
+        '||': 95,
+        '}': 96,
+    },
+    "AndExpression'": {
+        '$': 98,
+        '&&': 97,
+        '(': 98,
+        ')': 98,
+        '+': 98,
+        '++': 98,
+        ',': 98,
+        '-': 98,
+        '--': 98,
+        ':': 98,
+        ';': 98,
+        '?': 98,
+        'Identifier': 98,
+        'Literal': 98,
+        '[': 98,
+        ']': 98,
+        'break': 98,
+        'case': 98,
+        'const': 98,
+        'continue': 98,
+        'default': 98,
+        'do': 98,
+        'else': 98,
+        'for': 98,
+        'function': 98,
+        'if': 98,
+        'let': 98,
+        'return': 98,
+        'switch': 98,
+        'throw': 98,
+        'try': 98,
+        'var': 98,
+        'while': 98,
+        '{': 98,
+        '||': 98,
+        '}': 98,
+    },
+    "ComparativeExpression'": {
+        '!=': 104,
+        '!==': 106,
+        '$': 107,
+        '&&': 107,
+        '(': 107,
+        ')': 107,
+        '+': 107,
+        '++': 107,
+        ',': 107,
+        '-': 107,
+        '--': 107,
+        ':': 107,
+        ';': 107,
+        '<': 101,
+        '<=': 102,
+        '==': 103,
+        '===': 105,
+        '>': 99,
+        '>=': 100,
+        '?': 107,
+        'Identifier': 107,
+        'Literal': 107,
+        '[': 107,
+        ']': 107,
+        'break': 107,
+        'case': 107,
+        'const': 107,
+        'continue': 107,
+        'default': 107,
+        'do': 107,
+        'else': 107,
+        'for': 107,
+        'function': 107,
+        'if': 107,
+        'let': 107,
+        'return': 107,
+        'switch': 107,
+        'throw': 107,
+        'try': 107,
+        'var': 107,
+        'while': 107,
+        '{': 107,
+        '||': 107,
+        '}': 107,
+    },
+    "BitwiseExpression'": {
+        '!=': 109,
+        '!==': 109,
+        '$': 109,
+        '&&': 109,
+        '(': 109,
+        ')': 109,
+        '+': 109,
+        '++': 109,
+        ',': 109,
+        '-': 109,
+        '--': 109,
+        ':': 109,
+        ';': 109,
+        '<': 109,
+        '<=': 109,
+        '<BIT_OPERATOR>': 108,
+        '==': 109,
+        '===': 109,
+        '>': 109,
+        '>=': 109,
+        '?': 109,
+        'Identifier': 109,
+        'Literal': 109,
+        '[': 109,
+        ']': 109,
+        'break': 109,
+        'case': 109,
+        'const': 109,
+        'continue': 109,
+        'default': 109,
+        'do': 109,
+        'else': 109,
+        'for': 109,
+        'function': 109,
+        'if': 109,
+        'let': 109,
+        'return': 109,
+        'switch': 109,
+        'throw': 109,
+        'try': 109,
+        'var': 109,
+        'while': 109,
+        '{': 109,
+        '||': 109,
+        '}': 109,
+    },
+    "AdditiveExpression'": {
+        '!=': 112,
+        '!==': 112,
+        '$': 112,
+        '&&': 112,
+        '(': 112,
+        ')': 112,
+        '+': {None: 110},
+        '++': 112,
+        ',': 112,
+        '-': {None: 111},
+        '--': 112,
+        ':': 112,
+        ';': 112,
+        '<': 112,
+        '<=': 112,
+        '<BIT_OPERATOR>': 112,
+        '==': 112,
+        '===': 112,
+        '>': 112,
+        '>=': 112,
+        '?': 112,
+        'Identifier': 112,
+        'Literal': 112,
+        '[': 112,
+        ']': 112,
+        'break': 112,
+        'case': 112,
+        'const': 112,
+        'continue': 112,
+        'default': 112,
+        'do': 112,
+        'else': 112,
+        'for': 112,
+        'function': 112,
+        'if': 112,
+        'let': 112,
+        'return': 112,
+        'switch': 112,
+        'throw': 112,
+        'try': 112,
+        'var': 112,
+        'while': 112,
+        '{': 112,
+        '||': 112,
+        '}': 112,
+    },
+    "MultiplicativeExpression'": {
+        '!=': 116,
+        '!==': 116,
+        '$': 116,
+        '%': 115,
+        '&&': 116,
+        '(': 116,
+        ')': 116,
+        '*': 113,
+        '+': 116,
+        '++': 116,
+        ',': 116,
+        '-': 116,
+        '--': 116,
+        '/': 114,
+        ':': 116,
+        ';': 116,
+        '<': 116,
+        '<=': 116,
+        '<BIT_OPERATOR>': 116,
+        '==': 116,
+        '===': 116,
+        '>': 116,
+        '>=': 116,
+        '?': 116,
+        'Identifier': 116,
+        'Literal': 116,
+        '[': 116,
+        ']': 116,
+        'break': 116,
+        'case': 116,
+        'const': 116,
+        'continue': 116,
+        'default': 116,
+        'do': 116,
+        'else': 116,
+        'for': 116,
+        'function': 116,
+        'if': 116,
+        'let': 116,
+        'return': 116,
+        'switch': 116,
+        'throw': 116,
+        'try': 116,
+        'var': 116,
+        'while': 116,
+        '{': 116,
+        '||': 116,
+        '}': 116,
+    },
+    "PowerExpression'": {
+        '!=': 118,
+        '!==': 118,
+        '$': 118,
+        '%': 118,
+        '&&': 118,
+        '(': 118,
+        ')': 118,
+        '*': 118,
+        '**': 117,
+        '+': 118,
+        '++': 118,
+        ',': 118,
+        '-': 118,
+        '--': 118,
+        '/': 118,
+        ':': 118,
+        ';': 118,
+        '<': 118,
+        '<=': 118,
+        '<BIT_OPERATOR>': 118,
+        '==': 118,
+        '===': 118,
+        '>': 118,
+        '>=': 118,
+        '?': 118,
+        'Identifier': 118,
+        'Literal': 118,
+        '[': 118,
+        ']': 118,
+        'break': 118,
+        'case': 118,
+        'const': 118,
+        'continue': 118,
+        'default': 118,
+        'do': 118,
+        'else': 118,
+        'for': 118,
+        'function': 118,
+        'if': 118,
+        'let': 118,
+        'return': 118,
+        'switch': 118,
+        'throw': 118,
+        'try': 118,
+        'var': 118,
+        'while': 118,
+        '{': 118,
+        '||': 118,
+        '}': 118,
+    },
+    "MemberExpression'": {
+        '!=': 121,
+        '!==': 121,
+        '$': 121,
+        '%': 121,
+        '&&': 121,
+        '(': 121,
+        ')': 121,
+        '*': 121,
+        '**': 121,
+        '+': 121,
+        '++': 121,
+        ',': 121,
+        '-': 121,
+        '--': 121,
+        '.': 120,
+        '/': 121,
+        ':': 121,
+        ';': 121,
+        '<': 121,
+        '<=': 121,
+        '<BIT_OPERATOR>': 121,
+        '==': 121,
+        '===': 121,
+        '>': 121,
+        '>=': 121,
+        '?': 121,
+        'Identifier': 121,
+        'Literal': 121,
+        '[': {None: 119},
+        ']': 121,
+        'break': 121,
+        'case': 121,
+        'const': 121,
+        'continue': 121,
+        'default': 121,
+        'do': 121,
+        'else': 121,
+        'for': 121,
+        'function': 121,
+        'if': 121,
+        'let': 121,
+        'return': 121,
+        'switch': 121,
+        'throw': 121,
+        'try': 121,
+        'var': 121,
+        'while': 121,
+        '{': 121,
+        '||': 121,
+        '}': 121,
+    },
+    "ArrayElements'": {
+        ',': {None: 123, ',': 122, ']': 122},
+        ']': 124,
+    },
+    "Properties'": {
+        ',': 125,
+        '}': 126,
+    },
+    'BlockStatement_1': {
+        '(': 128,
+        '+': 128,
+        '++': 128,
+        '-': 128,
+        '--': 128,
+        ';': 128,
+        'Identifier': 128,
+        'Literal': 128,
+        '[': 128,
+        'break': 128,
+        'const': 128,
+        'continue': 128,
+        'do': 128,
+        'for': 128,
+        'function': 128,
+        'if': 128,
+        'let': 128,
+        'return': 128,
+        'switch': 128,
+        'throw': 128,
+        'try': 128,
+        'var': 128,
+        'while': 128,
+        '{': 128,
+        '}': 127,
+    },
+    'DoWhileStatement_1': {
+        '$': 129,
+        '(': 129,
+        '+': 129,
+        '++': 129,
+        '-': 129,
+        '--': 129,
+        ';': {None: 130},
+        'Identifier': 129,
+        'Literal': 129,
+        '[': 129,
+        'break': 129,
+        'case': 129,
+        'const': 129,
+        'continue': 129,
+        'default': 129,
+        'do': 129,
+        'else': 129,
+        'for': 129,
+        'function': 129,
+        'if': 129,
+        'let': 129,
+        'return': 129,
+        'switch': 129,
+        'throw': 129,
+        'try': 129,
+        'var': 129,
+        'while': 129,
+        '{': 129,
+        '}': 129,
+    },
+    'IfStatement_1': {
+        '$': 131,
+        '(': 131,
+        '+': 131,
+        '++': 131,
+        '-': 131,
+        '--': 131,
+        ';': 131,
+        'Identifier': 131,
+        'Literal': 131,
+        '[': 131,
+        'break': 131,
+        'case': 131,
+        'const': 131,
+        'continue': 131,
+        'default': 131,
+        'do': 131,
+        'else': {None: 132},
+        'for': 131,
+        'function': 131,
+        'if': 131,
+        'let': 131,
+        'return': 131,
+        'switch': 131,
+        'throw': 131,
+        'try': 131,
+        'var': 131,
+        'while': 131,
+        '{': 131,
+        '}': 131,
+    },
+    'TryStatement_1': {
+        '$': 133,
+        '(': 133,
+        '+': 133,
+        '++': 133,
+        '-': 133,
+        '--': 133,
+        ';': 133,
+        'Identifier': 133,
+        'Literal': 133,
+        '[': 133,
+        'break': 133,
+        'case': 133,
+        'const': 133,
+        'continue': 133,
+        'default': 133,
+        'do': 133,
+        'else': 133,
+        'finally': 134,
+        'for': 133,
+        'function': 133,
+        'if': 133,
+        'let': 133,
+        'return': 133,
+        'switch': 133,
+        'throw': 133,
+        'try': 133,
+        'var': 133,
+        'while': 133,
+        '{': 133,
+        '}': 133,
+    },
+    'ReturnStatement_1': {
+        '$': 135,
+        '(': 135,
+        '+': 135,
+        '++': 135,
+        '-': 135,
+        '--': 135,
+        ';': {None: 136},
+        'Identifier': 135,
+        'Literal': 135,
+        '[': 135,
+        'break': 135,
+        'case': 135,
+        'const': 135,
+        'continue': 135,
+        'default': 135,
+        'do': 135,
+        'else': 135,
+        'for': 135,
+        'function': 135,
+        'if': 135,
+        'let': 135,
+        'return': 135,
+        'switch': 135,
+        'throw': 135,
+        'try': 135,
+        'var': 135,
+        'while': 135,
+        '{': 135,
+        '}': 135,
+    },
+    'ThrowStatement_1': {
+        '$': 137,
+        '(': 137,
+        '+': 137,
+        '++': 137,
+        '-': 137,
+        '--': 137,
+        ';': {None: 138},
+        'Identifier': 137,
+        'Literal': 137,
+        '[': 137,
+        'break': 137,
+        'case': 137,
+        'const': 137,
+        'continue': 137,
+        'default': 137,
+        'do': 137,
+        'else': 137,
+        'for': 137,
+        'function': 137,
+        'if': 137,
+        'let': 137,
+        'return': 137,
+        'switch': 137,
+        'throw': 137,
+        'try': 137,
+        'var': 137,
+        'while': 137,
+        '{': 137,
+        '}': 137,
+    },
+    'BreakStatement_1': {
+        '$': 139,
+        '(': 139,
+        '+': 139,
+        '++': 139,
+        '-': 139,
+        '--': 139,
+        ';': {None: 140},
+        'Identifier': {None: 141},
+        'Literal': 139,
+        '[': 139,
+        'break': 139,
+        'case': 139,
+        'const': 139,
+        'continue': 139,
+        'default': 139,
+        'do': 139,
+        'else': 139,
+        'for': 139,
+        'function': 139,
+        'if': 139,
+        'let': 139,
+        'return': 139,
+        'switch': 139,
+        'throw': 139,
+        'try': 139,
+        'var': 139,
+        'while': 139,
+        '{': 139,
+        '}': 139,
+    },
+    'ContinueStatement_1': {
+        '$': 142,
+        '(': 142,
+        '+': 142,
+        '++': 142,
+        '-': 142,
+        '--': 142,
+        ';': {None: 143},
+        'Identifier': {None: 144},
+        'Literal': 142,
+        '[': 142,
+        'break': 142,
+        'case': 142,
+        'const': 142,
+        'continue': 142,
+        'default': 142,
+        'do': 142,
+        'else': 142,
+        'for': 142,
+        'function': 142,
+        'if': 142,
+        'let': 142,
+        'return': 142,
+        'switch': 142,
+        'throw': 142,
+        'try': 142,
+        'var': 142,
+        'while': 142,
+        '{': 142,
+        '}': 142,
+    },
+    'ExpressionStatement_1': {
+        '$': 145,
+        '(': 145,
+        '+': 145,
+        '++': 145,
+        '-': 145,
+        '--': 145,
+        ';': {None: 146},
+        'Identifier': 145,
+        'Literal': 145,
+        '[': 145,
+        'break': 145,
+        'case': 145,
+        'const': 145,
+        'continue': 145,
+        'default': 145,
+        'do': 145,
+        'else': 145,
+        'for': 145,
+        'function': 145,
+        'if': 145,
+        'let': 145,
+        'return': 145,
+        'switch': 145,
+        'throw': 145,
+        'try': 145,
+        'var': 145,
+        'while': 145,
+        '{': 145,
+        '}': 145,
+    },
+    'VariableDeclaration_1': {
+        '$': 147,
+        '(': 147,
+        '+': 147,
+        '++': 147,
+        '-': 147,
+        '--': 147,
+        ';': {None: 148},
+        'Identifier': 147,
+        'Literal': 147,
+        '[': 147,
+        'break': 147,
+        'case': 147,
+        'const': 147,
+        'continue': 147,
+        'default': 147,
+        'do': 147,
+        'else': 147,
+        'for': 147,
+        'function': 147,
+        'if': 147,
+        'let': 147,
+        'return': 147,
+        'switch': 147,
+        'throw': 147,
+        'try': 147,
+        'var': 147,
+        'while': 147,
+        '{': 147,
+        '}': 147,
+    },
+    'VariableDeclarator_1': {
+        '$': 149,
+        '(': 149,
+        '+': 149,
+        '++': 149,
+        ',': 149,
+        '-': 149,
+        '--': 149,
+        ';': 149,
+        '=': 150,
+        'Identifier': 149,
+        'Literal': 149,
+        '[': 149,
+        'break': 149,
+        'case': 149,
+        'const': 149,
+        'continue': 149,
+        'default': 149,
+        'do': 149,
+        'else': 149,
+        'for': 149,
+        'function': 149,
+        'if': 149,
+        'let': 149,
+        'return': 149,
+        'switch': 149,
+        'throw': 149,
+        'try': 149,
+        'var': 149,
+        'while': 149,
+        '{': 149,
+        '}': 149,
+    },
+    'FunctionDeclaration_1': {
+        '(': 152,
+        ')': 151,
+        '+': 152,
+        '++': 152,
+        '-': 152,
+        '--': 152,
+        'Identifier': 152,
+        'Literal': 152,
+        '[': 152,
+        '{': 152,
+    },
+    'AssignmentExpression_1': {
+        '<ASSIGN_OPERATOR>': 154,
+        '=': 153,
+    },
+    'UpdateExpression_1': {
+        '!=': 155,
+        '!==': 155,
+        '$': 155,
+        '%': 155,
+        '&&': 155,
+        '(': 155,
+        ')': 155,
+        '*': 155,
+        '**': 155,
+        '+': 155,
+        '++': {None: 156},
+        ',': 155,
+        '-': 155,
+        '--': {None: 157},
+        '/': 155,
+        ':': 155,
+        ';': 155,
+        '<': 155,
+        '<=': 155,
+        '<BIT_OPERATOR>': 155,
+        '==': 155,
+        '===': 155,
+        '>': 155,
+        '>=': 155,
+        '?': 155,
+        'Identifier': 155,
+        'Literal': 155,
+        '[': 155,
+        ']': 155,
+        'break': 155,
+        'case': 155,
+        'const': 155,
+        'continue': 155,
+        'default': 155,
+        'do': 155,
+        'else': 155,
+        'for': 155,
+        'function': 155,
+        'if': 155,
+        'let': 155,
+        'return': 155,
+        'switch': 155,
+        'throw': 155,
+        'try': 155,
+        'var': 155,
+        'while': 155,
+        '{': 155,
+        '||': 155,
+        '}': 155,
+    },
+    'BreakStatement_1_1': {
+        '$': 158,
+        '(': 158,
+        '+': 158,
+        '++': 158,
+        '-': 158,
+        '--': 158,
+        ';': {None: 159},
+        'Identifier': 158,
+        'Literal': 158,
+        '[': 158,
+        'break': 158,
+        'case': 158,
+        'const': 158,
+        'continue': 158,
+        'default': 158,
+        'do': 158,
+        'else': 158,
+        'for': 158,
+        'function': 158,
+        'if': 158,
+        'let': 158,
+        'return': 158,
+        'switch': 158,
+        'throw': 158,
+        'try': 158,
+        'var': 158,
+        'while': 158,
+        '{': 158,
+        '}': 158,
+    },
+    'ContinueStatement_1_1': {
+        '$': 160,
+        '(': 160,
+        '+': 160,
+        '++': 160,
+        '-': 160,
+        '--': 160,
+        ';': {None: 161},
+        'Identifier': 160,
+        'Literal': 160,
+        '[': 160,
+        'break': 160,
+        'case': 160,
+        'const': 160,
+        'continue': 160,
+        'default': 160,
+        'do': 160,
+        'else': 160,
+        'for': 160,
+        'function': 160,
+        'if': 160,
+        'let': 160,
+        'return': 160,
+        'switch': 160,
+        'throw': 160,
+        'try': 160,
+        'var': 160,
+        'while': 160,
+        '{': 160,
+        '}': 160,
+    },
+    'VariableDeclaration_2': {
+        '$': 162,
+        '(': 162,
+        '+': 162,
+        '++': 162,
+        '-': 162,
+        '--': 162,
+        ';': {None: 163},
+        'Identifier': 162,
+        'Literal': 162,
+        '[': 162,
+        'break': 162,
+        'case': 162,
+        'const': 162,
+        'continue': 162,
+        'default': 162,
+        'do': 162,
+        'else': 162,
+        'for': 162,
+        'function': 162,
+        'if': 162,
+        'let': 162,
+        'return': 162,
+        'switch': 162,
+        'throw': 162,
+        'try': 162,
+        'var': 162,
+        'while': 162,
+        '{': 162,
+        '}': 162,
+    },
+    'VariableDeclaration_3': {
+        '$': 164,
+        '(': 164,
+        '+': 164,
+        '++': 164,
+        '-': 164,
+        '--': 164,
+        ';': {None: 165},
+        'Identifier': 164,
+        'Literal': 164,
+        '[': 164,
+        'break': 164,
+        'case': 164,
+        'const': 164,
+        'continue': 164,
+        'default': 164,
+        'do': 164,
+        'else': 164,
+        'for': 164,
+        'function': 164,
+        'if': 164,
+        'let': 164,
+        'return': 164,
+        'switch': 164,
+        'throw': 164,
+        'try': 164,
+        'var': 164,
+        'while': 164,
+        '{': 164,
+        '}': 164,
+    },
+}
+
+CONFLICTS = [
+    ('Statement', 'Identifier', (2, 12)),
+    ('Statement', '{', (2, 3)),
+    ('ExpressionStatement', 'Identifier', (33, 34)),
+    ('Parameter', 'Identifier', (43, 44)),
+    ('AssignmentExpression', 'Identifier', (47, 48)),
+    ("ConditionalExpression'", '?', (93, 94)),
+    ("AdditiveExpression'", '+', (110, 112)),
+    ("AdditiveExpression'", '-', (111, 112)),
+    ("MemberExpression'", '[', (119, 121)),
+    ("ArrayElements'", ',', (122, 123)),
+    ('DoWhileStatement_1', ';', (129, 130)),
+    ('IfStatement_1', 'else', (131, 132)),
+    ('ReturnStatement_1', ';', (135, 136)),
+    ('ThrowStatement_1', ';', (137, 138)),
+    ('BreakStatement_1', ';', (139, 140)),
+    ('BreakStatement_1', 'Identifier', (139, 141)),
+    ('ContinueStatement_1', ';', (142, 143)),
+    ('ContinueStatement_1', 'Identifier', (142, 144)),
+    ('ExpressionStatement_1', ';', (145, 146)),
+    ('VariableDeclaration_1', ';', (147, 148)),
+    ('UpdateExpression_1', '++', (155, 156)),
+    ('UpdateExpression_1', '--', (155, 157)),
+    ('BreakStatement_1_1', ';', (158, 159)),
+    ('ContinueStatement_1_1', ';', (160, 161)),
+    ('VariableDeclaration_2', ';', (162, 163)),
+    ('VariableDeclaration_3', ';', (164, 165)),
+]
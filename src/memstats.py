@@ -0,0 +1,186 @@
+import os
+import random
+import sys
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import js_parser
+import tokenizer
+from js_parser import JSParser
+from tokenizer import Token
+
+MODULES = {
+    os.path.abspath(tokenizer.__file__): "tokenizer",
+    os.path.abspath(js_parser.__file__): "parser",
+}
+
+
+@dataclass
+class NodeTypeStats:
+    """Nodes of one type in the AST, and their retained size by
+    `sys.getsizeof`, which is what the nodes hold on to rather than what
+    tracemalloc saw being allocated while parsing"""
+
+    count: int = 0
+    retained_bytes: int = 0
+
+
+@dataclass
+class MemStats:
+    source_bytes: int = 0
+    # None when tracemalloc was already tracing and the parse stayed below its
+    # peak, which cannot be reset without losing it.
+    peak_bytes: int | None = 0
+    retained_bytes: int = 0
+    tokens: int = 0
+    nodes: int = 0
+    by_node_type: dict[str, NodeTypeStats] = field(default_factory=dict)
+    by_module: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def bytes_per_token(self) -> float:
+        return self.peak_bytes / self.tokens if self.tokens and self.peak_bytes else 0.0
+
+    @property
+    def bytes_per_node(self) -> float:
+        return self.retained_bytes / self.nodes if self.nodes else 0.0
+
+    def report(self, limit: int | None = 10) -> str:
+        if self.peak_bytes is None:
+            peak = f"peak           {'unknown':>12}    (tracemalloc was already tracing)"
+        else:
+            peak = (
+                f"peak           {self.peak_bytes:>12,} B"
+                f"  ({self.bytes_per_token:,.0f} B/token, {self.tokens:,} tokens)"
+            )
+        lines = [
+            f"source         {self.source_bytes:>12,} B",
+            peak,
+            f"retained       {self.retained_bytes:>12,} B"
+            f"  ({self.bytes_per_node:,.0f} B/node, {self.nodes:,} nodes)",
+        ]
+        for module, size in sorted(self.by_module.items(), key=lambda kv: -kv[1]):
+            lines.append(f"  {module:<12} {size:>12,} B")
+        lines.append(f"{'node type':<22} {'count':>9} {'retained':>12}")
+        rows = sorted(self.by_node_type.items(), key=lambda kv: -kv[1].retained_bytes)[:limit]
+        for kind, s in rows:
+            lines.append(f"{kind:<22} {s.count:>9,} {s.retained_bytes:>12,}")
+        return "\n".join(lines)
+
+
+def node_sizes(ast: dict[str, Any]) -> dict[str, NodeTypeStats]:
+    """Shallow size of every node, counting its own lists and tuples but not
+    strings, which the tokenizer allocated and nodes only share."""
+    stats: dict[str, NodeTypeStats] = {}
+    stack: list[Any] = [ast]
+    while stack:
+        node = stack.pop()
+        s = stats.setdefault(node["type"], NodeTypeStats())
+        s.count += 1
+        s.retained_bytes += sys.getsizeof(node)
+        for value in node.values():
+            if isinstance(value, dict):
+                stack.append(value)
+            elif isinstance(value, (list, tuple)):
+                s.retained_bytes += sys.getsizeof(value)
+                stack.extend(child for child in value if isinstance(child, dict))
+    return stats
+
+
+class MemoryProfiler:
+    """Runs parses under `tracemalloc` and keeps the stats of the last one.
+
+    With `sample_rate` below 1 only that fraction of parses is traced, the rest
+    run at full speed and leave `last` as None. Sampled parses only read the
+    traced totals before and after; the split of retained memory between the
+    tokenizer and the parser needs two snapshots and is only made with
+    `by_module`. One frame is recorded per allocation, which is enough for
+    that split and keeps the tracing overhead low.
+    """
+
+    def __init__(
+        self,
+        parser: JSParser | None = None,
+        sample_rate: float = 1.0,
+        seed: int | None = None,
+        by_module: bool = False,
+    ):
+        self.parser = parser if parser is not None else JSParser()
+        self.sample_rate = sample_rate
+        self.by_module = by_module
+        self.rng = random.Random(seed)
+        self.last: MemStats | None = None
+        self.tokens = 0
+
+        self.parser._instrument(self.__wrap_consume, ["consume_token", "consume_keyword"])
+
+    def __wrap_consume(self, _: str, consume: Callable[..., Token]) -> Callable[..., Token]:
+        def counted(*args: Any) -> Token:
+            token = consume(*args)
+            self.tokens += 1
+            return token
+
+        return counted
+
+    def parse_string(self, string: str) -> dict[str, Any]:
+        return self.__measure(lambda: self.parser.parse_string(string), len(string.encode()))
+
+    def parse_file(self, file_path: str) -> dict[str, Any]:
+        size = os.path.getsize(file_path)
+        return self.__measure(lambda: self.parser.parse_file(file_path), size)
+
+    def __measure(self, parse: Callable[[], dict[str, Any]], size: int) -> dict[str, Any]:
+        self.tokens = 0
+        if self.rng.random() >= self.sample_rate:
+            self.last = None
+            return parse()
+
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start(1)
+        try:
+            before = _snapshot() if self.by_module else None
+            baseline, peak_before = tracemalloc.get_traced_memory()
+            # Resetting the peak of someone else's tracing would lose it.
+            if started:
+                tracemalloc.reset_peak()
+            ast = parse()
+            current, peak = tracemalloc.get_traced_memory()
+            after = _snapshot() if before is not None else None
+        finally:
+            if started:
+                tracemalloc.stop()
+
+        by_module: dict[str, int] = {}
+        if before is not None and after is not None:
+            for diff in after.compare_to(before, "filename"):
+                if diff.size_diff > 0:
+                    module = MODULES[diff.traceback[0].filename]
+                    by_module[module] = by_module.get(module, 0) + diff.size_diff
+
+        by_node_type = node_sizes(ast)
+        self.last = MemStats(
+            source_bytes=size,
+            peak_bytes=peak - baseline if started or peak > peak_before else None,
+            retained_bytes=current - baseline,
+            tokens=self.tokens,
+            nodes=sum(s.count for s in by_node_type.values()),
+            by_node_type=by_node_type,
+            by_module=by_module,
+        )
+        return ast
+
+
+def _snapshot() -> tracemalloc.Snapshot:
+    # Only the allocations of the tokenizer and the parser are compared.
+    filters = [tracemalloc.Filter(True, path) for path in MODULES]
+    return tracemalloc.take_snapshot().filter_traces(filters)
+
+
+def measure(source: str) -> tuple[dict[str, Any], MemStats]:
+    profiler = MemoryProfiler(by_module=True)
+    ast = profiler.parse_string(source)
+    assert profiler.last is not None
+    return ast, profiler.last
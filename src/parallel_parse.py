@@ -0,0 +1,146 @@
+import argparse
+import contextlib
+import io
+import os
+import re
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any
+
+from js_parser import JSParser
+
+# Brackets, string quotes and `//` comments, the only things the pre-scan reads.
+SCAN_PATTERN = re.compile(r"[(\[{)\]}'\"`]|//")
+
+# Words that continue the statement before them when they start a line.
+CONTINUATIONS = {"else", "catch", "finally", "while"}
+
+MIN_CHUNK_SIZE = 64 * 1024
+
+
+def top_level_boundaries(source: str) -> list[int]:
+    """Offsets of the lines where a new top-level statement can safely start.
+
+    A line qualifies when all brackets before it are closed, the code before it
+    ends with `;` or `}`, and it starts with a word that cannot continue the
+    previous statement. Strings and comments are skipped the way the tokenizer
+    reads them: strings end on their line and `//` comments the rest of it.
+    """
+    boundaries = []
+    depth = 0
+    last = ""
+    offset = 0
+    for line in source.split("\n"):
+        stripped = line.lstrip()
+        if depth == 0 and last in (";", "}") and stripped[:1].isalpha():
+            word = re.match(r"\w+", stripped)
+            if word is not None and word.group() not in CONTINUATIONS:
+                boundaries.append(offset)
+
+        code_end = len(line)
+        pos = 0
+        while (match := SCAN_PATTERN.search(line, pos)) is not None:
+            c = match.group()
+            pos = match.end()
+            if c in "([{":
+                depth += 1
+            elif c in ")]}":
+                depth -= 1
+            elif c == "//":
+                code_end = match.start()
+                break
+            else:
+                end = line.find(c, pos)
+                if end == -1:
+                    break
+                pos = end + 1
+        code = line[:code_end].rstrip()
+        if code:
+            last = code[-1]
+        offset += len(line) + 1
+    return boundaries
+
+
+def split_chunks(source: str, count: int, min_size: int = MIN_CHUNK_SIZE) -> list[int]:
+    """Start offsets of at most `count` chunks of roughly equal size, each
+    beginning at a top-level boundary and no shorter than `min_size`."""
+    starts = [0]
+    target = max(len(source) // max(count, 1), min_size)
+    for boundary in top_level_boundaries(source):
+        if boundary - starts[-1] >= target and len(source) - boundary >= min_size:
+            starts.append(boundary)
+    return starts
+
+
+def _parse_chunk(job: tuple[str, int, int, str]) -> tuple[str, Any, str, str]:
+    chunk, offset, row, file_path = job
+    out = io.StringIO()
+    err = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            body = JSParser().parse_fragment(chunk, offset, row, file_path)["body"]
+    except SyntaxError as e:
+        return "error", e.msg, out.getvalue(), err.getvalue()
+    except RecursionError:
+        return "recursion", None, out.getvalue(), err.getvalue()
+    return "ok", body, "", ""
+
+
+def parse_parallel(
+    source: str,
+    workers: int | None = None,
+    file_path: str = "string",
+    min_chunk_size: int = MIN_CHUNK_SIZE,
+    executor: Executor | None = None,
+) -> dict[str, Any]:
+    """Parses `source` like `JSParser().parse_string`, split at top-level
+    statement boundaries across a process pool.
+
+    Every chunk is tokenized with the rows and offsets it has in the whole
+    source, so tokens, ranges of errors and diagnostics match a sequential
+    parse. When chunks fail, the error of the first one is raised, which is the
+    error a sequential parse stops at.
+    """
+    workers = workers or os.cpu_count() or 1
+    starts = split_chunks(source, workers * 2, min_chunk_size)
+    if len(starts) == 1:
+        return JSParser().parse_fragment(source, 0, 1, file_path)
+
+    jobs = []
+    row = 1
+    for start, end in zip(starts, starts[1:] + [len(source)]):
+        jobs.append((source[start:end], start, row, file_path))
+        row += source.count("\n", start, end)
+
+    own_executor = executor is None
+    if executor is None:
+        executor = ProcessPoolExecutor(min(workers, len(jobs)))
+    try:
+        body: list[dict[str, Any]] = []
+        for status, result, out, err in executor.map(_parse_chunk, jobs):
+            if status != "ok":
+                # Replay what the parser printed before giving up.
+                sys.stderr.write(err)
+                sys.stdout.write(out)
+                if status == "recursion":
+                    raise RecursionError("maximum recursion depth exceeded")
+                raise SyntaxError(result)
+            body.extend(result)
+    finally:
+        if own_executor:
+            executor.shutdown(cancel_futures=True)
+    return {"type": "Program", "body": body}
+
+
+if __name__ == "__main__":
+    from pprint import pprint
+
+    arg_parser = argparse.ArgumentParser(description="Parse one JavaScript file on several cores")
+    arg_parser.add_argument("source_code", help="path of the JavaScript file to parse")
+    arg_parser.add_argument("-j", "--jobs", type=int, help="worker processes, default: all cores")
+    args = arg_parser.parse_args()
+
+    path = os.path.abspath(args.source_code)
+    with open(path, "r") as file:
+        content = "".join(file.readlines())
+    pprint(parse_parallel(content, args.jobs, path))
@@ -0,0 +1,198 @@
+import sys
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from tokenizer import Location, Token
+
+
+class BudgetExceeded(Exception):
+    """A parse was stopped because it ran past one of its ParseBudget limits"""
+
+    def __init__(self, limit: str, value: float, location: Location | None = None):
+        self.limit = limit
+        self.value = value
+        self.location = location
+        where = f"{location}: " if location is not None else ""
+        super().__init__(f"{where}{limit} of {value:,} exceeded")
+
+
+class DeadlineExceeded(BudgetExceeded):
+    pass
+
+
+class TokenLimitExceeded(BudgetExceeded):
+    pass
+
+
+class DepthLimitExceeded(BudgetExceeded):
+    pass
+
+
+class NodeLimitExceeded(BudgetExceeded):
+    pass
+
+
+class SourceTooLarge(BudgetExceeded):
+    pass
+
+
+# Every recursive path through JSParser goes through one of these.
+NESTING_PRODUCTIONS = ["statement", "expression"]
+
+# Productions that can return a node they created.
+NODE_PRODUCTIONS = [
+    "program",
+    "statement",
+    "expression",
+    "variable_declarator",
+    "switchcase",
+    "catch_clause",
+    "parameter",
+    "property",
+]
+
+
+@dataclass(frozen=True)
+class ParseBudget:
+    """Limits for a single `parse_string`/`parse_file` call; None means unlimited.
+
+    `timeout` is wall-clock seconds from the start of the parse. It is checked
+    every `check_interval` tokens, as is `max_nodes`, so a parse may run a
+    little past those two limits before it stops; `max_tokens` and `max_depth`
+    are exact and `max_bytes` is checked before anything is tokenized.
+
+    Input nested deeper than Python's recursion limit allows also stops with
+    DepthLimitExceeded, whether or not `max_depth` is set.
+
+    Function bodies skipped by `JSParser(lazy_functions=True)` are parsed on
+    first access as a parse of their own, with fresh counts and deadline
+    against the same limits.
+    """
+
+    timeout: float | None = None
+    max_tokens: int | None = None
+    max_depth: int | None = None
+    max_nodes: int | None = None
+    max_bytes: int | None = None
+    check_interval: int = 256
+
+    def check_size(self, size: int) -> None:
+        if self.max_bytes is not None and size > self.max_bytes:
+            raise SourceTooLarge("source size limit", self.max_bytes)
+
+    def check_string(self, string: str) -> None:
+        # A character takes at most 4 bytes in UTF-8; only encode when the
+        # length alone does not decide.
+        if self.max_bytes is not None and len(string) * 4 > self.max_bytes:
+            self.check_size(len(string.encode("utf-8")))
+
+    def hooks(self, parser: Any) -> list[tuple[Callable[..., Any], Iterable[str]]]:
+        """The `(wrap, names)` pairs for `JSParser._instrumented` enforcing this budget"""
+        return _BudgetGuard(self, parser).hooks()
+
+
+class _BudgetGuard:
+    def __init__(self, budget: ParseBudget, parser: Any):
+        self.budget = budget
+        self.parser = parser
+        self.tokens = 0
+        self.depth = 0
+        self.nodes = 0
+        self.counted: set[int] = set()
+        self.deadline = (
+            time.monotonic() + budget.timeout if budget.timeout is not None else None
+        )
+        self.next_check = budget.check_interval
+        if budget.max_tokens is not None:
+            self.next_check = min(self.next_check, budget.max_tokens + 1)
+
+    def hooks(self) -> list[tuple[Callable[..., Any], Iterable[str]]]:
+        hooks: list[tuple[Callable[..., Any], Iterable[str]]] = [
+            (self.wrap_parse, ["parse", "lazy_body"]),
+            (self.wrap_consume, ["consume_token", "consume_keyword"]),
+        ]
+        if self.budget.max_depth is not None:
+            hooks.append((self.wrap_nesting, NESTING_PRODUCTIONS))
+        if self.budget.max_nodes is not None:
+            hooks.append((self.wrap_node, NODE_PRODUCTIONS))
+        return hooks
+
+    def location(self) -> Location | None:
+        lookahead: Token | None = getattr(self.parser, "lookahead", None)
+        return lookahead.location if lookahead is not None else None
+
+    def wrap_parse(self, _: str, parse: Callable[..., Any]) -> Callable[..., Any]:
+        def budgeted(*args: Any) -> Any:
+            try:
+                return parse(*args)
+            except RecursionError:
+                raise DepthLimitExceeded(
+                    "Python recursion limit", sys.getrecursionlimit(), self.location()
+                ) from None
+
+        return budgeted
+
+    def wrap_consume(self, _: str, consume: Callable[..., Token]) -> Callable[..., Token]:
+        def budgeted(*args: Any) -> Token:
+            self.tokens += 1
+            if self.tokens >= self.next_check:
+                self.check()
+            return consume(*args)
+
+        return budgeted
+
+    def check(self) -> None:
+        budget = self.budget
+        if budget.max_tokens is not None and self.tokens > budget.max_tokens:
+            raise TokenLimitExceeded("token limit", budget.max_tokens, self.location())
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            assert budget.timeout is not None
+            raise DeadlineExceeded("timeout", budget.timeout, self.location())
+        if budget.max_nodes is not None and self.nodes > budget.max_nodes:
+            raise NodeLimitExceeded("node limit", budget.max_nodes, self.location())
+        self.next_check = self.tokens + budget.check_interval
+        if budget.max_tokens is not None:
+            self.next_check = min(self.next_check, budget.max_tokens + 1)
+
+    def wrap_nesting(self, _: str, production: Callable[..., Any]) -> Callable[..., Any]:
+        max_depth = self.budget.max_depth
+        assert max_depth is not None
+
+        def budgeted(*args: Any) -> Any:
+            self.depth += 1
+            if self.depth > max_depth:
+                raise DepthLimitExceeded("nesting depth limit", max_depth, self.location())
+            try:
+                return production(*args)
+            finally:
+                self.depth -= 1
+
+        return budgeted
+
+    def wrap_node(self, _: str, production: Callable[..., Any]) -> Callable[..., Any]:
+        def budgeted(*args: Any) -> Any:
+            node = production(*args)
+            if isinstance(node, dict):
+                self.count(node)
+            return node
+
+        return budgeted
+
+    def count(self, node: dict[str, Any]) -> None:
+        # Children are counted when their own production returns, except for
+        # nodes built in a loop (`a + b` in `a + b + c`), which are only reached
+        # through their parent.
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if id(node) in self.counted:
+                continue
+            self.counted.add(id(node))
+            self.nodes += 1
+            for value in node.values():
+                if isinstance(value, dict):
+                    stack.append(value)
+                elif isinstance(value, (list, tuple)):
+                    stack.extend(item for item in value if isinstance(item, dict))
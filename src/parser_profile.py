@@ -0,0 +1,128 @@
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass
+from time import perf_counter_ns
+from typing import Any
+
+from js_parser import PRODUCTIONS, JSParser
+from tokenizer import Token, Tokenizer
+
+TOKENIZER = "tokenizer"
+
+
+@dataclass
+class ProductionStats:
+    calls: int = 0
+    inclusive_ns: int = 0
+    exclusive_ns: int = 0
+    tokens: int = 0
+
+
+class ParseProfiler:
+    """Per-production call counts, timings and token counts for a JSParser.
+
+    The hooks are installed on the wrapped parser instance only, so parsers that
+    are not profiled run without any instrumentation. Inclusive times of
+    recursive productions count every active frame, as usual for profilers.
+    """
+
+    def __init__(self, parser: JSParser | None = None):
+        self.parser = parser if parser is not None else JSParser()
+        self.stats: dict[str, ProductionStats] = {}
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        self.tokens = 0
+        self.__stack: list[str] = []
+        self.__child_ns: list[int] = []
+
+        self.parser._instrument(self.__wrap_frame, PRODUCTIONS)
+        self.parser._instrument(self.__wrap_consume, ["consume_token", "consume_keyword"])
+        self.parser._instrument(self.__wrap_parse, ["parse"])
+
+    def parse_string(self, string: str) -> dict[str, Any]:
+        return self.parser.parse_string(string)
+
+    def parse_file(self, file_path: str) -> dict[str, Any]:
+        return self.parser.parse_file(file_path)
+
+    def reset(self) -> None:
+        # The installed wrappers hold on to their stats, so they are zeroed in
+        # place rather than replaced.
+        for stats in self.stats.values():
+            stats.calls = stats.inclusive_ns = stats.exclusive_ns = stats.tokens = 0
+        self.stacks.clear()
+        self.tokens = 0
+
+    def __wrap_frame(self, name: str, method: Callable[..., Any]) -> Callable[..., Any]:
+        stats = self.stats.setdefault(name, ProductionStats())
+        stack = self.__stack
+        child_ns = self.__child_ns
+
+        def profiled(*args: Any) -> Any:
+            tokens = self.tokens
+            stack.append(name)
+            child_ns.append(0)
+            start = perf_counter_ns()
+            try:
+                return method(*args)
+            finally:
+                elapsed = perf_counter_ns() - start
+                exclusive = elapsed - child_ns.pop()
+                self.stacks[tuple(stack)] += exclusive
+                stack.pop()
+                if child_ns:
+                    child_ns[-1] += elapsed
+                stats.calls += 1
+                stats.inclusive_ns += elapsed
+                stats.exclusive_ns += exclusive
+                stats.tokens += self.tokens - tokens
+
+        return profiled
+
+    def __wrap_consume(self, _: str, consume: Callable[..., Token]) -> Callable[..., Token]:
+        def counted(*args: Any) -> Token:
+            token = consume(*args)
+            self.tokens += 1
+            return token
+
+        return counted
+
+    def __wrap_parse(
+        self, _: str, parse: Callable[[Tokenizer], dict[str, Any]]
+    ) -> Callable[[Tokenizer], dict[str, Any]]:
+        def parse_with_tokenizer_frame(tokenizer: Tokenizer) -> dict[str, Any]:
+            # `peek` is where the tokenizer does its work; `next` goes through it.
+            tokenizer.peek = self.__wrap_frame(TOKENIZER, tokenizer.peek)  # type: ignore
+            return parse(tokenizer)
+
+        return parse_with_tokenizer_frame
+
+    def report(self, limit: int | None = None) -> str:
+        rows = sorted(
+            ((name, s) for name, s in self.stats.items() if s.calls),
+            key=lambda row: row[1].exclusive_ns,
+            reverse=True,
+        )[:limit]
+        total_ns = sum(s.exclusive_ns for _, s in rows) or 1
+        lines = [
+            f"{'production':<22} {'calls':>9} {'incl ms':>10} {'excl ms':>10}"
+            f" {'excl %':>7} {'tokens':>9}"
+        ]
+        for name, s in rows:
+            lines.append(
+                f"{name:<22} {s.calls:>9} {s.inclusive_ns / 1e6:>10.3f}"
+                f" {s.exclusive_ns / 1e6:>10.3f} {100 * s.exclusive_ns / total_ns:>6.1f}%"
+                f" {s.tokens:>9}"
+            )
+        lines.append(f"{'total tokens':<22} {self.tokens:>9}")
+        return "\n".join(lines)
+
+    def collapsed(self) -> str:
+        """Exclusive time per call stack in microseconds, one `a;b;c N` per line.
+
+        This is the collapsed-stack format read by flamegraph.pl and speedscope.
+        """
+        return "\n".join(
+            f"{';'.join(stack)} {ns // 1000}"
+            for stack, ns in sorted(self.stacks.items())
+            if ns >= 1000
+        )
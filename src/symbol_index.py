@@ -0,0 +1,258 @@
+import argparse
+import contextlib
+import hashlib
+import io
+import itertools
+import os
+import sqlite3
+from collections import Counter
+from collections.abc import Iterable
+from typing import Any
+
+from ast_visitor import Visitor
+from js_parser import JSParser
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    hash TEXT NOT NULL,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS symbols (
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    count INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS symbols_by_name ON symbols (name, kind);
+CREATE INDEX IF NOT EXISTS symbols_by_file ON symbols (file_id);
+"""
+
+# Files written to the index per transaction by `SymbolIndex.update`.
+UPDATE_BATCH = 100
+
+KINDS = ["function", "variable", "parameter", "label", "property", "reference"]
+
+
+class SymbolCollector(Visitor):
+    """Collects (name, kind) occurrences from a JSParser AST.
+
+    `a.b` and `a[b]` produce the same MemberExpression; when the source is given
+    and the AST carries ranges, `b` in `a[b]` is counted as a reference rather
+    than a property.
+    """
+
+    def __init__(self, source: str | None = None):
+        self.source = source
+        self.symbols: Counter[tuple[str, str]] = Counter()
+        self.__claimed: set[int] = set()
+
+    def __claim(self, node: dict[str, Any] | None, kind: str) -> None:
+        if node is not None and node["type"] == "Identifier":
+            self.__claimed.add(id(node))
+            self.symbols[(node["name"], kind)] += 1
+
+    def visit_FunctionDeclaration(self, node):
+        self.__claim(node["id"], "function")
+        for param in node["params"]:
+            if param["type"] == "AssignmentExpression":
+                param = param["left"]
+            self.__claim(param, "parameter")
+
+    def visit_VariableDeclarator(self, node):
+        self.__claim(node["id"], "variable")
+
+    def visit_CatchClause(self, node):
+        self.__claim(node["param"], "parameter")
+
+    def visit_LabeledStatement(self, node):
+        self.__claim(node["label"], "label")
+
+    def visit_BreakStatement(self, node):
+        if node["label"] is not None:
+            self.__claimed.add(id(node["label"]))
+
+    visit_ContinueStatement = visit_BreakStatement
+
+    def visit_MemberExpression(self, node):
+        if not self.__is_computed(node):
+            self.__claim(node["property"], "property")
+
+    def __is_computed(self, node: dict[str, Any]) -> bool:
+        if self.source is None or "start" not in node["property"]:
+            return False
+        pos = node["property"]["start"] - 1
+        while pos >= 0 and self.source[pos].isspace():
+            pos -= 1
+        return pos >= 0 and self.source[pos] != "."
+
+    def visit_Property(self, node):
+        self.__claim(node["key"], "property")
+
+    def visit_Identifier(self, node):
+        if id(node) not in self.__claimed:
+            self.symbols[(node["name"], "reference")] += 1
+
+
+def extract_symbols(
+    ast: dict[str, Any], source: str | None = None
+) -> Counter[tuple[str, str]]:
+    collector = SymbolCollector(source)
+    collector.visit(ast)
+    return collector.symbols
+
+
+class SymbolIndex:
+    """On-disk inverted index from symbol names to the files mentioning them.
+
+    Files are re-parsed only when the hash of their content changes, and lookups
+    are answered from the index alone.
+    """
+
+    def __init__(self, db_path: str):
+        self.db = sqlite3.connect(db_path)
+        self.db.execute("PRAGMA foreign_keys = ON")
+        self.db.executescript(SCHEMA)
+        self.parser = JSParser(ranges=True)
+
+    def __enter__(self) -> "SymbolIndex":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.db.close()
+
+    def update(self, paths: Iterable[str]) -> tuple[int, int]:
+        """Index the given files, returns the number of (re)indexed and unchanged files
+
+        Files that cannot be read, decoded or parsed are indexed with the error
+        instead of symbols. Every UPDATE_BATCH files are committed together, so
+        an interrupted run keeps the batches it finished.
+        """
+        indexed = unchanged = 0
+        paths = iter(paths)
+        while batch := list(itertools.islice(paths, UPDATE_BATCH)):
+            with self.db:
+                for path in batch:
+                    if self.__index(os.path.abspath(path)):
+                        indexed += 1
+                    else:
+                        unchanged += 1
+        return indexed, unchanged
+
+    def __index(self, path: str) -> bool:
+        try:
+            with open(path, "rb") as file:
+                content: bytes | None = file.read()
+        except OSError as e:
+            content, unreadable = None, e.strerror or str(e)
+        # An empty hash matches no content, so that unreadable files are tried
+        # again on the next update.
+        digest = "" if content is None else hashlib.blake2b(content, digest_size=16).hexdigest()
+        row = self.db.execute("SELECT id, hash FROM files WHERE path = ?", (path,)).fetchone()
+        if row is not None and digest and row[1] == digest:
+            return False
+
+        if content is None:
+            symbols, error = Counter(), unreadable
+        else:
+            symbols, error = self.__parse(content)
+        if row is not None:
+            self.db.execute("DELETE FROM files WHERE id = ?", (row[0],))
+        file_id = self.db.execute(
+            "INSERT INTO files (path, hash, error) VALUES (?, ?, ?)",
+            (path, digest, error),
+        ).lastrowid
+        self.db.executemany(
+            "INSERT INTO symbols (name, kind, file_id, count) VALUES (?, ?, ?, ?)",
+            ((name, kind, file_id, n) for (name, kind), n in symbols.items()),
+        )
+        return True
+
+    def __parse(self, content: bytes) -> tuple[Counter[tuple[str, str]], str | None]:
+        try:
+            source = content.decode("utf-8")
+        except UnicodeDecodeError as e:
+            return Counter(), f"invalid UTF-8 at byte {e.start}"
+        # The parser reports syntax errors on stdout/stderr before raising;
+        # keep that out of the indexer's output and store the message instead.
+        sink = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(sink), contextlib.redirect_stderr(sink):
+                ast = self.parser.parse_string(source)
+        except SyntaxError as e:
+            return Counter(), str(e) or type(e).__name__
+        except Exception as e:
+            # A parser crash on one file must not cost the rest of the batch.
+            name = type(e).__name__
+            return Counter(), f"{name}: {e}" if str(e) else name
+        return extract_symbols(ast, source), None
+
+    def remove(self, paths: Iterable[str]) -> None:
+        with self.db:
+            self.db.executemany(
+                "DELETE FROM files WHERE path = ?",
+                ((os.path.abspath(path),) for path in paths),
+            )
+
+    def prune(self) -> int:
+        """Drop files that no longer exist on disk, returns how many were dropped"""
+        missing = [
+            path
+            for (path,) in self.db.execute("SELECT path FROM files")
+            if not os.path.exists(path)
+        ]
+        self.remove(missing)
+        return len(missing)
+
+    def lookup(self, name: str, kind: str | None = None) -> list[tuple[str, str, int]]:
+        """Returns (path, kind, count) for every file mentioning `name`"""
+        query = (
+            "SELECT files.path, symbols.kind, symbols.count FROM symbols"
+            " JOIN files ON files.id = symbols.file_id WHERE symbols.name = ?"
+        )
+        params: tuple[str, ...] = (name,)
+        if kind is not None:
+            query += " AND symbols.kind = ?"
+            params += (kind,)
+        return self.db.execute(query + " ORDER BY files.path", params).fetchall()
+
+    def declarations(self, name: str, kind: str = "function") -> list[str]:
+        return [path for path, _, _ in self.lookup(name, kind)]
+
+    def references(self, name: str) -> list[str]:
+        return [path for path, _, _ in self.lookup(name, "reference")]
+
+    def errors(self) -> list[tuple[str, str]]:
+        return self.db.execute(
+            "SELECT path, error FROM files WHERE error IS NOT NULL ORDER BY path"
+        ).fetchall()
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Cross-file JavaScript symbol index")
+    arg_parser.add_argument("index", help="path of the index database")
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+    update = commands.add_parser("update", help="(re)index files whose content changed")
+    update.add_argument("files", nargs="+")
+    commands.add_parser("prune", help="drop files that no longer exist")
+    lookup = commands.add_parser("lookup", help="list files mentioning a symbol")
+    lookup.add_argument("name")
+    lookup.add_argument("--kind", choices=KINDS)
+    args = arg_parser.parse_args()
+
+    with SymbolIndex(args.index) as index:
+        match args.command:
+            case "update":
+                indexed, unchanged = index.update(args.files)
+                print(f"indexed {indexed} file(s), {unchanged} unchanged")
+                for path, error in index.errors():
+                    print(f"{path}: {error}")
+            case "prune":
+                print(f"dropped {index.prune()} file(s)")
+            case "lookup":
+                for path, kind, count in index.lookup(args.name, args.kind):
+                    print(f"{path}\t{kind}\t{count}")
@@ -0,0 +1,78 @@
+import io
+import os
+import unittest
+from unittest import mock
+
+import ast_binary
+from js_parser import JSParser
+
+TEST_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test")
+
+
+class TestAstBinary(unittest.TestCase):
+    def setUp(self) -> None:
+        with open(os.path.join(TEST_DIR, "inputAcc.js")) as file:
+            self.source = file.read()
+        self.ast = JSParser().parse_string(self.source)
+
+    def test_roundtrip(self):
+        self.assertEqual(ast_binary.loads(ast_binary.dumps(self.ast)), self.ast)
+
+    def test_roundtrip_file(self):
+        fp = io.BytesIO()
+        ast_binary.dump(self.ast, fp)
+        fp.seek(0)
+        self.assertEqual(ast_binary.load(fp), self.ast)
+
+    def test_scalars(self):
+        ast = {
+            "type": "Program",
+            "body": [
+                {"type": "Literal", "value": -42, "raw": "-42"},
+                {"type": "Literal", "value": 2**70, "raw": "big"},
+                {"type": "Literal", "value": 1.5, "raw": "1.5"},
+                {"type": "Literal", "value": None, "raw": "null"},
+                {"type": "Literal", "value": False, "raw": "false"},
+                {"type": "CustomNode", "extra": "field"},
+            ],
+        }
+        self.assertEqual(ast_binary.loads(ast_binary.dumps(ast)), ast)
+
+    def test_strings_deduplicated(self):
+        one = {"type": "Identifier", "name": "some_long_identifier_name"}
+        many = {"type": "ArrayExpression", "elements": [one] * 100}
+        self.assertLess(len(ast_binary.dumps(many)), 100 * len(one["name"]))
+
+    def test_offsets(self):
+        ast = {"type": "Identifier", "name": "x", "start": 10, "end": 11}
+        self.assertEqual(ast_binary.loads(ast_binary.dumps(ast)), ast)
+        self.assertEqual(
+            ast_binary.loads(ast_binary.dumps(ast, offsets=False)),
+            {"type": "Identifier", "name": "x"},
+        )
+
+    def test_lazy(self):
+        lazy = ast_binary.loads_lazy(ast_binary.dumps(self.ast))
+        self.assertEqual(lazy.type, "Program")
+        function = lazy["body"][0]
+        self.assertEqual(function["type"], "FunctionDeclaration")
+        self.assertEqual(function["id"]["name"], "do_something")
+        self.assertEqual(len(function["params"]), 1)
+        self.assertEqual(lazy.materialize(), self.ast)
+
+    def test_lazy_function_bodies(self):
+        ast = JSParser(lazy_functions=True).parse_string(self.source)
+        self.assertEqual(ast_binary.loads(ast_binary.dumps(ast)), self.ast)
+
+    def test_lazy_decodes_only_what_is_read(self):
+        ast = JSParser().parse_string(self.source * 100)
+        data = ast_binary.dumps(ast)
+        with mock.patch("ast_binary._lazy_value", wraps=ast_binary._lazy_value) as decoded:
+            types = [node.type for node in ast_binary.loads_lazy(data)["body"]]
+        self.assertEqual(types, [node["type"] for node in ast["body"]])
+        # One value for `body`, one per top-level node, none of their children.
+        self.assertEqual(decoded.call_count, 1 + len(ast["body"]))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            ast_binary.loads(b"nope")
@@ -0,0 +1,139 @@
+import unittest
+
+from ast_visitor import SKIP, STOP, Transformer, Visitor, walk
+from js_parser import JSParser
+
+
+class NameCollector(Visitor):
+    def __init__(self):
+        self.names: list[str] = []
+
+    def visit_Identifier(self, node):
+        self.names.append(node["name"])
+
+
+class FunctionSkipper(NameCollector):
+    def visit_FunctionDeclaration(self, node):
+        return SKIP
+
+
+class FirstLiteral(Visitor):
+    def __init__(self):
+        self.found = None
+
+    def visit_Literal(self, node):
+        self.found = node["raw"]
+        return STOP
+
+
+class DepthTracker(Visitor):
+    def __init__(self):
+        self.depth = 0
+        self.max_depth = 0
+
+    def visit_BlockStatement(self, node):
+        self.depth += 1
+        self.max_depth = max(self.max_depth, self.depth)
+
+    def leave_BlockStatement(self, node):
+        self.depth -= 1
+
+
+class Renamer(Transformer):
+    def visit_Identifier(self, node):
+        return {"type": "Identifier", "name": node["name"].upper()}
+
+
+class EmptyRemover(Transformer):
+    def visit_EmptyStatement(self, node):
+        return None
+
+
+class TestVisitor(unittest.TestCase):
+    def setUp(self) -> None:
+        self.ast = JSParser().parse_string(
+            "let a = b + 1;\nfunction f(x) { { return x + 2 } }\nc;"
+        )
+
+    def test_visit_order(self):
+        collector = NameCollector()
+        collector.visit(self.ast)
+        self.assertEqual(collector.names, ["a", "b", "f", "x", "x", "c"])
+
+    def test_skip(self):
+        collector = FunctionSkipper()
+        collector.visit(self.ast)
+        self.assertEqual(collector.names, ["a", "b", "c"])
+
+    def test_stop(self):
+        first = FirstLiteral()
+        first.visit(self.ast)
+        self.assertEqual(first.found, "1")
+
+    def test_leave(self):
+        tracker = DepthTracker()
+        tracker.visit(self.ast)
+        self.assertEqual((tracker.depth, tracker.max_depth), (0, 2))
+
+    def test_batched(self):
+        collector, skipper, first = NameCollector(), FunctionSkipper(), FirstLiteral()
+        walk(self.ast, [collector, skipper, first])
+        self.assertEqual(collector.names, ["a", "b", "f", "x", "x", "c"])
+        self.assertEqual(skipper.names, ["a", "b", "c"])
+        self.assertEqual(first.found, "1")
+
+    def test_lazy_function_bodies(self):
+        ast = JSParser(lazy_functions=True).parse_string(
+            "let a = b + 1;\nfunction f(x) { { return x + 2 } }\nc;"
+        )
+        collector, tracker = NameCollector(), DepthTracker()
+        walk(ast, [collector, tracker])
+        self.assertEqual(collector.names, ["a", "b", "f", "x", "x", "c"])
+        self.assertEqual(tracker.max_depth, 2)
+
+    def test_deep_tree(self):
+        node = {"type": "Identifier", "name": "leaf"}
+        for _ in range(50000):
+            node = {"type": "BlockStatement", "body": [node]}
+        collector = NameCollector()
+        collector.visit(node)
+        self.assertEqual(collector.names, ["leaf"])
+
+
+class TestTransformer(unittest.TestCase):
+    def test_replace(self):
+        ast = Renamer().transform(JSParser().parse_string("function f(x) { x }"))
+        assert ast is not None
+        function = ast["body"][0]
+        self.assertEqual(function["id"]["name"], "F")
+        self.assertEqual(function["params"][0]["name"], "X")
+        self.assertIsInstance(function["body"], tuple)
+        self.assertEqual(function["body"][0]["body"][0]["expression"]["name"], "X")
+
+    def test_lazy_function_bodies(self):
+        parser = JSParser(lazy_functions=True)
+        ast = Renamer().transform(parser.parse_string("function f(x) { x }"))
+        assert ast is not None
+        function = ast["body"][0]
+        self.assertIsInstance(function["body"], tuple)
+        self.assertEqual(function["body"][0]["body"][0]["expression"]["name"], "X")
+
+    def test_remove(self):
+        ast = EmptyRemover().transform(JSParser().parse_string(";\nx;\n;\n{ ; }"))
+        self.assertEqual(
+            ast,
+            {
+                "type": "Program",
+                "body": [
+                    {
+                        "type": "ExpressionStatement",
+                        "expression": {"type": "Identifier", "name": "x"},
+                    },
+                    {"type": "BlockStatement", "body": []},
+                ],
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from benchmark import SERIALIZERS, compare, run_serialization, run_suite, scaling_exponent
+
+BENCHMARK = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark.py")
+
+
+def result(corpus: str, size: int, throughput: float) -> dict:
+    return {
+        "corpus": corpus,
+        "size": size,
+        "tokens_per_s": throughput,
+        "nodes_per_s": throughput,
+        "mb_per_s": throughput,
+    }
+
+
+class TestScalingExponent(unittest.TestCase):
+    def test_power_laws(self):
+        sizes = [1_000, 10_000, 100_000, 1_000_000]
+        for k in (1.0, 2.0, 0.5):
+            points = [(n, 3e-7 * n**k) for n in sizes]
+            self.assertAlmostEqual(scaling_exponent(points), k)
+
+    def test_noisy(self):
+        points = [(1_000, 0.0011), (10_000, 0.0095), (100_000, 0.104), (1_000_000, 0.98)]
+        self.assertAlmostEqual(scaling_exponent(points), 1.0, delta=0.05)
+
+    def test_degenerate(self):
+        self.assertIsNone(scaling_exponent([]))
+        self.assertIsNone(scaling_exponent([(1_000, 0.1)]))
+        self.assertIsNone(scaling_exponent([(1_000, 0.1), (1_000, 0.2)]))
+        # Zero timings cannot be put on a log scale and are dropped.
+        self.assertIsNone(scaling_exponent([(1_000, 0.0), (10_000, 0.1)]))
+
+
+class TestCompare(unittest.TestCase):
+    def setUp(self) -> None:
+        self.baseline = {
+            "results": [result("minified", 1_000, 100.0), result("nested", 1_000, 100.0)]
+        }
+
+    def test_within_threshold(self):
+        current = {"results": [result("minified", 1_000, 95.0), result("nested", 1_000, 150.0)]}
+        self.assertEqual(compare(current, self.baseline, 0.10), [])
+
+    def test_regression(self):
+        current = {"results": [result("minified", 1_000, 80.0), result("nested", 1_000, 100.0)]}
+        regressions = compare(current, self.baseline, 0.10)
+        self.assertEqual(len(regressions), 3)
+        self.assertTrue(all(line.startswith("minified 1,000 B") for line in regressions))
+        self.assertIn("-20.0%", regressions[0])
+        self.assertEqual(compare(current, self.baseline, 0.25), [])
+
+    def test_missing_from_baseline(self):
+        current = {"results": [result("multiline", 1_000, 1.0)]}
+        self.assertEqual(compare(current, self.baseline, 0.10), [])
+
+    def test_baseline_file(self):
+        report = run_suite(["minified"], [1_000], memory=False)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "baseline.json")
+            with open(path, "w") as file:
+                json.dump(report, file)
+            with open(path) as file:
+                baseline = json.load(file)
+        self.assertEqual(compare(report, baseline, 0.10), [])
+
+        slower = {
+            "results": [dict(r, tokens_per_s=r["tokens_per_s"] / 2) for r in report["results"]]
+        }
+        [regression] = compare(slower, baseline, 0.10)
+        self.assertIn("tokens_per_s", regression)
+
+
+class TestSerialization(unittest.TestCase):
+    def test_formats(self):
+        result = run_serialization("minified", 1_000, 20, 1)
+        for name in SERIALIZERS:
+            self.assertGreater(result[name]["bytes"], 0)
+            self.assertGreaterEqual(result[name]["load_s"], 0)
+        self.assertLess(result["ast_binary"]["bytes"], result["json"]["bytes"])
+
+
+class TestCommandLine(unittest.TestCase):
+    def run_against(self, throughput: float) -> subprocess.CompletedProcess:
+        baseline = {"results": [result("minified", 1_000, throughput)]}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "baseline.json")
+            with open(path, "w") as file:
+                json.dump(baseline, file)
+            return subprocess.run(
+                [sys.executable, BENCHMARK, "--corpus", "minified", "--sizes", "1000"]
+                + ["--no-memory", "--compare", path],
+                capture_output=True,
+                text=True,
+            )
+
+    def test_exit_code(self):
+        ok = self.run_against(1e-9)
+        self.assertEqual(ok.returncode, 0, ok.stderr)
+        self.assertNotIn("REGRESSION", ok.stderr)
+
+        regressed = self.run_against(1e18)
+        self.assertEqual(regressed.returncode, 1, regressed.stderr)
+        self.assertEqual(regressed.stderr.count("REGRESSION: minified 1,000 B"), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
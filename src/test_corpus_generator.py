@@ -0,0 +1,70 @@
+import contextlib
+import io
+import unittest
+
+from bnf import load_grammar, parse_grammar
+from corpus_generator import CorpusGenerator, parse_size
+from js_parser import JSParser
+
+
+def parse_quietly(source: str):
+    sink = io.StringIO()
+    with contextlib.redirect_stdout(sink), contextlib.redirect_stderr(sink):
+        return JSParser().parse_string(source)
+
+
+class TestGrammar(unittest.TestCase):
+    def test_load(self):
+        grammar = load_grammar()
+        self.assertEqual(grammar.start, "Program")
+        self.assertIn("IfStatement", grammar.rules)
+        while_statement = ["while", "(", "Expression", ")", "Statement"]
+        self.assertIn(while_statement, grammar.rules["WhileStatement"])
+
+    def test_parse(self):
+        grammar = parse_grammar("A\n    : b C\n    | C\n    ;\nC\n    : c Missing\n    | c\n")
+        self.assertEqual(grammar.rules, {"A": [["b", "C"], ["C"]], "C": [["c"]]})
+        self.assertEqual(len(grammar.warnings), 1)
+
+
+class TestCorpusGenerator(unittest.TestCase):
+    def test_deterministic(self):
+        self.assertEqual(
+            CorpusGenerator(seed=7).generate(2000), CorpusGenerator(seed=7).generate(2000)
+        )
+        self.assertNotEqual(
+            CorpusGenerator(seed=7).generate(2000), CorpusGenerator(seed=8).generate(2000)
+        )
+
+    def test_max_depth(self):
+        parse_quietly(CorpusGenerator(max_depth=1).generate(2000))
+        for depth in (0, -1):
+            with self.assertRaises(ValueError):
+                CorpusGenerator(max_depth=depth)
+
+    def test_accepted(self):
+        for seed in range(20):
+            for minified in (False, True):
+                source = CorpusGenerator(seed=seed, minified=minified).generate(2000)
+                self.assertGreaterEqual(len(source), 2000)
+                parse_quietly(source)
+
+    def test_mix(self):
+        source = CorpusGenerator(seed=1, mix={"IfStatement": 1000}).generate(2000)
+        self.assertGreater(source.count("if"), 10)
+
+    def test_errors(self):
+        generator = CorpusGenerator(seed=3, error_rate=1.0)
+        for _ in range(10):
+            with self.assertRaises(SyntaxError):
+                parse_quietly(generator.statement())
+        self.assertEqual(generator.errors, 10)
+
+    def test_parse_size(self):
+        self.assertEqual(parse_size("10K"), 10_000)
+        self.assertEqual(parse_size("1.5M"), 1_500_000)
+        self.assertEqual(parse_size("42"), 42)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,247 @@
+import importlib.util
+import inspect
+import itertools
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+import finite_automaton
+from finite_automaton import (
+    DFA,
+    NFA,
+    CompiledAutomaton,
+    FiniteAutomaton,
+    IdentifierAutomaton,
+    cached_automaton,
+)
+
+STRINGS = ["".join(p) for n in range(6) for p in itertools.product("abc", repeat=n)]
+
+
+def random_automaton(rng: random.Random) -> FiniteAutomaton:
+    names = [f"q{i}" for i in range(rng.randint(1, 6))]
+    automaton = FiniteAutomaton("q0", set(rng.sample(names, rng.randint(0, len(names)))))
+    for state in names:
+        automaton.add_transitions(state, {})
+        for event in "abc":
+            if rng.random() < 0.7:
+                automaton.add_transition(state, event, rng.choice(names))
+    return automaton
+
+
+class TestCompiledAutomaton(unittest.TestCase):
+    def test_same_as_evaluate(self):
+        rng = random.Random(3)
+        for _ in range(200):
+            automaton = random_automaton(rng)
+            compiled = automaton.compile()
+            for _ in range(50):
+                string = "".join(rng.choice("abcd") for _ in range(rng.randint(0, 10)))
+                expected = automaton.evaluate(string)
+                self.assertEqual(compiled.evaluate(string), expected, string)
+                self.assertEqual(compiled.accepts(string), expected[0], string)
+
+    def test_identifier(self):
+        automaton = IdentifierAutomaton()
+        for string in ["x", "_", "foo_bar1", "Ab9", "", "1a", "a-b", "a b", "é"]:
+            self.assertEqual(
+                automaton.validate(string), automaton.automaton.evaluate(string)[0], string
+            )
+
+    def test_cached(self):
+        self.assertIs(IdentifierAutomaton().accepts, IdentifierAutomaton().accepts)
+
+    def test_recompiled_after_change(self):
+        automaton = FiniteAutomaton("q0", {"q1"})
+        automaton.add_transition("q0", "a", "q1")
+        self.assertFalse(automaton.compile().accepts("ab"))
+        automaton.add_transition("q1", "b", "q1")
+        self.assertTrue(automaton.compile().accepts("abbb"))
+
+    def test_separate_transitions(self):
+        FiniteAutomaton("q0", set()).add_transition("q0", "a", "q0")
+        self.assertEqual(FiniteAutomaton("q0", set()).transitions, {"q0": {}})
+
+
+class TestSerialized(unittest.TestCase):
+    def test_round_trip(self):
+        rng = random.Random(7)
+        for _ in range(100):
+            compiled = random_automaton(rng).compile()
+            loaded = CompiledAutomaton.loads(compiled.dumps())
+            self.assertEqual(loaded.names, compiled.names)
+            self.assertEqual(loaded.final, compiled.final)
+            self.assertEqual(loaded.rows, compiled.rows)
+            self.assertEqual(loaded.source, compiled.source)
+
+    def test_invalid(self):
+        data = IdentifierAutomaton().compiled.dumps()
+        for bad in [b"", b"JSAB" + data[4:], data[:4] + b"\x09" + data[5:], data[:-1], data + b"x"]:
+            with self.assertRaises(ValueError):
+                CompiledAutomaton.loads(bad)
+
+    def test_damaged(self):
+        data = IdentifierAutomaton().compiled.dumps()
+        rng = random.Random(5)
+        for _ in range(300):
+            damaged = bytearray(data)
+            for pos in rng.sample(range(5, len(data)), rng.randint(1, 4)):
+                damaged[pos] ^= 1 << rng.randrange(8)
+            try:
+                loaded = CompiledAutomaton.loads(bytes(damaged))
+            except ValueError:
+                continue
+            # Whatever loads is a working automaton, only a different one.
+            for string in ["x", "foo_bar1", "1a", ""]:
+                loaded.evaluate(string)
+
+    def test_cache(self):
+        built = []
+
+        def build() -> FiniteAutomaton:
+            built.append(1)
+            return NFA.literal("ab").star().to_dfa().minimize().to_automaton()
+
+        with tempfile.TemporaryDirectory() as directory:
+            with mock.patch.dict(os.environ, {"PHARSERR_CACHE": directory}):
+                definition = ("test_cache", random.random())
+                first = cached_automaton(definition, build)
+                self.assertIs(cached_automaton(definition, build), first)
+                self.assertEqual(len(built), 1)
+                (name,) = os.listdir(directory)
+
+                # Another process only reads the tables back.
+                with mock.patch.dict("finite_automaton._CACHED", clear=True):
+                    loaded = cached_automaton(definition, build)
+                self.assertEqual(len(built), 1)
+                self.assertEqual(loaded.rows, first.rows)
+                self.assertTrue(loaded.accepts("abab"))
+
+                # A damaged file is rebuilt and replaced.
+                with open(os.path.join(directory, name), "wb") as file:
+                    file.write(b"JSFA")
+                with mock.patch.dict("finite_automaton._CACHED", clear=True):
+                    self.assertFalse(cached_automaton(definition, build).accepts("aba"))
+                self.assertEqual(len(built), 2)
+
+                # So is one of the right length with a target out of range.
+                damaged = bytearray(first.dumps())
+                damaged[-1] = 0xFF
+                with open(os.path.join(directory, name), "wb") as file:
+                    file.write(damaged)
+                with mock.patch.dict("finite_automaton._CACHED", clear=True):
+                    self.assertTrue(cached_automaton(definition, build).accepts("abab"))
+                self.assertEqual(len(built), 3)
+                with open(os.path.join(directory, name), "rb") as file:
+                    self.assertEqual(file.read(), first.dumps())
+
+    def test_cache_key_covers_code(self):
+        def build() -> FiniteAutomaton:
+            return NFA.literal("ab").to_dfa().minimize().to_automaton()
+
+        definition = ("test_cache_key_covers_code",)
+        with tempfile.TemporaryDirectory() as directory:
+            with mock.patch.dict(os.environ, {"PHARSERR_CACHE": directory}):
+                with mock.patch.dict("finite_automaton._CACHED", clear=True):
+                    cached_automaton(definition, build)
+                # An edited builder does not read the tables of the old one.
+                edited = {inspect.getsourcefile(build): b"edited"}
+                with mock.patch.dict("finite_automaton._CACHED", clear=True):
+                    with mock.patch.dict("finite_automaton._SOURCE_DIGESTS", edited):
+                        cached_automaton(definition, build)
+                self.assertEqual(len(os.listdir(directory)), 2)
+
+    def test_compiled_bounded(self):
+        with mock.patch("finite_automaton.COMPILED_MAX", 2):
+            with mock.patch.dict("finite_automaton._COMPILED", clear=True):
+                for word in ["a", "b", "c"]:
+                    NFA.literal(word).to_dfa().minimize().to_automaton().compile()
+                self.assertEqual(len(finite_automaton._COMPILED), 2)
+
+    def test_cache_disabled(self):
+        with mock.patch.dict(os.environ, {"PHARSERR_CACHE": ""}):
+            compiled = cached_automaton(
+                ("test_cache_disabled",), lambda: FiniteAutomaton("q0", {"q0"})
+            )
+        self.assertTrue(compiled.accepts(""))
+
+
+@unittest.skipUnless(importlib.util.find_spec("numpy"), "needs numpy")
+class TestEvaluateMany(unittest.TestCase):
+    def test_same_as_evaluate(self):
+        rng = random.Random(5)
+        for _ in range(100):
+            automaton = random_automaton(rng)
+            strings = [
+                "".join(rng.choice("abcd") for _ in range(rng.randint(0, 20))) for _ in range(50)
+            ]
+            accepted, states = automaton.evaluate_many(strings)
+            self.assertEqual(list(zip(accepted, states)), [automaton.evaluate(s) for s in strings])
+
+    def test_identifiers(self):
+        strings = ["x", "_", "foo_bar1", "Ab9", "", "1a", "a-b", "é", "x" * 40, "x" * 39 + "-"]
+        automaton = IdentifierAutomaton()
+        self.assertEqual(
+            list(automaton.validate_many(strings)), list(map(automaton.validate, strings))
+        )
+        self.assertEqual(len(automaton.validate_many([])), 0)
+
+
+def random_nfa(rng: random.Random, depth: int) -> NFA:
+    choice = rng.random()
+    if depth == 0 or choice < 0.3:
+        return NFA.symbol("".join(rng.sample("abc", rng.randint(1, 2))))
+    if choice < 0.55:
+        return random_nfa(rng, depth - 1).union(random_nfa(rng, depth - 1))
+    if choice < 0.85:
+        return random_nfa(rng, depth - 1).concat(random_nfa(rng, depth - 1))
+    return random_nfa(rng, depth - 1).star()
+
+
+class TestNFA(unittest.TestCase):
+    def test_constructors(self):
+        nfa = NFA.literal("ab").union(NFA.symbol("c")).star()
+        for string, expected in [("", True), ("ab", True), ("cabc", True), ("a", False)]:
+            self.assertEqual(nfa.accepts(string), expected, string)
+        self.assertTrue(NFA.literal("").accepts(""))
+
+    def test_subset_construction(self):
+        rng = random.Random(1)
+        for _ in range(100):
+            nfa = random_nfa(rng, 4)
+            dfa = nfa.to_dfa()
+            minimized = dfa.minimize()
+            self.assertLessEqual(len(minimized.rows), len(dfa.rows))
+            self.assertEqual(len(minimized.minimize().rows), len(minimized.rows))
+            for string in STRINGS:
+                expected = nfa.accepts(string)
+                self.assertEqual(dfa.accepts(string), expected, string)
+                self.assertEqual(minimized.accepts(string), expected, string)
+
+    def test_minimize(self):
+        # q1 and q2 accept the same suffixes.
+        automaton = FiniteAutomaton("q0", {"q1", "q2"})
+        automaton.add_transition("q0", "a", "q1")
+        automaton.add_transition("q1", "ab", "q2")
+        automaton.add_transition("q2", "ab", "q2")
+        minimized = DFA.from_automaton(automaton).minimize()
+        self.assertEqual(minimized.rows, [{"a": 1}, {"a": 1, "b": 1}])
+        self.assertEqual(minimized.final, {1})
+
+        # States that can never accept are dropped.
+        trapped = DFA([{"a": 1, "b": 2}, {}, {"b": 2}], {1}).minimize()
+        self.assertEqual(trapped.rows, [{"a": 1}, {}])
+        empty = DFA([{"a": 1}, {"a": 1}], set()).minimize()
+        self.assertEqual((empty.rows, empty.final), ([{}], set()))
+
+    def test_to_automaton(self):
+        dfa = NFA.symbol("ab").concat(NFA.symbol("c").star()).to_dfa().minimize()
+        compiled = dfa.to_automaton().compile()
+        for string in STRINGS:
+            self.assertEqual(compiled.accepts(string), dfa.accepts(string), string)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import contextlib
+import io
+import unittest
+
+from benchmark import CORPORA, build_corpus
+from bnf import load_grammar
+from corpus_generator import CorpusGenerator
+from js_parser import JSParser
+from ll1 import END, TABLES_PATH, LL1Parser, build, emit, eliminate_left_recursion
+
+SAMPLES = [
+    "x = a + b * c - d;",
+    "let x = 1, y;\nconst z = 2;",
+    "a: while (x) { break a; continue; }",
+    "x = {a: 1, b: c};",
+    "{ }",
+    "f = [1,,2,];",
+    "x = a ? b : c ? d : e;",
+    "do x; while (y);",
+    "for (i = 0; i < n; i++) ;",
+    "for (let i = 0; i < 3; i++) { x = i; }",
+    "for (var a, b = 1; ; ) x;\nfor (;;) ;",
+    "if (a) if (b) c; else d;",
+    "switch (x) { case 1: y; default: z; }",
+    "try { a; } catch (e) { b; } finally { c; }",
+    "function f(a, b = 1) { return a; }",
+    "a.b.c + d[e] * f.g;",
+    "-x; +x; ++x; x--; x += 1;",
+    "a || b && c | d ** e ** f;",
+    "x = 'str'; y = true; z = null; w = 1.5;",
+]
+
+
+def parse_quietly(parse, source: str):
+    sink = io.StringIO()
+    with contextlib.redirect_stdout(sink), contextlib.redirect_stderr(sink):
+        return parse(source)
+
+
+class TestGenerator(unittest.TestCase):
+    def setUp(self):
+        self.ll1 = build(load_grammar())
+
+    def test_tables_up_to_date(self):
+        with open(TABLES_PATH, "r") as file:
+            self.assertEqual(file.read(), emit(self.ll1, "test/backus_naur.txt"))
+
+    def test_left_recursion(self):
+        rules, tails = eliminate_left_recursion({"E": [["E", "+", "T"], ["T"]], "T": [["x"]]})
+        self.assertEqual(rules["E"], [["T", "E'"]])
+        self.assertEqual(rules["E'"], [["+", "T", "E'"], []])
+        self.assertEqual(tails, {"E'"})
+        for name, alternatives in self.ll1.rules.items():
+            for alternative in alternatives:
+                self.assertFalse(alternative and alternative[0] == name, name)
+
+    def test_sets(self):
+        self.assertTrue({"if", "{", ";", "Identifier", "Literal"} <= self.ll1.first["Statement"])
+        self.assertTrue({")", ";", ":", "]"} <= self.ll1.follow["Expression"])
+        self.assertEqual(self.ll1.follow["Program"], {END})
+        self.assertIn("IfStatement_1", self.ll1.nullable)
+
+    def test_conflicts(self):
+        conflicts = {(name, lookahead) for name, lookahead, _ in self.ll1.conflicts()}
+        self.assertIn(("Statement", "Identifier"), conflicts)
+        self.assertIn(("IfStatement_1", "else"), conflicts)
+        self.assertIn("IfStatement_1 on `else`", self.ll1.report())
+
+        # `x:` starts a label, any other identifier an expression.
+        decision = self.ll1.decisions["Statement"]["Identifier"]
+        assert isinstance(decision, dict)
+        self.assertEqual(self.ll1.productions[decision[":"]][1], ("LabeledStatement",))
+        self.assertEqual(self.ll1.productions[decision[None]][1], ("ExpressionStatement",))
+
+
+class TestLL1Parser(unittest.TestCase):
+    def setUp(self):
+        self.parser = LL1Parser()
+
+    def test_same_ast(self):
+        for source in SAMPLES:
+            self.assertEqual(
+                self.parser.parse_string(source),
+                JSParser().parse_string(source),
+                source,
+            )
+
+    def test_corpus(self):
+        for seed in range(5):
+            for minified in (False, True):
+                source = CorpusGenerator(seed=seed, minified=minified).generate(3000)
+                self.assertEqual(
+                    self.parser.parse_string(source),
+                    parse_quietly(JSParser().parse_string, source),
+                )
+
+    def test_benchmark_corpora(self):
+        for kind in CORPORA:
+            source = build_corpus(kind, 5000)
+            ast = self.parser.parse_string(source)
+            self.assertEqual(ast, JSParser().parse_string(source), kind)
+
+    def test_dangling_else(self):
+        ast = self.parser.parse_string("if (a) if (b) c; else d;")
+        outer = ast["body"][0]
+        self.assertIsNone(outer["alternate"])
+        self.assertIsNotNone(outer["consequent"]["alternate"])
+
+    def test_parse_tree(self):
+        tree = self.parser.parse_tree("x = 1;")
+        self.assertEqual(tree.symbol, "Program")
+        # Helper nonterminals like `ExpressionStatement_1` are spliced away.
+        statement = tree.children[0].children[0].children[0]
+        self.assertEqual(statement.symbol, "ExpressionStatement")
+        self.assertEqual(statement.children[-1].text, ";")
+
+    def test_errors(self):
+        for source in ["x = = 1;", "if (a", "a.(b);"]:
+            self.assertFalse(self.parser.accepts(source))
+            with self.assertRaises(SyntaxError):
+                parse_quietly(self.parser.parse_string, source)
+        # The BNF allows `1++`; building the AST rejects it as JSParser does.
+        self.assertTrue(self.parser.accepts("1++;"))
+        with self.assertRaises(SyntaxError):
+            parse_quietly(self.parser.parse_string, "1++;")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import tracemalloc
+import unittest
+
+from js_parser import JSParser
+from memstats import MemoryProfiler, measure, node_sizes
+
+
+class TestMemStats(unittest.TestCase):
+    def setUp(self) -> None:
+        self.source = "let x = [1, 2, 3];\nwhile (x) { x = x - 1; }\n" * 50
+
+    def test_measure(self):
+        ast, stats = measure(self.source)
+        self.assertEqual(ast, JSParser().parse_string(self.source))
+        self.assertEqual(stats.source_bytes, len(self.source))
+        self.assertEqual(stats.tokens, 23 * 50)
+        self.assertEqual(stats.by_node_type["WhileStatement"].count, 50)
+        self.assertEqual(stats.nodes, sum(s.count for s in node_sizes(ast).values()))
+        self.assertGreater(stats.peak_bytes, 0)
+        self.assertGreaterEqual(stats.peak_bytes, stats.retained_bytes)
+        self.assertIn("parser", stats.by_module)
+        self.assertGreater(stats.bytes_per_token, 0)
+        self.assertIn("WhileStatement", stats.report())
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_already_tracing(self):
+        profiler = MemoryProfiler()
+        tracemalloc.start()
+        try:
+            profiler.parse_string(self.source)
+            self.assertTrue(tracemalloc.is_tracing())
+            assert profiler.last is not None
+            self.assertGreater(profiler.last.peak_bytes, 0)
+
+            # A peak above what the parse reaches is kept.
+            ballast = bytearray(10 * 1024 * 1024)
+            del ballast
+            peak = tracemalloc.get_traced_memory()[1]
+            profiler.parse_string(self.source)
+            self.assertEqual(tracemalloc.get_traced_memory()[1], peak)
+            self.assertIsNone(profiler.last.peak_bytes)
+            self.assertIn("unknown", profiler.last.report())
+        finally:
+            tracemalloc.stop()
+
+    def test_by_module_on_request(self):
+        profiler = MemoryProfiler()
+        profiler.parse_string(self.source)
+        assert profiler.last is not None
+        self.assertEqual(profiler.last.by_module, {})
+        self.assertGreater(profiler.last.peak_bytes, 0)
+
+    def test_sampling(self):
+        profiler = MemoryProfiler(sample_rate=0.0)
+        profiler.parse_string(self.source)
+        self.assertIsNone(profiler.last)
+        profiler.sample_rate = 1.0
+        profiler.parse_string(self.source)
+        self.assertIsNotNone(profiler.last)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import contextlib
+import io
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+from corpus_generator import CorpusGenerator
+from js_parser import JSParser
+from parallel_parse import parse_parallel, split_chunks, top_level_boundaries
+
+
+class TestParallelParse(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.executor = ProcessPoolExecutor(2)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.executor.shutdown()
+
+    def test_boundaries(self):
+        source = (
+            "let x = 1;\n"
+            "if (a) {\n  y;\n}\n"
+            "else {}\n"
+            "foo = {a: 1}\n"
+            "// z;\n"
+            "bar;\n"
+            "s = ';'\n"
+            "z;\n"
+        )
+        starts = [source[b:].split("\n")[0] for b in top_level_boundaries(source)]
+        self.assertEqual(starts, ["if (a) {", "foo = {a: 1}", "bar;", "s = ';'"])
+
+    def test_same_ast(self):
+        for seed in range(5):
+            source = CorpusGenerator(seed=seed).generate(5000)
+            self.assertGreater(len(split_chunks(source, 4, 500)), 2)
+            self.assertEqual(
+                parse_parallel(source, 2, min_chunk_size=500, executor=self.executor),
+                JSParser().parse_string(source),
+            )
+
+    def test_small_source(self):
+        self.assertEqual(parse_parallel("x;", 4), JSParser().parse_string("x;"))
+
+    def test_first_error_raised(self):
+        source = CorpusGenerator(seed=1).generate(3000)
+        source += "x = ;\n" + CorpusGenerator(seed=2).generate(3000) + "y = ;\n"
+
+        def run(parse):
+            out = io.StringIO()
+            err = io.StringIO()
+            with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+                with self.assertRaises(SyntaxError) as cm:
+                    parse()
+            return cm.exception.msg, out.getvalue(), err.getvalue()
+
+        self.assertEqual(
+            run(lambda: parse_parallel(source, 2, min_chunk_size=500, executor=self.executor)),
+            run(lambda: JSParser().parse_string(source)),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
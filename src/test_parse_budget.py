@@ -0,0 +1,95 @@
+import os
+import tempfile
+import unittest
+
+from js_parser import JSParser, materialize
+from parse_budget import (
+    BudgetExceeded,
+    DeadlineExceeded,
+    DepthLimitExceeded,
+    NodeLimitExceeded,
+    ParseBudget,
+    SourceTooLarge,
+    TokenLimitExceeded,
+)
+
+
+class TestParseBudget(unittest.TestCase):
+    def setUp(self) -> None:
+        self.parser = JSParser()
+        self.source = "let x = 1 + 2;\nwhile (x) { x = x - 1; }\n" * 20
+
+    def test_within_budget(self):
+        budget = ParseBudget(
+            timeout=60, max_tokens=380, max_depth=10, max_nodes=1000, max_bytes=10_000
+        )
+        self.assertEqual(
+            self.parser.parse_string(self.source, budget),
+            JSParser().parse_string(self.source),
+        )
+
+    def test_max_tokens(self):
+        with self.assertRaises(TokenLimitExceeded) as cm:
+            self.parser.parse_string(self.source, ParseBudget(max_tokens=379))
+        self.assertEqual(cm.exception.value, 379)
+        self.assertIsNotNone(cm.exception.location)
+
+    def test_max_depth(self):
+        source = "if (a) { if (b) { x = (((1))); } }"
+        self.parser.parse_string(source, ParseBudget(max_depth=10))
+        with self.assertRaises(DepthLimitExceeded):
+            self.parser.parse_string(source, ParseBudget(max_depth=9))
+
+    def test_recursion_limit(self):
+        source = "x = " + "(" * 3000 + "1" + ")" * 3000 + ";"
+        with self.assertRaises(DepthLimitExceeded):
+            self.parser.parse_string(source, ParseBudget())
+
+    def test_max_nodes(self):
+        with self.assertRaises(NodeLimitExceeded):
+            self.parser.parse_string(
+                self.source, ParseBudget(max_nodes=50, check_interval=1)
+            )
+
+    def test_max_bytes(self):
+        with self.assertRaises(SourceTooLarge):
+            self.parser.parse_string(self.source, ParseBudget(max_bytes=100))
+        with tempfile.NamedTemporaryFile("w", suffix=".js", delete=False) as file:
+            file.write(self.source)
+        try:
+            with self.assertRaises(SourceTooLarge):
+                self.parser.parse_file(file.name, ParseBudget(max_bytes=100))
+            self.parser.parse_file(file.name, ParseBudget(max_bytes=10_000))
+        finally:
+            os.remove(file.name)
+
+    def test_timeout(self):
+        with self.assertRaises(DeadlineExceeded):
+            self.parser.parse_string(self.source, ParseBudget(timeout=0, check_interval=1))
+
+    def test_lazy_function_bodies(self):
+        parser = JSParser(lazy_functions=True)
+        source = "function f() {\n" + self.source + "}\nf;"
+        ast = parser.parse_string(source, ParseBudget(max_tokens=10))
+        with self.assertRaises(TokenLimitExceeded):
+            materialize(ast)
+        ast = parser.parse_string(source, ParseBudget(max_tokens=382))
+        self.assertEqual(materialize(ast), JSParser().parse_string(source))
+
+        deep = "function f() { x = " + "(" * 3000 + "1" + ")" * 3000 + "; }"
+        ast = parser.parse_string(deep, ParseBudget())
+        with self.assertRaises(DepthLimitExceeded):
+            materialize(ast)
+
+    def test_parser_reusable(self):
+        for budget in (ParseBudget(max_tokens=5), ParseBudget(max_depth=2)):
+            with self.assertRaises(BudgetExceeded):
+                self.parser.parse_string("while (x) { x = x - 1; }", budget)
+        self.assertEqual(
+            self.parser.parse_string(self.source), JSParser().parse_string(self.source)
+        )
+        self.assertNotIn("_JSParser__consume_token", vars(self.parser))
+
+
+if __name__ == "__main__":
+    unittest.main()
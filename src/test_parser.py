@@ -1,5 +1,5 @@
 import unittest
-from js_parser import JSParser
+from js_parser import JSParser, LazyBody, materialize
 
 
 class TestParser(unittest.TestCase):
@@ -1076,5 +1076,95 @@ class TestParser(unittest.TestCase):
         )
 
 
+class TestParserRanges(unittest.TestCase):
+    def setUp(self) -> None:
+        self.parser = JSParser(ranges=True)
+
+    def source_of(self, source: str, node: dict) -> str:
+        return source[node["start"] : node["end"]]
+
+    def test_no_ranges_by_default(self):
+        node = JSParser().parse_string("x;")["body"][0]
+        self.assertNotIn("start", node)
+
+    def test_expression_ranges(self):
+        source = "let x = a + b * 2 - 1;"
+        declaration = self.parser.parse_string(source)["body"][0]
+        init = declaration["declarations"][0]["init"]
+        self.assertEqual(self.source_of(source, declaration), source)
+        self.assertEqual(self.source_of(source, init), "a + b * 2 - 1")
+        self.assertEqual(self.source_of(source, init["left"]), "a + b * 2")
+        self.assertEqual(self.source_of(source, init["left"]["right"]), "b * 2")
+
+    def test_member_ranges(self):
+        source = "foo.bar[0].baz"
+        member = self.parser.parse_string(source)["body"][0]["expression"]
+        self.assertEqual(self.source_of(source, member), "foo.bar[0].baz")
+        self.assertEqual(self.source_of(source, member["object"]), "foo.bar[0]")
+        self.assertEqual(self.source_of(source, member["object"]["object"]), "foo.bar")
+
+    def test_labeled_statement_range(self):
+        source = "foo: while (x) { break foo }"
+        statement = self.parser.parse_string(source)["body"][0]
+        self.assertEqual(statement["type"], "LabeledStatement")
+        self.assertEqual(self.source_of(source, statement), source)
+
+    def test_line_index(self):
+        source = "x;\n\n  function f() {}"
+        function = self.parser.parse_string(source)["body"][1]
+        assert self.parser.line_index is not None
+        location = self.parser.line_index.location(function["start"])
+        self.assertEqual((location.row, location.col), (3, 3))
+
+
+class TestLazyFunctions(unittest.TestCase):
+    def setUp(self) -> None:
+        self.parser = JSParser(lazy_functions=True)
+
+    def test_same_ast(self):
+        source = """function f(a, b = 1) {
+  let s = "}{ // '";
+  // { unbalanced in a comment
+  function g() { return `{`; }
+  return a + b;
+}
+let x = f;"""
+        lazy = self.parser.parse_string(source)
+        body = lazy["body"][0]["body"]
+        self.assertIsInstance(body, LazyBody)
+        self.assertFalse(body.parsed)
+        self.assertTrue(body.text.startswith("{") and body.text.endswith("}"))
+        self.assertEqual(lazy["body"][1]["declarations"][0]["id"]["name"], "x")
+        self.assertEqual(materialize(lazy), JSParser().parse_string(source))
+        self.assertNotIsInstance(lazy["body"][0]["body"], LazyBody)
+
+    def test_body_parsed_on_access(self):
+        body = self.parser.parse_string("function f() { return 1; }")["body"][0]["body"]
+        self.assertEqual(body[0]["body"][0]["type"], "ReturnStatement")
+        self.assertTrue(body.parsed)
+
+    def test_context_restored(self):
+        source = "while (x) { function f() { break; } }"
+        lazy = self.parser.parse_string(source)
+        self.assertEqual(lazy, JSParser().parse_string(source))
+
+    def test_errors_deferred(self):
+        program = self.parser.parse_string("function f() {\n  break;\n}")
+        with self.assertRaises(SyntaxError):
+            program["body"][0]["body"][0]
+        with self.assertRaises(SyntaxError):
+            self.parser.parse_string("function f() { let s = 'x; }")
+        with self.assertRaises(SyntaxError):
+            self.parser.parse_string("function f() { {")
+
+    def test_ranges(self):
+        source = "function f() {\n  x = a[b];\n}\nf;"
+        parser = JSParser(ranges=True, lazy_functions=True)
+        self.assertEqual(
+            materialize(parser.parse_string(source)),
+            JSParser(ranges=True).parse_string(source),
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
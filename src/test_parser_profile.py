@@ -0,0 +1,53 @@
+import unittest
+
+from js_parser import JSParser
+from parser_profile import TOKENIZER, ParseProfiler
+
+
+class TestParseProfiler(unittest.TestCase):
+    def setUp(self) -> None:
+        self.profiler = ParseProfiler()
+        self.source = "let x = 1 + 2;\nwhile (x) { x = x - 1; }"
+
+    def test_same_result(self):
+        self.assertEqual(
+            self.profiler.parse_string(self.source), JSParser().parse_string(self.source)
+        )
+
+    def test_stats(self):
+        self.profiler.parse_string(self.source)
+        stats = self.profiler.stats
+        self.assertEqual(stats["program"].calls, 1)
+        self.assertEqual(stats["program"].tokens, self.profiler.tokens)
+        self.assertEqual(self.profiler.tokens, 19)
+        self.assertEqual(stats["while_statement"].calls, 1)
+        self.assertEqual(stats["while_statement"].tokens, 12)
+        self.assertGreater(stats[TOKENIZER].calls, 0)
+        for s in stats.values():
+            self.assertLessEqual(s.exclusive_ns, s.inclusive_ns)
+
+    def test_reset(self):
+        self.profiler.parse_string(self.source)
+        self.profiler.reset()
+        self.assertEqual(self.profiler.tokens, 0)
+        self.assertNotIn("while_statement", self.profiler.report())
+        self.assertEqual(self.profiler.collapsed(), "")
+
+        self.profiler.parse_string(self.source)
+        stats = self.profiler.stats
+        self.assertEqual(stats["program"].calls, 1)
+        self.assertEqual(stats["while_statement"].calls, 1)
+        self.assertEqual(stats["while_statement"].tokens, 12)
+        self.assertEqual(self.profiler.tokens, 19)
+        self.assertIn("while_statement", self.profiler.report())
+
+    def test_reports(self):
+        self.profiler.parse_string(self.source)
+        self.assertIn("while_statement", self.profiler.report())
+        for line in self.profiler.collapsed().splitlines():
+            stack, micros = line.rsplit(" ", 1)
+            self.assertIn(stack.split(";")[0], ["program", TOKENIZER])
+            self.assertGreaterEqual(int(micros), 1)
+
+    def test_not_instrumented_by_default(self):
+        self.assertNotIn("_JSParser__statement", vars(JSParser()))
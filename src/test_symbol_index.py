@@ -0,0 +1,108 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from js_parser import JSParser
+from symbol_index import SymbolIndex, extract_symbols
+
+
+class TestSymbolIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.index = SymbolIndex(os.path.join(self.tmp.name, "index.db"))
+
+    def tearDown(self) -> None:
+        self.index.close()
+        self.tmp.cleanup()
+
+    def write(self, name: str, content: str) -> str:
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w") as file:
+            file.write(content)
+        return path
+
+    def test_extract_symbols(self):
+        source = (
+            "function f(a, b = 1) { return a.length + g[b] }\n"
+            "outer: for (let i = 0; i < n; i++) { continue outer; }\n"
+            "var o = { key: value };"
+        )
+        symbols = extract_symbols(JSParser(ranges=True).parse_string(source), source)
+        self.assertEqual(symbols[("f", "function")], 1)
+        self.assertEqual(symbols[("a", "parameter")], 1)
+        self.assertEqual(symbols[("b", "parameter")], 1)
+        self.assertEqual(symbols[("b", "reference")], 1)
+        self.assertEqual(symbols[("length", "property")], 1)
+        self.assertEqual(symbols[("outer", "label")], 1)
+        self.assertEqual(symbols[("i", "variable")], 1)
+        self.assertEqual(symbols[("i", "reference")], 2)
+        self.assertEqual(symbols[("key", "property")], 1)
+        self.assertEqual(symbols[("value", "reference")], 1)
+        self.assertNotIn(("outer", "reference"), symbols)
+
+    def test_lookup(self):
+        a = self.write("a.js", "function foo(x) { return x }")
+        b = self.write("b.js", "let y = foo;")
+        self.assertEqual(self.index.update([a, b]), (2, 0))
+        self.assertEqual(self.index.declarations("foo"), [os.path.abspath(a)])
+        self.assertEqual(self.index.references("foo"), [os.path.abspath(b)])
+        self.assertEqual(self.index.declarations("y", "variable"), [os.path.abspath(b)])
+
+    def test_incremental_update(self):
+        a = self.write("a.js", "function foo() {}")
+        self.index.update([a])
+        self.assertEqual(self.index.update([a]), (0, 1))
+        self.write("a.js", "function bar() {}")
+        self.assertEqual(self.index.update([a]), (1, 0))
+        self.assertEqual(self.index.declarations("foo"), [])
+        self.assertEqual(self.index.declarations("bar"), [os.path.abspath(a)])
+
+    def test_parse_error(self):
+        bad = self.write("bad.js", "let = ;")
+        self.assertEqual(self.index.update([bad]), (1, 0))
+        self.assertEqual([path for path, _ in self.index.errors()], [os.path.abspath(bad)])
+
+    def test_parser_crash(self):
+        good = self.write("good.js", "function good() {}")
+        crash = self.write("crash.js", "foo.\nbar;")
+        self.assertEqual(self.index.update([crash, good]), (2, 0))
+        self.assertEqual(self.index.declarations("good"), [os.path.abspath(good)])
+        self.assertEqual([path for path, _ in self.index.errors()], [os.path.abspath(crash)])
+
+    def test_unreadable_files(self):
+        a = self.write("a.js", "function foo() {}")
+        latin = os.path.join(self.tmp.name, "latin.js")
+        with open(latin, "wb") as file:
+            file.write("let caf\xe9 = 1;".encode("latin-1"))
+        missing = os.path.join(self.tmp.name, "missing.js")
+        self.assertEqual(self.index.update([a, latin, missing]), (3, 0))
+        # The other files of the batch are kept.
+        self.assertEqual(self.index.declarations("foo"), [os.path.abspath(a)])
+        errors = dict(self.index.errors())
+        self.assertIn("UTF-8", errors[latin])
+        self.assertIn(missing, errors)
+        # Files that could not be read are tried again.
+        self.assertEqual(self.index.update([latin, missing]), (1, 1))
+
+    def test_batches(self):
+        a = self.write("a.js", "function foo() {}")
+
+        def paths():
+            yield a
+            raise KeyboardInterrupt
+
+        with mock.patch("symbol_index.UPDATE_BATCH", 1), self.assertRaises(KeyboardInterrupt):
+            self.index.update(paths())
+        self.assertEqual(self.index.declarations("foo"), [os.path.abspath(a)])
+
+    def test_prune(self):
+        a = self.write("a.js", "function foo() {}")
+        self.index.update([a])
+        os.remove(a)
+        self.assertEqual(self.index.prune(), 1)
+        self.assertEqual(self.index.declarations("foo"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import contextlib
+import io
+import unittest
+
+from js_parser import TOKENS
+from tokenizer import Tokenizer, TokenKind
+
+
+class TestBracketIndex(unittest.TestCase):
+    def index(self, source: str):
+        tokenizer = Tokenizer.from_string(source, TOKENS, index_brackets=True)
+        return tokenizer, tokenizer.read_all()
+
+    def test_partners(self):
+        _, index = self.index("f = { a: [1, (2)] };\n// ( [ {\ns = '{';")
+        texts = [token.text for token in index.tokens]
+        self.assertEqual(len(index.partner), len(texts))
+        for i, partner in enumerate(index.partner):
+            if texts[i] in "([{":
+                self.assertEqual(
+                    texts[partner], {"(": ")", "[": "]", "{": "}"}[texts[i]]
+                )
+                self.assertEqual(index.partner[partner], i)
+            elif texts[i] not in ")]}":
+                self.assertEqual(partner, -1)
+        self.assertEqual(list(index.offsets), [token.offset for token in index.tokens])
+        self.assertEqual(index.diagnostics, [])
+
+    def test_mismatches(self):
+        _, index = self.index("{ ( }\n] [")
+        messages = [(token.text, message) for token, message in index.diagnostics]
+        self.assertEqual(
+            messages,
+            [("(", "Unclosed `(`"), ("]", "Unmatched `]`"), ("[", "Unclosed `[`")],
+        )
+        self.assertEqual(index.partner[0], 2)
+
+    def test_replay(self):
+        source = "let x = [1, 2];\nwhile (x) { x = x - 1; }"
+        tokenizer, _ = self.index(source)
+        replayed = [(t.text, t.location.row) for t in tokenizer]
+        streamed = [
+            (t.text, t.location.row) for t in Tokenizer.from_string(source, TOKENS)
+        ]
+        self.assertEqual(replayed, streamed)
+
+    def test_skip_block(self):
+        source = "function f() {\n  if (a) { b; }\n}\nx;"
+        tokenizer, _ = self.index(source)
+        while tokenizer.peek().kind != TokenKind.OPEN_CURLY:
+            next(tokenizer)
+        end = tokenizer.skip_block()
+        self.assertEqual(source[:end].rstrip().splitlines()[-1], "}")
+        self.assertEqual(next(tokenizer).text, "x")
+
+    def test_replay_same_errors(self):
+        sources = [
+            "function f() { let s = '}'; return [s]; }\nf;",
+            "while (x) {\n  x = ;\n}",
+            "function f() {\n  return 1;\n}\nx = 'unterminated",
+            "if (a) { b;",
+        ]
+        for source in sources:
+            results = []
+            for index in (False, True):
+                tokenizer = Tokenizer.from_string(source, TOKENS, index_brackets=index)
+                if index:
+                    tokenizer.read_all()
+                sink = io.StringIO()
+                tokens = []
+                with contextlib.redirect_stdout(sink), contextlib.redirect_stderr(sink):
+                    try:
+                        tokens.extend((t.text, t.location.row) for t in tokenizer)
+                    except SyntaxError as e:
+                        tokens.append(e.msg)
+                results.append((tokens, sink.getvalue()))
+            self.assertEqual(results[0], results[1], source)
+
+
+if __name__ == "__main__":
+    unittest.main()
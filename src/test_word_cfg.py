@@ -0,0 +1,357 @@
+import itertools
+import random
+import unittest
+
+from word_cfg import HAS_NUMPY, NUMPY_MIN_TOKENS, WordCFG, WordCFGBuilder, cfg, prune, to_cnf
+
+
+def naive_evaluate(rules: dict[str, list[list[str]]], tokens: list[str]) -> bool:
+    # CYK trying every rule in every cell, as WordCFG.evaluate used to.
+    n = len(tokens)
+    table = [[set() for _ in range(n)] for _ in range(n)]
+    for col in range(n):
+        for symbol, transforms in rules.items():
+            if [tokens[col]] in transforms:
+                table[0][col].add(symbol)
+    for pos in range(1, n):
+        for col in range(n - pos):
+            for k in range(pos):
+                for symbol, transforms in rules.items():
+                    for transform in transforms:
+                        if (
+                            len(transform) == 2
+                            and transform[0] in table[k][col]
+                            and transform[1] in table[pos - k - 1][col + k + 1]
+                        ):
+                            table[pos][col].add(symbol)
+    return n > 0 and "S" in table[n - 1][0]
+
+
+def random_cnf(rng: random.Random, symbols: int = 5, terminals: str = "ab") -> dict:
+    names = ["S"] + [f"X{i}" for i in range(1, symbols)]
+    rules: dict[str, list[list[str]]] = {name: [] for name in names}
+    for name in names:
+        for _ in range(rng.randint(1, 4)):
+            if rng.random() < 0.3:
+                rules[name].append([rng.choice(terminals)])
+            else:
+                rules[name].append([rng.choice(names), rng.choice(names)])
+    return rules
+
+
+def derives(rules: dict[str, list[list[str]]], tokens: list[str]) -> bool:
+    # Symbols deriving each span of `tokens`, grown until nothing changes, for
+    # any grammar.
+    n = len(tokens)
+    spans: dict[tuple[int, int], set[str]] = {
+        (i, j): set() for i in range(n + 1) for j in range(i, n + 1)
+    }
+
+    def matches(transform: list[str], i: int, j: int) -> bool:
+        if not transform:
+            return i == j
+        head, rest = transform[0], transform[1:]
+        if head not in rules:
+            return i < j and tokens[i] == head and matches(rest, i + 1, j)
+        return any(head in spans[i, k] and matches(rest, k, j) for k in range(i, j + 1))
+
+    changed = True
+    while changed:
+        changed = False
+        for (i, j), symbols in spans.items():
+            for symbol, transforms in rules.items():
+                if symbol not in symbols and any(matches(t, i, j) for t in transforms):
+                    symbols.add(symbol)
+                    changed = True
+    return "S" in spans[0, n]
+
+
+def random_grammar(rng: random.Random, symbols: int = 4, terminals: str = "ab") -> dict:
+    names = ["S"] + [f"X{i}" for i in range(1, symbols)]
+    parts = names + list(terminals)
+    return {
+        name: [
+            [rng.choice(parts) for _ in range(rng.choice([0, 1, 1, 2, 2, 3]))]
+            for _ in range(rng.randint(1, 3))
+        ]
+        for name in names
+    }
+
+
+class TestWordCFG(unittest.TestCase):
+    def test_demo(self):
+        self.assertTrue(cfg.evaluate("I saw the cat with the telescope".split()))
+        self.assertTrue(cfg.evaluate("the man saw the dog".split()))
+        self.assertFalse(cfg.evaluate("saw the cat".split()))
+        self.assertFalse(cfg.evaluate("I saw the unicorn".split()))
+        self.assertFalse(cfg.evaluate([]))
+
+    def test_same_as_naive(self):
+        rng = random.Random(1)
+        for _ in range(200):
+            rules = random_cnf(rng)
+            grammar = WordCFG(rules)
+            for _ in range(10):
+                tokens = [rng.choice("ab") for _ in range(rng.randint(1, 8))]
+                expected = naive_evaluate(rules, tokens)
+                for engine in ["sets", "bitset"]:
+                    self.assertEqual(grammar.evaluate(tokens, engine), expected, (engine, tokens))
+
+    def test_bitset(self):
+        numbers = cfg.numbers
+        self.assertEqual(cfg.token_masks["saw"], 1 << numbers["V"])
+        self.assertEqual(
+            cfg.combine(1 << numbers["V"], 1 << numbers["NP"] | 1 << numbers["PP"]),
+            1 << numbers["VP"],
+        )
+        with self.assertRaises(ValueError):
+            cfg.evaluate(["I"], "matrix")
+
+
+class TestCNF(unittest.TestCase):
+    def test_same_language(self):
+        rng = random.Random(4)
+        for _ in range(300):
+            rules = random_grammar(rng)
+            cnf = to_cnf(rules)
+            for transforms in cnf.values():
+                for transform in transforms:
+                    self.assertTrue(
+                        len(transform) == 2
+                        and all(part in cnf for part in transform)
+                        or len(transform) == 1
+                        and transform[0] not in cnf
+                        or transform == []
+                        and transforms is cnf["S"],
+                        (rules, cnf),
+                    )
+            grammar = WordCFG(rules)
+            for _ in range(10):
+                tokens = [rng.choice("ab") for _ in range(rng.randint(0, 6))]
+                expected = derives(rules, tokens)
+                self.assertEqual(derives(cnf, tokens), expected, (rules, tokens))
+                for engine in ["sets", "bitset"] + ["numpy"] * HAS_NUMPY:
+                    self.assertEqual(grammar.evaluate(tokens, engine), expected, (rules, tokens))
+
+    def test_builder(self):
+        # Balanced parentheses, S -> ( S ) S | ε
+        grammar = WordCFGBuilder()._rule("S", "(")._then("S")._then(")")._then("S")._or().build()
+        self.assertEqual(
+            grammar.cnf,
+            {
+                "S": [["T_(_1", "S_1"], []],
+                "S_1": [["S", "S_2"], ["T_)_1", "S"], [")"]],
+                "S_2": [["T_)_1", "S"], [")"]],
+                "T_(_1": [["("]],
+                "T_)_1": [[")"]],
+            },
+        )
+        self.assertTrue(grammar.evaluate([]))
+        self.assertTrue(grammar.evaluate(list("(()())()")))
+        self.assertFalse(grammar.evaluate(list("(()")))
+
+    def test_prune(self):
+        rules = {
+            "S": [["A", "b"], ["B"], ["A", "b"]],
+            "A": [["a"]],
+            "B": [["B", "a"]],
+            "C": [["a"]],
+        }
+        self.assertEqual(prune(rules), {"S": [["A", "b"]], "A": [["a"]]})
+        self.assertEqual(prune({"S": [["S"]]}), {})
+        self.assertFalse(WordCFG({"S": [["S"]]}).evaluate(["a"]))
+        self.assertEqual(cfg.cnf, cfg.rules)
+
+
+class TestEarley(unittest.TestCase):
+    def test_same_language(self):
+        rng = random.Random(6)
+        for _ in range(300):
+            rules = random_grammar(rng)
+            grammar = WordCFG(rules)
+            for _ in range(10):
+                tokens = [rng.choice("ab") for _ in range(rng.randint(0, 6))]
+                self.assertEqual(grammar.evaluate(tokens, "earley"), derives(rules, tokens))
+
+    def test_nullable(self):
+        # The completion of the empty A comes before B -> A A • x is predicted.
+        grammar = WordCFG({"S": [["B"]], "B": [["A", "A", "x"]], "A": [[], ["a"]]})
+        for sentence in ["x", "ax", "aax"]:
+            self.assertTrue(grammar.evaluate(list(sentence), "earley"), sentence)
+        self.assertFalse(grammar.evaluate(list("aaax"), "earley"))
+
+    def test_long_input(self):
+        expression = WordCFG(
+            {
+                "S": [["S", "+", "T"], ["T"]],
+                "T": [["T", "*", "F"], ["F"]],
+                "F": [["(", "S", ")"], ["a"]],
+            }
+        )
+        tokens = list("+".join(["(a+a*a)*a"] * 500))
+        self.assertTrue(expression.evaluate(tokens, "earley"))
+        self.assertFalse(expression.evaluate(tokens + ["+"], "earley"))
+        self.assertTrue(cfg.evaluate("I saw the cat with the telescope".split(), "earley"))
+
+
+def leaves(tree) -> list[str]:
+    if isinstance(tree, str):
+        return [tree]
+    return [token for child in tree[1:] for token in leaves(child)]
+
+
+def uses_rules(tree, rules: dict[str, list[list[str]]]) -> bool:
+    # Every node is a rule of the original grammar, or a symbol deriving
+    # nothing, which the trees leave without children.
+    if isinstance(tree, str):
+        return True
+    symbol, children = tree[0], tree[1:]
+    labels = [child if isinstance(child, str) else child[0] for child in children]
+    return (labels in rules[symbol] or not children) and all(
+        uses_rules(child, rules) for child in children
+    )
+
+
+class TestChart(unittest.TestCase):
+    def test_prefixes(self):
+        chart = cfg.chart()
+        self.assertFalse(chart.accepts())
+        accepted = []
+        for token in "I saw the cat with the telescope".split():
+            chart.push(token)
+            accepted.append(chart.accepts())
+        self.assertEqual(accepted, [False, False, False, True, False, False, True])
+        self.assertEqual(chart.tokens, "I saw the cat with the telescope".split())
+
+    def test_same_as_evaluate(self):
+        rng = random.Random(10)
+        for _ in range(200):
+            rules = random_grammar(rng)
+            grammar = WordCFG(rules)
+            tokens = [rng.choice("ab") for _ in range(rng.randint(0, 6))]
+            chart = grammar.chart()
+            for end in range(len(tokens) + 1):
+                if end:
+                    chart.push(tokens[end - 1])
+                self.assertEqual(chart.accepts(), derives(rules, tokens[:end]), (rules, tokens))
+            self.assertEqual(grammar.chart(tokens).columns, chart.columns)
+
+    def test_sparse(self):
+        chart = cfg.chart("I saw the cat the".split())
+        # Only the spans some symbol derives are stored.
+        self.assertEqual(
+            [sorted(column) for column in chart.columns], [[], [0], [1], [2], [0, 1, 2, 3], [4]]
+        )
+        self.assertEqual(chart.cell(1, 3), 0)
+        self.assertEqual(chart.splits(0, 4), [1])
+        chart.push("unknown")
+        self.assertEqual(chart.columns[-1], {})
+        self.assertFalse(chart.accepts())
+
+
+class TestForest(unittest.TestCase):
+    def test_demo(self):
+        forest = cfg.parse("I saw the cat with the telescope".split())
+        self.assertEqual(forest.count(), 2)
+        trees = list(forest.trees())
+        self.assertEqual(len(set(trees)), 2)
+        attached = (
+            "VP",
+            ("VP", ("V", "saw"), ("NP", ("Det", "the"), ("N", "cat"))),
+            ("PP", ("P", "with"), ("NP", ("Det", "the"), ("N", "telescope"))),
+        )
+        self.assertIn(("S", ("NP", "I"), attached), trees)
+        score, tree = forest.best(lambda symbol, transform: transform == ("VP", "PP"))
+        self.assertEqual((score, tree), (1, ("S", ("NP", "I"), attached)))
+        self.assertIsNone(cfg.parse("I saw".split()))
+
+    def test_original_rules(self):
+        # Unit rules, long rules and empty symbols come back from the CNF.
+        grammar = WordCFGBuilder()._rule("S", "A")._rule("A", "B")._then("x")._then("y")
+        grammar = grammar._rule("B", "b")._or().build()
+        self.assertEqual(
+            list(grammar.parse(list("bxy")).trees()), [("S", ("A", ("B", "b"), "x", "y"))]
+        )
+        self.assertEqual(list(grammar.parse(list("xy")).trees()), [("S", ("A", ("B",), "x", "y"))])
+        parentheses = WordCFGBuilder()._rule("S", "(")._then("S")._then(")")._then("S")._or()
+        forest = parentheses.build().parse(list("()()"))
+        self.assertEqual(
+            list(forest.trees()), [("S", "(", ("S",), ")", ("S", "(", ("S",), ")", ("S",)))]
+        )
+        self.assertEqual(list(parentheses.build().parse([]).trees()), [("S",)])
+
+    def test_ambiguous(self):
+        # Attachments of k prepositional phrases are counted by Catalan numbers.
+        forest = cfg.parse(("I saw the cat" + " with the telescope" * 12).split())
+        self.assertEqual(forest.count(), 742900)
+        self.assertLess(len(forest.packed), 300)
+        self.assertEqual(len(list(itertools.islice(forest.trees(), 1000))), 1000)
+
+    def test_deep(self):
+        # Left recursion nests the trees as deep as the input is long.
+        forest = WordCFG({"S": [["S", "b"], ["a"]]}).parse(["a"] + ["b"] * 2999)
+        self.assertEqual(forest.count(), 1)
+        for tree in (forest.best(lambda symbol, transform: 1.0)[1], next(forest.trees())):
+            depth = 1
+            while len(tree) == 3:
+                self.assertEqual(tree[2], "b")
+                tree = tree[1]
+                depth += 1
+            self.assertEqual(tree, ("S", "a"))
+            self.assertEqual(depth, 3000)
+
+    def test_enumerate(self):
+        rng = random.Random(8)
+        for _ in range(300):
+            rules = random_grammar(rng)
+            grammar = WordCFG(rules)
+            tokens = [rng.choice("ab") for _ in range(rng.randint(0, 5))]
+            forest = grammar.parse(tokens)
+            if forest is None:
+                self.assertFalse(derives(rules, tokens))
+                continue
+            trees = list(forest.trees())
+            self.assertEqual(len(set(trees)), len(trees))
+            self.assertEqual(forest.count(), len(trees))
+            for tree in trees:
+                self.assertEqual(tree[0], "S")
+                self.assertEqual(leaves(tree), tokens)
+                self.assertTrue(uses_rules(tree, rules), (rules, tree))
+            _, best = forest.best(lambda symbol, transform: rng.random())
+            self.assertIn(best, trees)
+
+
+@unittest.skipUnless(HAS_NUMPY, "needs numpy")
+class TestNumpyEngine(unittest.TestCase):
+    def test_same_as_naive(self):
+        rng = random.Random(2)
+        for _ in range(100):
+            rules = random_cnf(rng)
+            grammar = WordCFG(rules)
+            for _ in range(10):
+                tokens = [rng.choice("ab") for _ in range(rng.randint(1, 9))]
+                self.assertEqual(
+                    grammar.evaluate(tokens, "numpy"), naive_evaluate(rules, tokens), tokens
+                )
+
+    def test_no_binary_rules(self):
+        grammar = WordCFG({"S": [["a"]]})
+        self.assertTrue(grammar.evaluate(["a"], "numpy"))
+        self.assertFalse(grammar.evaluate(["a", "a"], "numpy"))
+        self.assertFalse(WordCFG({"X": [["a"]]}).evaluate(["a"], "numpy"))
+
+    def test_auto(self):
+        # Every span of a's is derivable, a quarter of those of the demo.
+        dense = WordCFG({"S": [["S", "S"], ["a"]]})
+        self.assertEqual(dense.engine_for(["a"] * (NUMPY_MIN_TOKENS - 1)), "bitset")
+        self.assertEqual(dense.engine_for(["a"] * NUMPY_MIN_TOKENS), "numpy")
+        self.assertEqual(dense.engine_for(["a"] * 100_000), "bitset")
+        tokens = ("I saw the cat" + " with the telescope" * 20).split()
+        self.assertEqual(cfg.engine_for(tokens), "bitset")
+        self.assertTrue(dense.evaluate(["a"] * NUMPY_MIN_TOKENS))
+        self.assertTrue(cfg.evaluate(tokens))
+        self.assertFalse(cfg.evaluate(tokens + ["saw"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
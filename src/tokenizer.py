@@ -1,6 +1,9 @@
+from array import array
+from bisect import bisect_right
 from collections.abc import Iterator
 from dataclasses import dataclass
 from enum import Enum, auto
+import re
 import sys
 
 sys.tracebacklimit = 0
@@ -75,50 +78,289 @@ class Location:
         return f"{self.__str__():{format_spec}}"
 
 
+class LineIndex:
+    """Maps character offsets to row/column, sharing one line table per source."""
+
+    def __init__(self, content: str, file_path: str) -> None:
+        self.content = content
+        self.file_path = file_path
+        self.__line_starts: list[int] | None = None
+
+    def line_starts(self) -> list[int]:
+        if self.__line_starts is None:
+            starts = [0]
+            nl = self.content.find("\n")
+            while nl != -1:
+                starts.append(nl + 1)
+                nl = self.content.find("\n", nl + 1)
+            self.__line_starts = starts
+        return self.__line_starts
+
+    def location(self, offset: int) -> Location:
+        starts = self.line_starts()
+        row = bisect_right(starts, offset)
+        return Location(row, offset - starts[row - 1] + 1, self.file_path)
+
+    def line(self, row: int) -> str:
+        start = self.line_starts()[row - 1]
+        end = self.content.find("\n", start)
+        return self.content[start:] if end == -1 else self.content[start:end]
+
+
+# What `skip_block` has to look at: braces, string quotes and comments.
+SKIP_PATTERN = re.compile(r"[{}'\"`]|//")
+
+
 @dataclass
 class Token:
     text: str
     kind: TokenKind
     location: Location
+    offset: int = 0
+
+
+OPENING = {
+    TokenKind.OPEN_PAREN: TokenKind.CLOSE_PAREN,
+    TokenKind.OPEN_SQUARE: TokenKind.CLOSE_SQUARE,
+    TokenKind.OPEN_CURLY: TokenKind.CLOSE_CURLY,
+}
+CLOSING = {close: open for open, close in OPENING.items()}
+
+
+class BracketIndex:
+    """Matching brackets by token index, filled in as tokens are produced.
+
+    `partner[i]` is the index of the bracket matching token `i`, or -1 when
+    token `i` is not a bracket or has no partner, and `offsets[i]` is where
+    token `i` starts. A closing bracket that does not match the innermost open
+    one closes the nearest open bracket of its kind, reporting the ones in
+    between as unclosed; mismatches end up in `diagnostics`, not as errors.
+    """
+
+    def __init__(self) -> None:
+        self.tokens: list[Token] = []
+        self.partner = array("l")
+        self.offsets = array("l")
+        self.diagnostics: list[tuple[Token, str]] = []
+        self.finished = False
+        self.__open: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def add(self, token: Token) -> None:
+        index = len(self.tokens)
+        self.tokens.append(token)
+        self.partner.append(-1)
+        self.offsets.append(token.offset)
+        if token.kind in OPENING:
+            self.__open.append(index)
+        elif (opening := CLOSING.get(token.kind)) is not None:
+            stack = self.__open
+            depth = len(stack) - 1
+            while depth >= 0 and self.tokens[stack[depth]].kind != opening:
+                depth -= 1
+            if depth < 0:
+                self.diagnostics.append((token, f"Unmatched `{token.text}`"))
+                return
+            for unclosed in stack[depth + 1 :]:
+                self.__report_unclosed(unclosed)
+            partner = stack[depth]
+            del stack[depth:]
+            self.partner[index] = partner
+            self.partner[partner] = index
+
+    def finish(self) -> None:
+        if not self.finished:
+            self.finished = True
+            for unclosed in self.__open:
+                self.__report_unclosed(unclosed)
+            self.__open.clear()
+
+    def __report_unclosed(self, index: int) -> None:
+        token = self.tokens[index]
+        self.diagnostics.append((token, f"Unclosed `{token.text}`"))
+
+
+class _DeferredError(Exception):
+    pass
 
 
 class Tokenizer(Iterator[Token]):
     def __init__(
-        self, content: str, file_path: str, token_pairs: dict[TokenKind, str]
+        self,
+        content: str,
+        file_path: str,
+        token_pairs: dict[TokenKind, str],
+        index_brackets: bool = False,
     ) -> None:
+        self.source = content
+        self.source_offset = 0
         self.content = content
         self.file_path = file_path
         self.line = ""
         self.full_line = ""
         self.row = 0
+        self.line_offset = 0
+        self.next_line_offset = 0
         self.token_pairs = token_pairs
         self.stop = False
 
         self.peek_token: Token | None = None
 
+        self.brackets = BracketIndex() if index_brackets else None
+        # While not None, tokens are served from `brackets.tokens` from here on.
+        self.position: int | None = None
+        self.__line_index: LineIndex | None = None
+        self.__quiet = False
+        self.__resume = (0, "")
+
     @classmethod
-    def from_string(cls, string: str, token_pairs: dict[TokenKind, str]):
-        return cls(string, "string", token_pairs)
+    def from_string(
+        cls,
+        string: str,
+        token_pairs: dict[TokenKind, str],
+        index_brackets: bool = False,
+    ):
+        return cls(string, "string", token_pairs, index_brackets)
 
     @classmethod
-    def from_file(cls, file_path: str, token_pairs: dict[TokenKind, str]):
+    def from_file(
+        cls,
+        file_path: str,
+        token_pairs: dict[TokenKind, str],
+        index_brackets: bool = False,
+    ):
         with open(file_path, "r") as file:
             content = "".join(file.readlines())
-        return cls(content, file_path, token_pairs)
+        return cls(content, file_path, token_pairs, index_brackets)
+
+    @classmethod
+    def from_fragment(
+        cls,
+        fragment: str,
+        file_path: str,
+        token_pairs: dict[TokenKind, str],
+        offset: int,
+        row: int,
+    ):
+        """Tokenizes `fragment`, which starts at the beginning of line `row`,
+        `offset` characters into a larger source."""
+        tokenizer = cls(fragment, file_path, token_pairs)
+        tokenizer.source_offset = offset
+        tokenizer.next_line_offset = offset
+        tokenizer.row = row - 1
+        return tokenizer
+
+    @classmethod
+    def from_source(
+        cls,
+        source: str,
+        file_path: str,
+        token_pairs: dict[TokenKind, str],
+        start: int,
+        end: int,
+        row: int,
+        source_offset: int = 0,
+    ):
+        """Tokenizes the part between offsets `start` and `end`, `start` being on
+        line `row`, of a source that begins `source_offset` characters into the
+        file; locations and offsets are relative to the file."""
+        tokenizer = cls(source, file_path, token_pairs)
+        tokenizer.source_offset = source_offset
+        start -= source_offset
+        end -= source_offset
+        line_start = source.rfind("\n", 0, start) + 1
+        nl = source.find("\n", start, end)
+        if nl == -1:
+            tokenizer.full_line = source[line_start:end]
+            tokenizer.content = ""
+            tokenizer.next_line_offset = end + source_offset
+        else:
+            tokenizer.full_line = source[line_start:nl]
+            tokenizer.content = source[nl + 1 : end]
+            tokenizer.next_line_offset = nl + 1 + source_offset
+        tokenizer.line = tokenizer.full_line[start - line_start :]
+        tokenizer.line_offset = line_start + source_offset
+        tokenizer.row = row
+        return tokenizer
 
     def location(self) -> Location:
+        if self.position is not None:
+            return self.__line_index_of().location(self.offset() - self.source_offset)
         return Location(
             self.row, len(self.full_line) - len(self.line) + 1, self.file_path
         )
 
+    def offset(self) -> int:
+        if self.position is not None:
+            assert self.brackets is not None
+            if self.position == 0:
+                return self.source_offset
+            last = self.brackets.tokens[self.position - 1]
+            return last.offset + len(last.text)
+        return self.line_offset + len(self.full_line) - len(self.line)
+
+    def __line_index_of(self) -> LineIndex:
+        if self.__line_index is None:
+            self.__line_index = LineIndex(self.source, self.file_path)
+        return self.__line_index
+
+    def read_all(self) -> BracketIndex:
+        """Tokenizes the rest of the input into `brackets` in a single pass and
+        replays it from there on, so `skip_block` can jump in O(1).
+
+        A tokenizer error stops the pass without being reported; it is raised
+        once replay reaches the place where it happened.
+        """
+        assert self.brackets is not None and self.position is None
+        assert self.source_offset == 0, "fragments are not indexed"
+        start = len(self.brackets)
+        self.__quiet = True
+        try:
+            for _ in self:
+                pass
+        except _DeferredError:
+            pass
+        finally:
+            self.__quiet = False
+        self.__resume = (self.row, self.full_line)
+        self.stop = False
+        self.position = start
+        self.row = 0
+        return self.brackets
+
+    def __set_row(self, row: int) -> None:
+        # The parser reads `full_line` for its diagnostics.
+        if row != self.row:
+            self.row = row
+            self.full_line = self.__line_index_of().line(row)
+
+    def __peek_replayed(self) -> Token | None:
+        assert self.brackets is not None and self.position is not None
+        tokens = self.brackets.tokens
+        if self.position < len(tokens):
+            token = tokens[self.position]
+            self.__set_row(token.location.row)
+            self.peek_token = token
+            return token
+        # Hand over to the tokenizer where the pass stopped, at the end of the
+        # input or at the error it deferred.
+        self.position = None
+        self.row, self.full_line = self.__resume
+        return self.peek()
+
     def __next_line(self) -> None:
         nl = self.content.find("\n")
+        self.line_offset = self.next_line_offset
         if nl == -1:
             self.full_line = self.content
             self.content = ""
+            self.next_line_offset += len(self.full_line)
         else:
             self.full_line = self.content[:nl]
             self.content = self.content[nl + 1 :]
+            self.next_line_offset += nl + 1
         self.row += 1
         self.line = self.full_line.lstrip()
 
@@ -150,13 +392,70 @@ class Tokenizer(Iterator[Token]):
         token = self.peek()
         self.peek_token = None
         if token is not None:
+            if self.position is not None:
+                self.position += 1
+            elif self.brackets is not None:
+                self.brackets.add(token)
             return token
         else:
+            if self.brackets is not None and self.position is None:
+                self.brackets.finish()
             raise StopIteration()
 
+    def skip_block(self) -> int:
+        """Moves past the `}` matching the peeked `{` without producing tokens
+        and returns the offset after it. Strings and comments are skipped the
+        way `peek` reads them, so braces inside them do not count."""
+        assert self.peek_token is not None and self.peek_token.kind == TokenKind.OPEN_CURLY
+        self.peek_token = None
+        if self.position is not None:
+            return self.__jump_block()
+        depth = 1
+        while True:
+            line = self.line
+            pos = 0
+            while (match := SKIP_PATTERN.search(line, pos)) is not None:
+                c = match.group()
+                pos = match.end()
+                if c == "{":
+                    depth += 1
+                elif c == "}":
+                    depth -= 1
+                    if depth == 0:
+                        self.line = line[pos:]
+                        return self.offset()
+                elif c == "//":
+                    break
+                else:
+                    end = line.find(c, pos)
+                    if end == -1:
+                        self.line = line[match.start() :]
+                        self.print_err("Unterminated string literal")
+                    pos = end + 1
+            if len(self.content) == 0:
+                self.line = ""
+                self.stop = True
+                self.print_err("Unexpected EOF")
+            self.__next_line()
+
+    def __jump_block(self) -> int:
+        assert self.brackets is not None and self.position is not None
+        partner = self.brackets.partner[self.position]
+        if partner == -1:
+            # Unclosed, or the pass stopped at an error before the `}`.
+            self.position = len(self.brackets)
+            self.peek()
+            self.print_err("Unexpected EOF")
+        closing = self.brackets.tokens[partner]
+        self.position = partner + 1
+        self.__set_row(closing.location.row)
+        return closing.offset + 1
+
     def print_err(
         self, err_msg: str, token: Token | None = None, full_line: str | None = None
     ):
+        if self.__quiet:
+            raise _DeferredError()
         if token is not None:
             length = len(token.text)
             location = token.location
@@ -174,7 +473,11 @@ class Tokenizer(Iterator[Token]):
     def peek(self) -> Token | None:
         if self.peek_token is not None:
             return self.peek_token
+        if self.position is not None:
+            return self.__peek_replayed()
+        return self.__scan()
 
+    def __scan(self) -> Token | None:
         self.line = self.line.lstrip()
 
         while (len(self.line) == 0 and len(self.content) > 0) or self.line.startswith(
@@ -187,12 +490,13 @@ class Tokenizer(Iterator[Token]):
             return None
 
         location = self.location()
+        offset = self.offset()
 
         for token_kind, token_text in self.token_pairs.items():
             if self.line.startswith(s := token_text):
                 if token_text == "." and self.line[1] in "0123456789":
                     break
-                token = Token(s, token_kind, location)
+                token = Token(s, token_kind, location, offset)
                 self.line = self.line[len(s) :]
                 self.peek_token = token
                 return token
@@ -222,9 +526,9 @@ class Tokenizer(Iterator[Token]):
                 idx += 1
             self.line = self.line[len(text) :]
             if number:
-                token = Token(text, TokenKind.NUMBER_LIT, location)
+                token = Token(text, TokenKind.NUMBER_LIT, location, offset)
             else:
-                token = Token(text, TokenKind.WORD, location)
+                token = Token(text, TokenKind.WORD, location, offset)
             self.peek_token = token
             return token
 
@@ -239,7 +543,7 @@ class Tokenizer(Iterator[Token]):
             else:
                 s = self.line
                 self.line = ""
-            token = Token(s, TokenKind.WORD, location)
+            token = Token(s, TokenKind.WORD, location, offset)
             self.peek_token = token
             return token
         elif self.line[0] in "0123456789.":
@@ -253,7 +557,7 @@ class Tokenizer(Iterator[Token]):
             else:
                 s = self.line
                 self.line = ""
-            token = Token(s, TokenKind.NUMBER_LIT, location)
+            token = Token(s, TokenKind.NUMBER_LIT, location, offset)
             self.peek_token = token
             return token
         elif (quote := self.line[0]) in "'\"`":
@@ -263,7 +567,7 @@ class Tokenizer(Iterator[Token]):
             else:
                 s = self.line[: end + 2]
                 self.line = self.line[end + 2 :]
-                token = Token(s, TokenKind.STR_LIT, location)
+                token = Token(s, TokenKind.STR_LIT, location, offset)
                 self.peek_token = token
                 return token
         else:
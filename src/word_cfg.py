@@ -1,32 +1,723 @@
+import argparse
+import importlib.util
+import math
+import time
+from collections.abc import Callable, Iterable, Iterator
 from pprint import pprint
+from typing import Any
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+# When `auto` picks NumPy over the bitset engine. The bitset chart only does
+# work for the spans some symbol derives while NumPy fills every cell, so NumPy
+# only wins when most spans are derivable: with at least NUMPY_MIN_DENSITY of
+# the spans of the first NUMPY_PROBE_TOKENS tokens derivable, from
+# NUMPY_MIN_TOKENS tokens on. Below that, setting up the arrays costs more than
+# the loop it saves. Above NUMPY_MAX_CELLS cells, the dense charts would take
+# too much memory.
+NUMPY_MIN_TOKENS = 64
+NUMPY_PROBE_TOKENS = 16
+NUMPY_MIN_DENSITY = 0.5
+NUMPY_MAX_CELLS = 1 << 26
+
+Rules = dict[str, list[list[str]]]
+
+# See `cnf_with_shapes`.
+Shape = tuple[Any, ...]
+
+
+def nullable_symbols(rules: Rules) -> set[str]:
+    nullable: set[str] = set()
+    changed = True
+    while changed:
+        changed = False
+        for symbol, transforms in rules.items():
+            if symbol not in nullable and any(
+                all(part in nullable for part in transform) for transform in transforms
+            ):
+                nullable.add(symbol)
+                changed = True
+    return nullable
+
+
+def prune(rules: Rules, start: str = "S") -> Rules:
+    """The rules without duplicates, without symbols deriving no sentence and
+    the rules using them, and without symbols `start` never reaches"""
+    productive: set[str] = set()
+    changed = True
+    while changed:
+        changed = False
+        for symbol, transforms in rules.items():
+            if symbol not in productive and any(
+                all(part in productive or part not in rules for part in transform)
+                for transform in transforms
+            ):
+                productive.add(symbol)
+                changed = True
+
+    reachable = {start} & productive
+    stack = list(reachable)
+    pruned: Rules = {}
+    while stack:
+        symbol = stack.pop()
+        pruned[symbol] = []
+        for transform in dict.fromkeys(map(tuple, rules[symbol])):
+            if all(part in productive or part not in rules for part in transform):
+                pruned[symbol].append(list(transform))
+                for part in transform:
+                    if part in rules and part not in reachable:
+                        reachable.add(part)
+                        stack.append(part)
+    return {symbol: pruned[symbol] for symbol in rules if symbol in pruned}
+
+
+def to_cnf(rules: Rules, start: str = "S") -> Rules:
+    """An equivalent grammar in Chomsky normal form: every rule is A -> B C or
+    A -> token, plus `start` -> [] when the empty sentence is derivable.
+
+    Tokens inside longer rules get a symbol `T_token` of their own, rules
+    longer than two are split into chains through symbols `A_1`, `A_2`...,
+    then empty and unit rules are eliminated. Symbols are nonterminals when
+    they have rules and tokens otherwise.
+    """
+    return cnf_with_shapes(rules, start)[0]
+
+
+def cnf_with_shapes(rules: Rules, start: str = "S") -> tuple[Rules, dict[tuple[str, ...], Shape]]:
+    """`to_cnf`, along with the shape of the derivation in `rules` every CNF
+    rule stands for, by (symbol, *transform).
+
+    A shape lists the children of that derivation: the index of a child in the
+    CNF rule, or (symbol, shape) for a symbol left out as empty or passed
+    through by a unit rule.
+    """
+    names = set(rules) | {part for transforms in rules.values() for t in transforms for part in t}
+    rules = prune(rules, start)
+
+    def fresh(base: str) -> str:
+        n = 1
+        while f"{base}_{n}" in names:
+            n += 1
+        names.add(f"{base}_{n}")
+        return f"{base}_{n}"
+
+    binary = _binarize(rules, fresh)
+    nullable = nullable_symbols(binary)
+    cnf, shapes = _eliminate_units(_nonempty(binary, set(binary) - set(rules), nullable))
+    if start in nullable:
+        cnf[start].append([])
+        shapes[(start,)] = ()
+    return prune(cnf, start), shapes
+
+
+def _binarize(rules: Rules, fresh: Callable[[str], str]) -> Rules:
+    # Tokens in rules of two or more symbols, and rules longer than two.
+    token_symbols: dict[str, str] = {}
+    binary: Rules = {symbol: [] for symbol in rules}
+    for symbol, transforms in rules.items():
+        for transform in transforms:
+            if len(transform) >= 2:
+                transform = list(transform)
+                for i, part in enumerate(transform):
+                    if part not in rules:
+                        if part not in token_symbols:
+                            token_symbols[part] = fresh(f"T_{part}")
+                            binary[token_symbols[part]] = [[part]]
+                        transform[i] = token_symbols[part]
+            head = symbol
+            while len(transform) > 2:
+                tail = fresh(symbol)
+                binary[head].append([transform[0], tail])
+                binary[tail] = []
+                head, transform = tail, transform[1:]
+            binary[head].append(list(transform))
+    return binary
+
+
+def _nonempty(
+    binary: Rules, helpers: set[str], nullable: set[str]
+) -> dict[str, list[tuple[list[str], Shape]]]:
+    # Every way to leave out symbols deriving the empty sentence.
+    def empty(part: str) -> Shape:
+        # Made up symbols have a single rule and stand for what it holds.
+        if part in helpers:
+            return tuple(element for inner in binary[part][0] for element in empty(inner))
+        return ((part, ()),)
+
+    nonempty: dict[str, list[tuple[list[str], Shape]]] = {}
+    for symbol, transforms in binary.items():
+        nonempty[symbol] = []
+        for transform in transforms:
+            variants: list[tuple[list[str], Shape]] = [([], ())]
+            for part in transform:
+                kept = [(parts + [part], shape + (len(parts),)) for parts, shape in variants]
+                if part in nullable:
+                    kept += [(parts, shape + empty(part)) for parts, shape in variants]
+                variants = kept
+            nonempty[symbol] += [(parts, shape) for parts, shape in variants if parts]
+    return nonempty
+
+
+def _eliminate_units(
+    nonempty: dict[str, list[tuple[list[str], Shape]]]
+) -> tuple[Rules, dict[tuple[str, ...], Shape]]:
+    # A -> B: A gets the other rules of every B it reaches through those, and
+    # B goes into their shapes.
+    cnf: Rules = {}
+    shapes: dict[tuple[str, ...], Shape] = {}
+    for symbol in nonempty:
+        cnf[symbol] = []
+        units = {symbol}
+        stack: list[tuple[str, Callable[[Shape], Shape]]] = [(symbol, lambda shape: shape)]
+        while stack:
+            unit, outer = stack.pop()
+            for transform, shape in nonempty[unit]:
+                target = transform[0]
+                if len(transform) == 1 and target in nonempty:
+                    if target not in units:
+                        units.add(target)
+                        stack.append((target, _inside(outer, shape, target)))
+                elif (symbol, *transform) not in shapes:
+                    cnf[symbol].append(transform)
+                    shapes[symbol, *transform] = outer(shape)
+    return cnf, shapes
+
+
+def _inside(outer: Callable[[Shape], Shape], unit: Shape, symbol: str) -> Callable[[Shape], Shape]:
+    # The shapes of the rules of `symbol`, reached by a unit rule with shape
+    # `unit` from a symbol whose shapes `outer` builds.
+    return lambda shape: outer(
+        tuple((symbol, shape) if isinstance(element, int) else element for element in unit)
+    )
+
+
+# A symbol deriving the tokens from `start` up to `end`.
+Node = tuple[str, int, int]
+
+# (symbol, *children), the children being trees or tokens.
+Tree = tuple[Any, ...]
+
+
+class Forest:
+    """Shared packed parse forest: every node derivable in a parse once, with
+    its alternatives, each a tuple of child nodes or of a single token.
+
+    The forest holds derivations in the CNF grammar; trees are rebuilt from
+    them in the original one, where a symbol that derives nothing is a node
+    with no children. Their number can grow exponentially with the input while
+    the forest stays polynomial; `count` and `best` never enumerate them.
+    """
+
+    def __init__(
+        self,
+        root: Node,
+        packed: dict[Node, list[tuple[Node | str, ...]]],
+        shapes: dict[tuple[str, ...], Shape],
+        symbols: set[str],
+    ):
+        self.root = root
+        self.packed = packed
+        self.shapes = shapes
+        self.symbols = symbols
+
+    def count(self) -> int:
+        return self.__bottom_up(
+            lambda node, alternatives: sum(math.prod(children) for children in alternatives),
+            lambda child: 1,
+        )
+
+    def best(self, score: Callable[[str, tuple[str, ...]], float]) -> tuple[float, Tree]:
+        """The tree with the highest total `score(symbol, transform)` over the
+        CNF rules it uses, and that total"""
+        choices: dict[Node, tuple[Node | str, ...]] = {}
+
+        def choose(node: Node, alternatives: list[list[float]]) -> float:
+            symbol = node[0]
+            totals = [
+                sum(children) + score(symbol, tuple(map(self.__label, alternative)))
+                for children, alternative in zip(alternatives, self.packed[node])
+            ]
+            total = max(totals)
+            choices[node] = self.packed[node][totals.index(total)]
+            return total
+
+        total = self.__bottom_up(choose, lambda child: 0.0)
+        (tree,) = self.__build(choices)
+        return total, tree
+
+    def trees(self) -> Iterator[Tree]:
+        """Every tree, one at a time"""
+        # In CNF a child spans fewer tokens than its parent, so a node shows up
+        # at most once in a tree and a tree is a choice of alternative for each
+        # node it reaches. The choices are enumerated like an odometer, over
+        # the nodes in the order a depth-first walk reaches them.
+        fixed: dict[Node, int] = {}
+        while True:
+            index: dict[Node, int] = {}
+            order: list[Node] = []
+            stack = [self.root]
+            while stack:
+                node = stack.pop()
+                index[node] = fixed.get(node, 0)
+                order.append(node)
+                alternative = self.packed[node][index[node]]
+                stack += [child for child in reversed(alternative) if not isinstance(child, str)]
+            (tree,) = self.__build({node: self.packed[node][i] for node, i in index.items()})
+            yield tree
+
+            while order and index[order[-1]] + 1 == len(self.packed[order[-1]]):
+                order.pop()
+            if not order:
+                return
+            last = order.pop()
+            fixed = {node: index[node] for node in order}
+            fixed[last] = index[last] + 1
+
+    @staticmethod
+    def __label(child: Node | str) -> str:
+        return child if isinstance(child, str) else child[0]
+
+    def __bottom_up(
+        self, combine: Callable[[Node, list[list[Any]]], Any], leaf: Callable[[str], Any]
+    ) -> Any:
+        # Children before parents without recursion, as trees get as deep as
+        # the input is long.
+        values: dict[Node, Any] = {}
+        stack = [self.root]
+        while stack:
+            node = stack[-1]
+            if node in values:
+                stack.pop()
+                continue
+            pending = [
+                child
+                for alternative in self.packed[node]
+                for child in alternative
+                if not isinstance(child, str) and child not in values
+            ]
+            if pending:
+                stack += pending
+                continue
+            stack.pop()
+            values[node] = combine(
+                node,
+                [
+                    [leaf(c) if isinstance(c, str) else values[c] for c in alternative]
+                    for alternative in self.packed[node]
+                ],
+            )
+        return values[self.root]
+
+    def __wrap(self, symbol: str, shape: Shape, children: list[tuple[Any, ...]]) -> tuple[Any, ...]:
+        # What a symbol adds to the children of its parent: itself, or the
+        # children of its shape for symbols made up by the CNF conversion.
+        # Shapes nest as deep as unit rules chain, which the grammar bounds.
+        inside: tuple[Any, ...] = ()
+        for element in shape:
+            if isinstance(element, int):
+                inside += children[element]
+            else:
+                inside += self.__wrap(*element, children)
+        return ((symbol, *inside),) if symbol in self.symbols else inside
+
+    def __node(
+        self, node: Node, alternative: tuple[Node | str, ...], children: list[tuple[Any, ...]]
+    ) -> tuple[Any, ...]:
+        shape = self.shapes[(node[0], *map(self.__label, alternative))]
+        return self.__wrap(node[0], shape, children)
+
+    def __build(self, choices: dict[Node, tuple[Node | str, ...]]) -> tuple[Any, ...]:
+        # Children before parents with a stack, like `__bottom_up`.
+        built: dict[Node, tuple[Any, ...]] = {}
+        stack = [self.root]
+        while stack:
+            node = stack[-1]
+            if node in built:
+                stack.pop()
+                continue
+            alternative = choices[node]
+            pending = [c for c in alternative if not isinstance(c, str) and c not in built]
+            if pending:
+                stack += pending
+                continue
+            stack.pop()
+            children = [(c,) if isinstance(c, str) else built[c] for c in alternative]
+            built[node] = self.__node(node, alternative, children)
+        return built[self.root]
+
+
+class Chart:
+    """Bitset CYK chart filled left to right: `push` fills the cells of all
+    the spans ending at the new token, so `accepts` tells after every token
+    whether the tokens so far form a sentence, and pushing n tokens does the
+    work of a single CYK run over them"""
+
+    def __init__(self, grammar: "WordCFG"):
+        self.grammar = grammar
+        self.tokens: list[str] = []
+        # Only the cells some symbol derives are kept: columns[end][start] and
+        # starting[start][end] are both the mask of the symbols deriving
+        # tokens[start:end], so memory grows with the derivable spans and the
+        # splits tried are those with two non-empty children.
+        self.columns: list[dict[int, int]] = [{}]
+        self.starting: list[dict[int, int]] = []
+        # Few distinct cells show up in practice, so the symbols every pair of
+        # cells combines into are only worked out once.
+        self.combined: dict[tuple[int, int], int] = {}
+
+    def push(self, token: str) -> None:
+        grammar = self.grammar
+        starting = self.starting
+        combined = self.combined
+        end = len(self.tokens) + 1
+        self.tokens.append(token)
+        starting.append({})
+        column: dict[int, int] = {}
+        mask = grammar.token_masks.get(token, 0)
+        if mask:
+            column[end - 1] = mask
+            # Shorter spans first, as they are the right children of longer
+            # ones. With the token underived, no span ending here is either.
+            for start in range(end - 2, -1, -1):
+                lefts = starting[start]
+                if not lefts:
+                    continue
+                cell = 0
+                # Both are keyed by the split point, so walk the smaller one.
+                if len(lefts) <= len(column):
+                    for mid, left in lefts.items():
+                        right = column.get(mid)
+                        if right:
+                            symbols = combined.get((left, right))
+                            if symbols is None:
+                                symbols = combined[left, right] = grammar.combine(left, right)
+                            cell |= symbols
+                else:
+                    for mid, right in column.items():
+                        left = lefts.get(mid)
+                        if left:
+                            symbols = combined.get((left, right))
+                            if symbols is None:
+                                symbols = combined[left, right] = grammar.combine(left, right)
+                            cell |= symbols
+                if cell:
+                    column[start] = cell
+            for start, cell in column.items():
+                starting[start][end] = cell
+        self.columns.append(column)
+
+    def cell(self, start: int, end: int) -> int:
+        return self.columns[end].get(start, 0)
+
+    def splits(self, start: int, end: int) -> list[int]:
+        """The points splitting tokens[start:end] into two derivable spans."""
+        column = self.columns[end]
+        return [mid for mid in self.starting[start] if mid < end and mid in column]
+
+    def accepts(self) -> bool:
+        if not self.tokens:
+            return [] in self.grammar.cnf.get("S", [])
+        return bool(self.columns[-1].get(0, 0) & self.grammar.start_mask)
 
 
 class WordCFG:
+    ENGINES = ("auto", "sets", "bitset", "numpy", "earley")
 
     def __init__(self, rules: dict[str, list[list[str]]]):
         self.rules = rules
         self.symbols = set(rules.keys())
+        self.cnf, self.shapes = cnf_with_shapes(rules)
+
+        # The CNF rules indexed by what they produce: the symbols deriving
+        # each token, and those deriving each pair of adjacent symbols.
+        self.producers: dict[str, set[str]] = {}
+        self.pairs: dict[tuple[str, str], set[str]] = {}
+        for symbol, transforms in self.cnf.items():
+            for transform in transforms:
+                if len(transform) == 1:
+                    self.producers.setdefault(transform[0], set()).add(symbol)
+                elif len(transform) == 2:
+                    self.pairs.setdefault((transform[0], transform[1]), set()).add(symbol)
+
+        # The same index for the bitset engine, in which a set of symbols is an
+        # int with bit i set for the i-th symbol. For every symbol B, the rules
+        # A -> B C are kept as (C mask, mask of all such A) and `right_masks`
+        # holds all the C, to skip B at once when none of them is there.
+        self.numbers = {symbol: i for i, symbol in enumerate(sorted(self.cnf))}
+        self.token_masks = {token: self.mask(symbols) for token, symbols in self.producers.items()}
+        by_first: list[dict[int, int]] = [{} for _ in self.numbers]
+        for (first, second), symbols in self.pairs.items():
+            if first in self.numbers and second in self.numbers:
+                second_mask = 1 << self.numbers[second]
+                row = by_first[self.numbers[first]]
+                row[second_mask] = row.get(second_mask, 0) | self.mask(symbols)
+        self.pair_masks = [list(row.items()) for row in by_first]
+        self.right_masks = [sum(row) for row in by_first]
+        self.start_mask = self.mask({"S"} & set(self.cnf))
+        self.__arrays: tuple[Any, ...] | None = None
+
+        # The Earley engine works on the rules as given, numbered, with the
+        # numbers of every symbol's rules.
+        pruned = prune(rules)
+        self.productions = [
+            (symbol, tuple(transform))
+            for symbol, transforms in pruned.items()
+            for transform in transforms
+        ]
+        self.expansions: dict[str, list[int]] = {symbol: [] for symbol in pruned}
+        for number, (symbol, _) in enumerate(self.productions):
+            self.expansions[symbol].append(number)
+        self.nullable = nullable_symbols(pruned)
+
+    def mask(self, symbols: set[str]) -> int:
+        return sum(1 << self.numbers[symbol] for symbol in symbols)
+
+    def evaluate(self, tokens: list[str], engine: str = "auto") -> bool:
+        """Whether `S` derives `tokens`, by CYK with cells as sets of symbols,
+        as bitmasks or as rows of a NumPy array, or by Earley's algorithm.
+        `auto` picks one of the CYK engines, see `engine_for`."""
+        if engine not in self.ENGINES:
+            raise ValueError(f"unknown engine {engine!r}, expected one of {self.ENGINES}")
+        if not tokens:
+            return [] in self.cnf.get("S", [])
+        if engine == "auto":
+            engine = self.engine_for(tokens)
+        if engine == "sets":
+            return self.__evaluate_sets(tokens)
+        if engine == "numpy":
+            return self.__evaluate_numpy(tokens)
+        if engine == "earley":
+            return self.__evaluate_earley(tokens)
+        return self.__evaluate_bitset(tokens)
+
+    def engine_for(self, tokens: list[str]) -> str:
+        """The CYK engine `auto` runs on `tokens`: NumPy for long inputs whose
+        chart is dense, judging by that of their first tokens"""
+        n = len(tokens)
+        if not HAS_NUMPY or n < NUMPY_MIN_TOKENS or n * n * len(self.numbers) > NUMPY_MAX_CELLS:
+            return "bitset"
+        probe = self.chart(tokens[:NUMPY_PROBE_TOKENS])
+        cells = sum(len(column) for column in probe.columns)
+        spans = NUMPY_PROBE_TOKENS * (NUMPY_PROBE_TOKENS + 1) // 2
+        return "numpy" if cells >= NUMPY_MIN_DENSITY * spans else "bitset"
 
-    def evaluate(self, tokens: list[str]) -> bool:
+    def __evaluate_sets(self, tokens: list[str]) -> bool:
+        # The same sparse layout as `Chart`: columns[end][start] and
+        # starting[start][end] hold the non-empty cells only.
         n = len(tokens)
-        table = [[set([]) for _ in range(n)] for _ in range(n)]
-        for col in range(n):
-            for symbol in self.symbols:
-                for transform in self.rules[symbol]:
-                    if len(transform) == 1 and transform[0] == tokens[col]:
-                        table[0][col].add(symbol)
+        columns: list[dict[int, set[str]]] = [{}]
+        starting: list[dict[int, set[str]]] = []
+        for end in range(1, n + 1):
+            starting.append({})
+            column: dict[int, set[str]] = {}
+            producers = self.producers.get(tokens[end - 1])
+            if not producers:
+                return False
+            column[end - 1] = set(producers)
+            for start in range(end - 2, -1, -1):
+                lefts = starting[start]
+                cell: set[str] = set()
+                for mid, left in lefts.items():
+                    right = column.get(mid)
+                    if right is None:
+                        continue
+                    for first in left:
+                        for second in right:
+                            symbols = self.pairs.get((first, second))
+                            if symbols is not None:
+                                cell |= symbols
+                if cell:
+                    column[start] = cell
+            for start, cell in column.items():
+                starting[start][end] = cell
+            columns.append(column)
+        return "S" in columns[n].get(0, ())
+
+    def __evaluate_bitset(self, tokens: list[str]) -> bool:
+        return self.chart(tokens).accepts()
+
+    def chart(self, tokens: Iterable[str] = ()) -> "Chart":
+        """A bitset CYK chart to `push` tokens to, starting with `tokens`"""
+        chart = Chart(self)
+        for token in tokens:
+            chart.push(token)
+        return chart
+
+    def parse(self, tokens: list[str]) -> "Forest | None":
+        """The shared packed parse forest of every derivation of `tokens` from
+        `S` in the CNF grammar, None when there is none"""
+        root = ("S", 0, len(tokens))
+        if not tokens:
+            if not self.evaluate([]):
+                return None
+            return Forest(root, {root: [()]}, self.shapes, self.symbols)
+        chart = self.chart(tokens)
+        if not chart.accepts():
+            return None
+
+        # Back-pointers of the nodes reachable from the root only, read from
+        # the chart the recognizer filled.
+        numbers = self.numbers
+        packed: dict[Node, list[tuple[Node | str, ...]]] = {}
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if node in packed:
+                continue
+            symbol, start, end = node
+            alternatives = packed[node] = []
+            splits = chart.splits(start, end)
+            for transform in self.cnf[symbol]:
+                if len(transform) == 1:
+                    if end - start == 1 and tokens[start] == transform[0]:
+                        alternatives.append((transform[0],))
+                if len(transform) != 2:
+                    continue
+                first, second = transform
+                for mid in splits:
+                    if (
+                        chart.cell(start, mid) >> numbers[first] & 1
+                        and chart.cell(mid, end) >> numbers[second] & 1
+                    ):
+                        children = ((first, start, mid), (second, mid, end))
+                        alternatives.append(children)
+                        stack += children
+        return Forest(root, packed, self.shapes, self.symbols)
+
+    def __evaluate_numpy(self, tokens: list[str]) -> bool:
+        import numpy as np
+
+        if self.__arrays is None:
+            self.__arrays = self.__build_arrays()
+        firsts, seconds, first_index, second_index, groups, produced = self.__arrays
+        if "S" not in self.numbers or (len(tokens) > 1 and not len(groups)):
+            return False
+
+        # chart[length - 1, start, symbol], and the same cells by where their
+        # span ends in `by_end`, so that the right children of all the splits
+        # of a span length are a slice too.
+        n = len(tokens)
+        chart = np.zeros((n, n, len(self.numbers)), dtype=bool)
+        for col, token in enumerate(tokens):
+            mask = self.token_masks.get(token, 0)
+            chart[0, col] = [mask >> i & 1 for i in range(len(self.numbers))]
+        by_end = chart.copy()
 
         for pos in range(1, n):
-            for col in range(n - pos):
-                for k in range(pos):
-                    for symbol in self.symbols:
-                        for transform in self.rules[symbol]:
-                            if len(transform) == 2 and transform[0] in table[
-                                    k][col] and transform[1] in table[
-                                        pos - k - 1][col + k + 1]:
-                                table[pos][col].add(symbol)
-        pprint(table)
-        return "S" in table[n - 1][0]
+            count = n - pos
+            # For every start, left[start] @ right[start] counts the splits
+            # where each B is followed by each C, which is one batched boolean
+            # matrix product for all the starts and splits of this length.
+            left = chart[:pos, :count][:, :, firsts].astype(np.float32).transpose(1, 2, 0)
+            right = by_end[pos - 1 :: -1, pos:][:, :, seconds].astype(np.float32).transpose(1, 0, 2)
+            found = np.matmul(left, right)[:, first_index, second_index] > 0
+            cells = np.logical_or.reduceat(found, groups, axis=1)
+            chart[pos, :count, produced] = cells.T
+            by_end[pos, pos:, produced] = cells.T
+        return bool(chart[n - 1, 0, self.numbers["S"]])
+
+    def __build_arrays(self) -> tuple[Any, ...]:
+        import numpy as np
+
+        rules = sorted(
+            (self.numbers[symbol], self.numbers[first], self.numbers[second])
+            for (first, second), symbols in self.pairs.items()
+            if first in self.numbers and second in self.numbers
+            for symbol in symbols
+        )
+        symbols, first_symbols, second_symbols = np.array(rules, dtype=np.intp).reshape(-1, 3).T
+        # Only the symbols that start or end a rule take part in the products.
+        firsts, first_index = np.unique(first_symbols, return_inverse=True)
+        seconds, second_index = np.unique(second_symbols, return_inverse=True)
+        groups = np.flatnonzero(np.diff(symbols, prepend=-1))
+        return firsts, seconds, first_index, second_index, groups, symbols[groups]
+
+    def __evaluate_earley(self, tokens: list[str]) -> bool:
+        # Items are (production, dot, origin). Every Earley set indexes its
+        # items by the symbol after their dot, for completions to find the
+        # items a symbol advances and for the scan to find those a token does.
+        productions = self.productions
+        expansions = self.expansions
+        nullable = self.nullable
+        if "S" not in expansions:
+            return False
+
+        waiting: list[dict[str, list[tuple[int, int, int]]]] = []
+        items = [(production, 0, 0) for production in expansions["S"]]
+        for k in range(len(tokens) + 1):
+            seen = set(items)
+            by_symbol: dict[str, list[tuple[int, int, int]]] = {}
+            waiting.append(by_symbol)
+            predicted: set[str] = set()
+
+            def add(item: tuple[int, int, int]) -> None:
+                if item not in seen:
+                    seen.add(item)
+                    items.append(item)
+
+            for item in items:
+                production, dot, origin = item
+                symbol, transform = productions[production]
+                if dot == len(transform):
+                    for parent, parent_dot, parent_origin in waiting[origin].get(symbol, ()):
+                        add((parent, parent_dot + 1, parent_origin))
+                    continue
+                following = transform[dot]
+                by_symbol.setdefault(following, []).append(item)
+                if following in expansions:
+                    if following not in predicted:
+                        predicted.add(following)
+                        for expansion in expansions[following]:
+                            add((expansion, 0, k))
+                    # Aycock and Horspool: skip a nullable symbol right away, as
+                    # its empty completion may already have been processed.
+                    if following in nullable:
+                        add((production, dot + 1, origin))
+
+            if k == len(tokens):
+                return any(
+                    origin == 0 and dot == len(productions[production][1])
+                    for production, dot, origin in items
+                    if productions[production][0] == "S"
+                )
+            # Tokens that are also symbol names only ever stand for the symbol.
+            token = tokens[k]
+            scanned = by_symbol.get(token, ()) if token not in expansions else ()
+            items = [(production, dot + 1, origin) for production, dot, origin in scanned]
+            if not items:
+                return False
+        return False
+
+    def combine(self, left: int, right: int) -> int:
+        """The mask of the symbols A with A -> B C, for B in `left` and C in `right`"""
+        symbols = 0
+        while left:
+            lowest = left & -left
+            left ^= lowest
+            first = lowest.bit_length() - 1
+            if right & self.right_masks[first]:
+                for second, produced in self.pair_masks[first]:
+                    if right & second:
+                        symbols |= produced
+        return symbols
+
+
+def benchmark(
+    grammar: WordCFG, sentences: list[list[str]], engines: list[str], repeat: int = 3
+) -> list[dict[str, float]]:
+    """Best of `repeat` seconds every engine takes on every sentence"""
+    results = []
+    for tokens in sentences:
+        timings = {}
+        for engine in engines:
+            best = math.inf
+            for _ in range(repeat):
+                start = time.perf_counter()
+                grammar.evaluate(tokens, engine)
+                best = min(best, time.perf_counter() - start)
+            timings[engine] = best
+        results.append(timings)
+    return results
 
 
 class WordCFGBuilder:
@@ -35,9 +726,9 @@ class WordCFGBuilder:
         self.rules: dict[str, list[list[str]]] = {}
         self.__prev_symbol = ""
 
-    def _rule(self, symbol: str, transform_to: str):
+    def _rule(self, symbol: str, transform_to: str | None = None):
         self.rules.setdefault(symbol, [])
-        self.rules[symbol].append([transform_to])
+        self.rules[symbol].append([transform_to] if transform_to is not None else [])
         self.__prev_symbol = symbol
         return self
 
@@ -45,8 +736,8 @@ class WordCFGBuilder:
         self.rules[self.__prev_symbol][-1].append(transform_to)
         return self
 
-    def _or(self, transform_to: str):
-        self.rules[self.__prev_symbol].append([transform_to])
+    def _or(self, transform_to: str | None = None):
+        self.rules[self.__prev_symbol].append([transform_to] if transform_to is not None else [])
         return self
 
     def build(self) -> WordCFG:
@@ -65,5 +756,32 @@ cfg = WordCFGBuilder()\
         ._rule("V", "saw")\
         .build()
 
-pprint(cfg.rules)
-pprint(cfg.evaluate("I saw the cat with the telescope".split()))
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Recognize sentences of the demo grammar")
+    arg_parser.add_argument(
+        "--benchmark", action="store_true", help="time the CYK engines on growing sentences"
+    )
+    arg_parser.add_argument("--max-words", type=int, default=400)
+    args = arg_parser.parse_args()
+
+    if not args.benchmark:
+        pprint(cfg.rules)
+        pprint(cfg.evaluate("I saw the cat with the telescope".split()))
+        forest = cfg.parse("I saw the cat with the telescope".split())
+        if forest is not None:
+            for tree in forest.trees():
+                pprint(tree)
+    else:
+        engines = ["sets", "bitset"] + (["numpy"] if HAS_NUMPY else []) + ["earley"]
+        sentences = []
+        repeats = 1
+        while 4 + 3 * repeats <= args.max_words:
+            sentences.append(("I saw the cat" + " with the telescope" * repeats).split())
+            repeats *= 2
+        print(f"{'words':>6}" + "".join(f"{engine:>10}" for engine in engines) + "   auto")
+        for tokens, timings in zip(sentences, benchmark(cfg, sentences, engines)):
+            print(
+                f"{len(tokens):>6}"
+                + "".join(f"{timings[engine] * 1000:>8.2f}ms" for engine in engines)
+                + f"   {cfg.engine_for(tokens)}"
+            )